@@ -1,12 +1,22 @@
 """
 Blog post generation functionality.
+
+generate_blog_post() and generate_blog_post_with_research() write the introduction,
+the main sections, the conclusion and the meta description at the same time, on up to
+`max_workers` threads; the FAQ section is the only stage that waits for the rest of the
+content. Sections keep their outline order and BlogPost.timings records how long each
+stage took.
+
+Configuration (environment variables):
+    BLOG_SECTION_WORKERS    Stages of one post generated at the same time (default: 4)
 """
 import os
 import json
+from concurrent.futures import ThreadPoolExecutor
 # Load environment variables from .env for CLI execution
 from dotenv import load_dotenv
 load_dotenv()
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
 from ..text_generation.core import generate_text, LLMProvider, GenerationOptions, create_provider_from_env
 from ..types.content import BlogPost, Section, SubTopic, ContentType
@@ -17,9 +27,10 @@ from ..blog_sections.introduction_generator import generate_introduction
 from ..blog_sections.conclusion_generator import generate_conclusion
 from ..blog_sections.faq_generator import generate_faqs
 from ..seo.meta_description import generate_meta_description
-from ..post_processing.proofreader import proofread_content
-from ..post_processing.humanizer import humanize_content
+from ..post_processing.batch_editor import edit_contents, POST_PROCESS_WORKERS
+from ..shared import StageExecutor
 
+BLOG_SECTION_WORKERS = int(os.getenv("BLOG_SECTION_WORKERS", 4))
 
 
 class BlogGenerationError(Exception):
@@ -34,7 +45,8 @@ def generate_blog_post(
     include_faqs: bool = True,
     tone: str = "informative",
     provider_type: ProviderType = "openai",
-    options: Optional[GenerationOptions] = None
+    options: Optional[GenerationOptions] = None,
+    max_workers: int = BLOG_SECTION_WORKERS
 ) -> BlogPost:
     """
     Generate a blog post.
@@ -47,6 +59,7 @@ def generate_blog_post(
         tone: The tone of the blog post.
         provider_type: The type of provider to use.
         options: Options for text generation.
+        max_workers: Stages generated at the same time (1 generates them one by one).
         
     Returns:
         The generated blog post.
@@ -61,44 +74,17 @@ def generate_blog_post(
         # Generate outline
         outline = generate_content_outline(title, keywords, num_sections, provider, options)
         
-        # Generate sections
-        sections = []
-        
-        # Generate introduction
-        introduction_section = generate_introduction_section(title, outline.sections, keywords, tone, provider, options)
-        sections.append(introduction_section)
-        
-        # Generate main sections
-        for i, section_title in enumerate(outline.sections[1:-1]):  # Skip introduction and conclusion
-            section = generate_section(section_title, keywords, tone, provider, options)
-            sections.append(section)
-        
-        # Generate conclusion
-        conclusion_section = generate_conclusion_section(title, outline.sections, keywords, tone, provider, options)
-        sections.append(conclusion_section)
-        
-        # Generate FAQs if requested
-        if include_faqs:
-            # Combine all section content for context
-            content = ""
-            for section in sections:
-                content += section.title + "\n"
-                for subtopic in section.subtopics:
-                    if subtopic.content:
-                        content += subtopic.content + "\n"
-            
-            # Generate FAQs
-            faq_section = generate_faq_section(title, content, keywords, tone, provider, options)
-            sections.append(faq_section)
-        
-        # Generate meta description
-        description = generate_meta_description(title, keywords or [], provider=provider, options=options).content
+        # Generate sections, FAQs and meta description
+        sections, description, timings = _generate_post_stages(
+            title, outline.sections, keywords, include_faqs, tone, provider, options, max_workers
+        )
         
         return BlogPost(
             title=title,
             description=description,
             sections=sections,
-            tags=keywords or []
+            tags=keywords or [],
+            timings=timings
         )
     except Exception as e:
         raise BlogGenerationError(f"Error generating blog post: {str(e)}")
@@ -111,7 +97,8 @@ def generate_blog_post_with_research(
     include_faqs: bool = True,
     tone: str = "informative",
     provider_type: ProviderType = "openai",
-    options: Optional[GenerationOptions] = None
+    options: Optional[GenerationOptions] = None,
+    max_workers: int = BLOG_SECTION_WORKERS
 ) -> BlogPost:
     """
     Generate a blog post with research.
@@ -124,6 +111,7 @@ def generate_blog_post_with_research(
         tone: The tone of the blog post.
         provider_type: The type of provider to use.
         options: Options for text generation.
+        max_workers: Stages generated at the same time (1 generates them one by one).
         
     Returns:
         The generated blog post.
@@ -140,33 +128,88 @@ def generate_blog_post_with_research(
         if keywords:
             research_keywords.extend(keywords)
         
-        research_results = conduct_web_research(research_keywords)
-        
-        # Generate outline
-        outline = generate_content_outline_with_research(title, keywords, num_sections, provider, options)
-        
-        # Generate sections
-        sections = []
+        # The outline does not depend on the research, so both run at the same time
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="research") as executor:
+            research_future = executor.submit(conduct_web_research, research_keywords)
+            
+            # Generate outline
+            outline = generate_content_outline_with_research(title, keywords, num_sections, provider, options)
+            
+            research_results = research_future.result()
         
-        # Generate introduction
-        introduction_section = generate_introduction_section_with_research(
-            title, outline.sections, research_results, keywords, tone, provider, options
+        # Generate sections, FAQs and meta description
+        sections, description, timings = _generate_post_stages(
+            title, outline.sections, keywords, include_faqs, tone, provider, options, max_workers,
+            research_results=research_results
         )
-        sections.append(introduction_section)
         
-        # Generate main sections
-        for i, section_title in enumerate(outline.sections[1:-1]):  # Skip introduction and conclusion
-            section = generate_section_with_research(
+        return BlogPost(
+            title=title,
+            description=description,
+            sections=sections,
+            tags=keywords or [],
+            timings=timings
+        )
+    except Exception as e:
+        raise BlogGenerationError(f"Error generating blog post with research: {str(e)}")
+
+
+def _generate_post_stages(
+    title: str,
+    outline_sections: List[str],
+    keywords: Optional[List[str]],
+    include_faqs: bool,
+    tone: str,
+    provider: LLMProvider,
+    options: Optional[GenerationOptions],
+    max_workers: int,
+    research_results: Optional[Any] = None
+) -> Tuple[List[Section], str, Dict[str, float]]:
+    """
+    Generate the sections and meta description of a post as concurrent stages.
+    
+    The introduction, each main section, the conclusion and the meta description are
+    independent; the FAQ section is generated from the finished content.
+    
+    Returns:
+        The sections in outline order (FAQs last), the meta description and the
+        duration of each stage in seconds.
+    """
+    executor = StageExecutor(pools={"llm": max(1, max_workers)})
+    
+    if research_results is not None:
+        executor.add_stage("introduction", lambda: generate_introduction_section_with_research(
+            title, outline_sections, research_results, keywords, tone, provider, options
+        ))
+    else:
+        executor.add_stage("introduction", lambda: generate_introduction_section(
+            title, outline_sections, keywords, tone, provider, options
+        ))
+    content_stages = ["introduction"]
+    
+    for i, section_title in enumerate(outline_sections[1:-1]):  # Skip introduction and conclusion
+        name = f"section_{i + 1}"
+        if research_results is not None:
+            executor.add_stage(name, lambda section_title=section_title: generate_section_with_research(
                 section_title, research_results, keywords, tone, provider, options
-            )
-            sections.append(section)
-        
-        # Generate conclusion
-        conclusion_section = generate_conclusion_section(title, outline.sections, keywords, tone, provider, options)
-        sections.append(conclusion_section)
-        
-        # Generate FAQs if requested
-        if include_faqs:
+            ))
+        else:
+            executor.add_stage(name, lambda section_title=section_title: generate_section(
+                section_title, keywords, tone, provider, options
+            ))
+        content_stages.append(name)
+    
+    executor.add_stage("conclusion", lambda: generate_conclusion_section(
+        title, outline_sections, keywords, tone, provider, options
+    ))
+    content_stages.append("conclusion")
+    
+    executor.add_stage("meta_description", lambda: generate_meta_description(
+        title, keywords or [], provider=provider, options=options
+    ).content)
+    
+    if include_faqs:
+        def generate_faqs_from(*sections: Section) -> Section:
             # Combine all section content for context
             content = ""
             for section in sections:
@@ -174,22 +217,18 @@ def generate_blog_post_with_research(
                 for subtopic in section.subtopics:
                     if subtopic.content:
                         content += subtopic.content + "\n"
-            
-            # Generate FAQs
-            faq_section = generate_faq_section(title, content, keywords, tone, provider, options)
-            sections.append(faq_section)
+            return generate_faq_section(title, content, keywords, tone, provider, options)
         
-        # Generate meta description
-        description = generate_meta_description(title, keywords or [], provider=provider, options=options).content
-        
-        return BlogPost(
-            title=title,
-            description=description,
-            sections=sections,
-            tags=keywords or []
-        )
-    except Exception as e:
-        raise BlogGenerationError(f"Error generating blog post with research: {str(e)}")
+        executor.add_stage("faq", generate_faqs_from, deps=content_stages)
+    
+    results = executor.run()
+    
+    sections = [results[name] for name in content_stages]
+    if include_faqs:
+        sections.append(results["faq"])
+    timings = {name: round(executor.timings[name].duration, 2) for name in executor.stages}
+    
+    return sections, results["meta_description"], timings
 
 
 def generate_introduction_section(
@@ -602,17 +641,24 @@ def post_process_blog_post(
     proofread: bool = True,
     humanize: bool = True,
     provider: Optional[LLMProvider] = None,
-    options: Optional[GenerationOptions] = None
+    options: Optional[GenerationOptions] = None,
+    fused: bool = True,
+    max_workers: int = POST_PROCESS_WORKERS
 ) -> BlogPost:
     """
     Post-process a blog post.
     
+    Subtopics are proofread and humanized in batched requests (see
+    post_processing.batch_editor) that run concurrently.
+    
     Args:
         blog_post: The blog post to post-process.
         proofread: Whether to proofread the blog post.
         humanize: Whether to humanize the blog post.
         provider: The LLM provider to use.
         options: Options for text generation.
+        fused: Proofread and humanize in one pass instead of two.
+        max_workers: Batches processed at the same time.
         
     Returns:
         The post-processed blog post.
@@ -621,42 +667,42 @@ def post_process_blog_post(
         BlogGenerationError: If an error occurs during post-processing.
     """
     try:
-        # Create a copy of the blog post
+        # Every subtopic with content, keyed by its position in the post
+        contents = {
+            f"s{i}_{j}": subtopic.content
+            for i, section in enumerate(blog_post.sections)
+            for j, subtopic in enumerate(section.subtopics)
+            if subtopic.content
+        }
+        edited = edit_contents(
+            contents,
+            proofread=proofread,
+            humanize=humanize,
+            fused=fused,
+            provider=provider,
+            options=options,
+            max_workers=max_workers
+        )
+        
+        # Create a copy of the blog post with the edited content
         processed_blog_post = BlogPost(
             title=blog_post.title,
             description=blog_post.description,
             sections=[],
             tags=blog_post.tags,
             date=blog_post.date,
-            image=blog_post.image
+            image=blog_post.image,
+            timings=blog_post.timings
         )
         
-        # Process each section
-        for section in blog_post.sections:
+        for i, section in enumerate(blog_post.sections):
             processed_section = Section(
                 title=section.title,
-                subtopics=[]
+                subtopics=[
+                    SubTopic(title=subtopic.title, content=edited.get(f"s{i}_{j}", subtopic.content))
+                    for j, subtopic in enumerate(section.subtopics)
+                ]
             )
-            
-            for subtopic in section.subtopics:
-                processed_subtopic = SubTopic(
-                    title=subtopic.title,
-                    content=subtopic.content
-                )
-                
-                if subtopic.content:
-                    # Proofread content if requested
-                    if proofread:
-                        proofreading_result = proofread_content(subtopic.content, provider=provider, options=options)
-                        if proofreading_result.corrected_text:
-                            processed_subtopic.content = proofreading_result.corrected_text
-                    
-                    # Humanize content if requested
-                    if humanize:
-                        processed_subtopic.content = humanize_content(processed_subtopic.content, provider=provider, options=options)
-                
-                processed_section.subtopics.append(processed_subtopic)
-            
             processed_blog_post.sections.append(processed_section)
         
         return processed_blog_post
@@ -832,7 +878,9 @@ if __name__ == "__main__":
     parser.add_argument("--sections", type=int, default=5, help="Number of main sections to generate")
     parser.add_argument("--proofread", action="store_true", help="Enable proofreading in post-processing")
     parser.add_argument("--humanize", action="store_true", help="Enable humanizing in post-processing")
+    parser.add_argument("--separate-passes", action="store_true", help="Proofread and humanize in two passes instead of one")
     parser.add_argument("--output", default=None, help="Output markdown filename")
+    parser.add_argument("--workers", type=int, default=BLOG_SECTION_WORKERS, help="Sections generated at the same time")
     args = parser.parse_args()
 
     keywords = args.keywords.split(",") if args.keywords else None
@@ -840,14 +888,14 @@ if __name__ == "__main__":
     options = GenerationOptions()
     if args.research:
         post = generate_blog_post_with_research(
-            args.title, keywords, args.sections, True, args.tone, "openai", options
+            args.title, keywords, args.sections, True, args.tone, "openai", options, args.workers
         )
     else:
         post = generate_blog_post(
-            args.title, keywords, args.sections, True, args.tone, "openai", options
+            args.title, keywords, args.sections, True, args.tone, "openai", options, args.workers
         )
     # Apply post-processing (proofread/humanize)
-    post = post_process_blog_post(post, proofread=args.proofread, humanize=args.humanize)
+    post = post_process_blog_post(post, proofread=args.proofread, humanize=args.humanize, fused=not args.separate_passes)
 
     # Convert BlogPost object to markdown
     def to_markdown(bp):
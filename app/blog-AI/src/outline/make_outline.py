@@ -24,6 +24,9 @@ class OutlineParameters:
     include_research: bool = True
     include_keywords: bool = True
     output_format: str = "markdown"  # markdown, json, text
+    # Researched together with the topic, like generate_blog_post_with_research does, so
+    # the outline and the post for the same title share cached research results
+    keywords: Optional[List[str]] = None
 
 
 class OutlineGenerator:
@@ -39,7 +42,7 @@ class OutlineGenerator:
         # Research phase (if enabled)
         research_data = None
         if params.include_research:
-            research_data = self._conduct_research(params.topic)
+            research_data = self._conduct_research(params.topic, params.keywords)
         
         # Generate outline structure
         outline_sections = self._generate_outline_structure(params, research_data)
@@ -62,14 +65,15 @@ class OutlineGenerator:
         
         return response
     
-    def _conduct_research(self, topic: str) -> Dict[str, Any]:
+    def _conduct_research(self, topic: str, keywords: Optional[List[str]] = None) -> Dict[str, Any]:
         """Conduct web research on the topic."""
         try:
-            research_results = conduct_web_research([topic])
+            research_results = conduct_web_research([topic] + list(keywords or []))
+            organic = research_results.google.organic if research_results.google else []
             return {
-                "sources": research_results.serp_results if hasattr(research_results, 'serp_results') else [],
-                "key_points": [result.title for result in research_results.serp_results[:5]] if hasattr(research_results, 'serp_results') else [],
-                "trending_topics": []
+                "sources": organic,
+                "key_points": [result.title for result in organic[:5]],
+                "trending_topics": research_results.trends.related_queries if research_results.trends else []
             }
         except Exception as e:
             print(f"Research failed: {e}")
@@ -0,0 +1,183 @@
+"""
+Batched proofreading and humanizing of blog post content.
+
+Editing every subtopic on its own costs one LLM round-trip per subtopic and per pass,
+each repeating the same instructions. edit_contents() packs several pieces of content
+into one request, each wrapped in a tag carrying its ID:
+
+    <section id="s3">
+    ...content...
+    </section>
+
+and the model answers with the same tags, so the edited pieces are split back by ID.
+Batches are sent concurrently. Proofreading and humanizing are done in a single pass
+by default (fused); with fused=False they are two batched passes, proofread first.
+
+A piece the model drops from its answer is sent again once in a request of its own; a
+piece still missing, or one that comes back less than half its original length (a cut
+off answer), keeps its original content.
+
+Configuration (environment variables):
+    POST_PROCESS_BATCH_CHARS  Max characters of content per request (default: 6000)
+    POST_PROCESS_WORKERS      Batches edited at the same time (default: 4)
+"""
+import os
+import re
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from ..text_generation.core import generate_text, create_provider_from_env, LLMProvider, GenerationOptions
+
+logger = logging.getLogger(__name__)
+
+POST_PROCESS_BATCH_CHARS = int(os.getenv("POST_PROCESS_BATCH_CHARS", 6000))
+POST_PROCESS_WORKERS = int(os.getenv("POST_PROCESS_WORKERS", 4))
+
+# The answer repeats the batch, so a batch must fit in the response token limit;
+# about 4 characters per token, with headroom for the tags
+CHARS_PER_OUTPUT_TOKEN = 3
+
+# Shorter answers than this fraction of the original are treated as cut off
+MIN_LENGTH_RATIO = 0.5
+
+SECTION_PATTERN = re.compile(r'<section id="([^"]+)">\s*\n?(.*?)\n?\s*</section>', re.DOTALL)
+
+INSTRUCTIONS = {
+    "proofread": "Fix spelling, grammar and punctuation mistakes. Do not change the meaning, tone or structure.",
+    "humanize": "Rewrite the text so it reads naturally, as written by an experienced human writer: vary sentence length, "
+                "remove robotic or repetitive phrasing and filler. Keep every fact, heading, list, link and image.",
+}
+
+
+def build_batch_prompt(items: List[Tuple[str, str]], passes: List[str]) -> str:
+    """
+    Build one editing request for several pieces of content.
+
+    Args:
+        items: (ID, content) pairs.
+        passes: Edits to apply, in order ("proofread", "humanize").
+    """
+    tasks = "\n".join(f"- {INSTRUCTIONS[name]}" for name in passes)
+    sections = "\n\n".join(f'<section id="{item_id}">\n{content}\n</section>' for item_id, content in items)
+    return f"""Edit each of the {len(items)} Markdown sections below independently:
+{tasks}
+
+Keep the Markdown formatting. Return every section, and nothing else, wrapped in the same
+<section id="..."> tags with the same IDs, in the same order.
+
+{sections}"""
+
+
+def parse_batch_response(response: str, items: List[Tuple[str, str]]) -> Dict[str, str]:
+    """
+    Split an edited batch back into its pieces.
+
+    Returns:
+        ID -> edited content for the pieces that came back complete; pieces that are
+        missing, unknown or cut off are left out.
+    """
+    originals = dict(items)
+    edited: Dict[str, str] = {}
+    for item_id, content in SECTION_PATTERN.findall(response):
+        content = content.strip()
+        original = originals.get(item_id)
+        if original is None or not content:
+            continue
+        if len(content) < len(original.strip()) * MIN_LENGTH_RATIO:
+            logger.warning(f"Edited section {item_id} came back cut off, keeping the original")
+            continue
+        edited[item_id] = content
+    return edited
+
+
+def plan_batches(items: List[Tuple[str, str]], max_chars: int) -> List[List[Tuple[str, str]]]:
+    """Group pieces in order into batches of at most `max_chars` characters (a longer piece goes alone)."""
+    batches: List[List[Tuple[str, str]]] = []
+    current: List[Tuple[str, str]] = []
+    size = 0
+    for item in items:
+        length = len(item[1])
+        if current and size + length > max_chars:
+            batches.append(current)
+            current, size = [], 0
+        current.append(item)
+        size += length
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _edit_batch(
+    batch: List[Tuple[str, str]],
+    passes: List[str],
+    provider: LLMProvider,
+    options: Optional[GenerationOptions]
+) -> Dict[str, str]:
+    edited: Dict[str, str] = {}
+    try:
+        edited = parse_batch_response(generate_text(build_batch_prompt(batch, passes), provider, options), batch)
+    except Exception as e:
+        logger.warning(f"Editing a batch of {len(batch)} sections failed: {str(e)}")
+
+    missing = [item for item in batch if item[0] not in edited]
+    if missing and len(batch) > 1:
+        # Retry what did not come back once, on its own, before keeping the originals
+        # (a single piece would be the same, possibly cached, request again)
+        for item in missing:
+            try:
+                edited.update(parse_batch_response(generate_text(build_batch_prompt([item], passes), provider, options), [item]))
+            except Exception as e:
+                logger.warning(f"Editing section {item[0]} failed: {str(e)}")
+
+    for item_id, content in batch:
+        if item_id not in edited:
+            edited[item_id] = content
+    return edited
+
+
+def edit_contents(
+    contents: Dict[str, str],
+    proofread: bool = True,
+    humanize: bool = True,
+    fused: bool = True,
+    provider: Optional[LLMProvider] = None,
+    options: Optional[GenerationOptions] = None,
+    max_chars: int = POST_PROCESS_BATCH_CHARS,
+    max_workers: int = POST_PROCESS_WORKERS
+) -> Dict[str, str]:
+    """
+    Proofread and/or humanize several pieces of content with batched LLM requests.
+
+    Args:
+        contents: ID -> Markdown content. IDs must not contain double quotes.
+        proofread: Fix spelling, grammar and punctuation.
+        humanize: Make the text read naturally.
+        fused: Apply both edits in one pass instead of two.
+        provider: The LLM provider to use (default: OpenAI from the environment).
+        options: Options for text generation.
+        max_chars: Max characters of content per request.
+        max_workers: Batches sent at the same time.
+
+    Returns:
+        ID -> edited content, for every ID in `contents` (unedited where editing failed).
+    """
+    passes = [name for name, enabled in (("proofread", proofread), ("humanize", humanize)) if enabled]
+    if not passes or not contents:
+        return dict(contents)
+
+    provider = provider or create_provider_from_env("openai")
+    options = options or GenerationOptions()
+    max_chars = max(1, min(max_chars, options.max_tokens * CHARS_PER_OUTPUT_TOKEN))
+
+    edited = dict(contents)
+    for step in ([passes] if fused else [[name] for name in passes]):
+        batches = plan_batches([(item_id, content) for item_id, content in edited.items() if content], max_chars)
+        if not batches:
+            break
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(batches))), thread_name_prefix="post-process") as executor:
+            for result in executor.map(lambda batch: _edit_batch(batch, step, provider, options), batches):
+                edited.update(result)
+        logger.info(f"{' + '.join(step)}: {sum(len(batch) for batch in batches)} sections in {len(batches)} requests")
+
+    return edited
@@ -0,0 +1,273 @@
+"""
+Persistent cache for web research results.
+
+Every blog post and outline researches its topic with paid SERP, Tavily and Metaphor
+queries, and related jobs (several articles on one site, an outline and then the post
+for the same title) repeat near-identical queries. Results are cached per source in a
+SQLite file shared by every process on the machine, keyed on the source, the
+normalized query and the search options that change the result (location, language,
+time range, result count, domains, similar URL).
+
+Each source has its own TTL. After the TTL an entry is stale: it is still returned
+right away, and the source is queried again in the background so the next lookup is
+fresh (stale-while-revalidate). Entries older than TTL + RESEARCH_CACHE_STALE_TTL are
+not used. Failed searches are never cached.
+
+Configuration (environment variables):
+    RESEARCH_CACHE_ENABLED      Enable the research cache (default: 1)
+    RESEARCH_CACHE_PATH         SQLite file for cached results (default: cache/research_cache.sqlite3)
+    RESEARCH_CACHE_TTL_GOOGLE   Seconds Google SERP results are fresh (default: 86400)
+    RESEARCH_CACHE_TTL_TAVILY   Seconds Tavily results are fresh (default: 86400)
+    RESEARCH_CACHE_TTL_METAPHOR Seconds Metaphor results are fresh (default: 604800)
+    RESEARCH_CACHE_TTL_TRENDS   Seconds Google Trends data is fresh (default: 86400)
+    RESEARCH_CACHE_STALE_TTL    Seconds past its TTL a result is still served while it is
+                                refreshed (default: 604800)
+"""
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+from ..types.research import (
+    SearchOptions,
+    GoogleSerpResult,
+    TavilySearchResult,
+    MetaphorResult,
+    GoogleTrendsResult,
+    SearchResult,
+    PeopleAlsoAsk,
+    RelatedSearch,
+    TavilyResult,
+    TrendPoint
+)
+
+logger = logging.getLogger(__name__)
+
+RESEARCH_CACHE_ENABLED = os.getenv("RESEARCH_CACHE_ENABLED", "1") not in ("0", "false", "False")
+RESEARCH_CACHE_PATH = os.getenv("RESEARCH_CACHE_PATH", os.path.join("cache", "research_cache.sqlite3"))
+RESEARCH_CACHE_TTLS = {
+    "google": int(os.getenv("RESEARCH_CACHE_TTL_GOOGLE", 24 * 3600)),
+    "tavily": int(os.getenv("RESEARCH_CACHE_TTL_TAVILY", 24 * 3600)),
+    "metaphor": int(os.getenv("RESEARCH_CACHE_TTL_METAPHOR", 7 * 24 * 3600)),
+    "trends": int(os.getenv("RESEARCH_CACHE_TTL_TRENDS", 24 * 3600)),
+}
+RESEARCH_CACHE_STALE_TTL = int(os.getenv("RESEARCH_CACHE_STALE_TTL", 7 * 24 * 3600))
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase a search query and collapse its whitespace; punctuation is kept ("C++" is not "C")."""
+    return " ".join(query.lower().split())
+
+
+def _encode(value: Any) -> Any:
+    """Research result objects -> plain JSON data."""
+    if isinstance(value, list):
+        return [_encode(item) for item in value]
+    if hasattr(value, "__dict__"):
+        return {name: _encode(item) for name, item in vars(value).items()}
+    return value
+
+
+# Source -> function rebuilding its result objects from the JSON data
+_DECODERS: Dict[str, Callable[[Any], Any]] = {
+    "google": lambda data: GoogleSerpResult(
+        organic=[SearchResult(**item) for item in data["organic"]],
+        people_also_ask=[PeopleAlsoAsk(**item) for item in data["people_also_ask"]],
+        related_searches=[RelatedSearch(**item) for item in data["related_searches"]]
+    ),
+    "tavily": lambda data: TavilySearchResult(
+        results=[TavilyResult(**item) for item in data["results"]],
+        answer=data["answer"],
+        follow_up_questions=data["follow_up_questions"]
+    ),
+    "metaphor": lambda data: [MetaphorResult(**item) for item in data],
+    "trends": lambda data: GoogleTrendsResult(
+        keyword=data["keyword"],
+        timeline=[TrendPoint(**item) for item in data["timeline"]],
+        related_topics=data["related_topics"],
+        related_queries=data["related_queries"]
+    ),
+}
+
+
+class ResearchCache:
+    """Per-source research results in SQLite, with TTLs and background refresh of stale entries."""
+
+    def __init__(
+        self,
+        path: str = RESEARCH_CACHE_PATH,
+        ttls: Optional[Dict[str, int]] = None,
+        stale_ttl: int = RESEARCH_CACHE_STALE_TTL,
+    ):
+        self.path = path
+        self.ttls = {**RESEARCH_CACHE_TTLS, **(ttls or {})}
+        self.stale_ttl = stale_ttl
+        self._lock = threading.Lock()
+        # Keys being refreshed in the background, so a stale entry is refreshed once
+        self._refreshing: Set[str] = set()
+        self._counters: Dict[str, Dict[str, int]] = {source: self._new_counters() for source in self.ttls}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS research_cache (
+                key TEXT PRIMARY KEY,
+                source TEXT NOT NULL,
+                query TEXT NOT NULL,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                stale_until REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_research_cache_stale_until ON research_cache (stale_until)")
+
+    @staticmethod
+    def make_key(source: str, query: str, options: SearchOptions) -> str:
+        material = json.dumps(
+            [
+                source,
+                normalize_query(query),
+                (options.location or "").lower(),
+                (options.language or "").lower(),
+                options.time_range,
+                options.num_results,
+                sorted(options.include_domains or []),
+                options.similar_url,
+            ],
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _new_counters() -> Dict[str, int]:
+        return {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "refresh_failures": 0}
+
+    def _count(self, source: str, counter: str) -> None:
+        with self._lock:
+            self._counters.setdefault(source, self._new_counters())[counter] += 1
+
+    def lookup(self, source: str, query: str, options: SearchOptions) -> Tuple[Optional[str], Any]:
+        """
+        Look up a cached result.
+
+        Returns:
+            Tuple of ("fresh" | "stale" | None, result). None means no usable entry.
+        """
+        key = self.make_key(source, query, options)
+        now = time.time()
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT value, expires_at, stale_until FROM research_cache WHERE key = ?", (key,)
+                ).fetchone()
+            if row is not None and row[2] >= now:
+                data = json.loads(row[0])
+                result = _DECODERS[source](data) if data is not None else None
+                return ("fresh" if row[1] >= now else "stale"), result
+        except Exception as e:
+            logger.warning(f"Research cache read failed for {source}: {str(e)}")
+        return None, None
+
+    def store(self, source: str, query: str, options: SearchOptions, result: Any) -> None:
+        key = self.make_key(source, query, options)
+        now = time.time()
+        expires_at = now + self.ttls.get(source, 0)
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO research_cache (key, source, query, value, created_at, expires_at, stale_until) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, source, normalize_query(query), json.dumps(_encode(result)), now, expires_at, expires_at + self.stale_ttl),
+                )
+                self._conn.execute("DELETE FROM research_cache WHERE stale_until < ?", (now,))
+        except Exception as e:
+            logger.warning(f"Research cache write failed for {source}: {str(e)}")
+
+    def get_or_search(self, source: str, query: str, options: SearchOptions, search: Callable[[], Any]) -> Any:
+        """
+        Return the cached result for a source query, or run `search` and cache its result.
+
+        A stale entry is returned as it is while `search` runs again in a background
+        thread. Exceptions from `search` propagate on a miss and are not cached.
+        """
+        state, result = self.lookup(source, query, options)
+        if state == "fresh":
+            self._count(source, "hits")
+            return result
+        if state == "stale":
+            self._count(source, "stale_hits")
+            self._refresh(source, query, options, search)
+            return result
+
+        self._count(source, "misses")
+        result = search()
+        self.store(source, query, options, result)
+        return result
+
+    def _refresh(self, source: str, query: str, options: SearchOptions, search: Callable[[], Any]) -> None:
+        key = self.make_key(source, query, options)
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh() -> None:
+            try:
+                self.store(source, query, options, search())
+                self._count(source, "refreshes")
+            except Exception as e:
+                # The stale entry keeps being served until it ages out
+                self._count(source, "refresh_failures")
+                logger.warning(f"Background refresh of {source} research failed: {str(e)}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        # Daemon thread: a pending refresh must not keep a finished CLI run alive
+        threading.Thread(target=refresh, name=f"research-refresh-{source}", daemon=True).start()
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-source hit/stale/miss counters of this process and the number of cached entries."""
+        with self._lock:
+            sources = {source: dict(counters) for source, counters in self._counters.items()}
+            try:
+                entries = self._conn.execute("SELECT COUNT(*) FROM research_cache").fetchone()[0]
+            except Exception:
+                entries = None
+        hits = sum(counters["hits"] + counters["stale_hits"] for counters in sources.values())
+        total = hits + sum(counters["misses"] for counters in sources.values())
+        return {
+            "sources": sources,
+            "hit_rate": round(hits / total, 3) if total else 0.0,
+            "entries": entries,
+        }
+
+
+_research_cache: Optional[ResearchCache] = None
+_research_cache_lock = threading.Lock()
+
+
+def get_research_cache() -> Optional[ResearchCache]:
+    """The process-wide research cache configured by the environment, or None when disabled."""
+    global _research_cache
+    if not RESEARCH_CACHE_ENABLED:
+        return None
+    with _research_cache_lock:
+        if _research_cache is None:
+            try:
+                _research_cache = ResearchCache()
+            except Exception as e:
+                logger.warning(f"Research cache disabled, could not open {RESEARCH_CACHE_PATH}: {str(e)}")
+                return None
+        return _research_cache
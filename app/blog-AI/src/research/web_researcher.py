@@ -1,7 +1,27 @@
 """
 Web research functionality.
+
+conduct_web_research() queries Google SERP, Tavily, Metaphor and Google Trends
+concurrently. Each source has its own deadline; a source that fails or misses its
+deadline is left out of the results (and recorded in ResearchResults.errors) instead
+of failing the whole research step, so research takes as long as the slowest source
+that finishes in time rather than the sum of all of them.
+
+Results are cached per source in the shared research cache (see research_cache), so
+the outline and the post for the same topic, and related jobs, reuse one set of
+results.
+
+Configuration (environment variables):
+    RESEARCH_GOOGLE_DEADLINE    Seconds to wait for Google SERP results (default: 15)
+    RESEARCH_TAVILY_DEADLINE    Seconds to wait for Tavily results (default: 20)
+    RESEARCH_METAPHOR_DEADLINE  Seconds to wait for Metaphor results and contents (default: 20)
+    RESEARCH_TRENDS_DEADLINE    Seconds to wait for Google Trends data (default: 15)
 """
 import os
+import time
+import logging
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from typing import List, Dict, Any, Optional
 
 from ..types.research import (
@@ -17,6 +37,17 @@ from ..types.research import (
     TavilyResult,
     TrendPoint
 )
+from .research_cache import get_research_cache
+
+logger = logging.getLogger(__name__)
+
+# Per-source deadlines in seconds, also used as the HTTP timeout of the source's requests
+RESEARCH_DEADLINES = {
+    "google": float(os.getenv("RESEARCH_GOOGLE_DEADLINE", 15)),
+    "tavily": float(os.getenv("RESEARCH_TAVILY_DEADLINE", 20)),
+    "metaphor": float(os.getenv("RESEARCH_METAPHOR_DEADLINE", 20)),
+    "trends": float(os.getenv("RESEARCH_TRENDS_DEADLINE", 15)),
+}
 
 
 class ResearchError(Exception):
@@ -26,47 +57,86 @@ class ResearchError(Exception):
 
 def conduct_web_research(
     keywords: List[str],
-    options: Optional[SearchOptions] = None
+    options: Optional[SearchOptions] = None,
+    use_cache: bool = True
 ) -> ResearchResults:
     """
-    Conduct web research using multiple sources.
+    Conduct web research using multiple sources concurrently.
     
     Args:
         keywords: The keywords to research.
         options: Options for the search.
+        use_cache: Serve and store results through the shared research cache.
         
     Returns:
-        The research results.
+        The research results. Sources that failed or missed their deadline are None,
+        with the reason in `errors`.
         
     Raises:
-        ResearchError: If an error occurs during research.
+        ResearchError: If every source fails.
     """
     options = options or SearchOptions()
+    cache = get_research_cache() if use_cache else None
     
+    # Convert keywords list to a string for searching
+    search_query = " ".join(keywords)
+    
+    # Source -> (search function, its query argument, query text the cache is keyed on);
+    # Google Trends only looks at the first keyword
+    sources = {
+        "google": (google_serp_search, search_query, search_query),
+        "tavily": (tavily_ai_search, search_query, search_query),
+        "metaphor": (metaphor_ai_search, search_query, search_query),
+        "trends": (google_trends_analysis, keywords, keywords[0] if keywords else ""),
+    }
+    
+    def run_source(name: str) -> Any:
+        search, query, cache_query = sources[name]
+        run = partial(search, query, options, RESEARCH_DEADLINES[name])
+        if cache is None:
+            return run()
+        return cache.get_or_search(name, cache_query, options, run)
+    
+    results: Dict[str, Any] = {}
+    errors: Dict[str, str] = {}
+    
+    started = time.monotonic()
+    executor = ThreadPoolExecutor(max_workers=len(sources), thread_name_prefix="research")
     try:
-        # Convert keywords list to a string for searching
-        search_query = " ".join(keywords)
-        
-        # Conduct research using different sources
-        google_results = google_serp_search(search_query, options)
-        tavily_results = tavily_ai_search(search_query, options)
-        metaphor_results = metaphor_ai_search(search_query, options)
-        trends_results = google_trends_analysis(keywords, options)
-        
-        # Combine results
-        return ResearchResults(
-            google=google_results,
-            tavily=tavily_results,
-            metaphor=metaphor_results,
-            trends=trends_results
-        )
-    except Exception as e:
-        raise ResearchError(f"Error conducting web research: {str(e)}")
+        futures = {name: executor.submit(run_source, name) for name in sources}
+        
+        # Collect in deadline order; each source gets its own deadline from the common start
+        for name in sorted(futures, key=RESEARCH_DEADLINES.get):
+            remaining = RESEARCH_DEADLINES[name] - (time.monotonic() - started)
+            try:
+                results[name] = futures[name].result(timeout=max(0, remaining))
+            except FutureTimeoutError:
+                errors[name] = f"No results within {RESEARCH_DEADLINES[name]:.0f}s"
+            except Exception as e:
+                errors[name] = str(e)
+    finally:
+        # A source that missed its deadline finishes (its requests time out) in the background
+        executor.shutdown(wait=False, cancel_futures=True)
+    
+    for name, error in errors.items():
+        logger.warning(f"Research source {name} skipped: {error}")
+    
+    if not results:
+        raise ResearchError(f"Error conducting web research: {'; '.join(f'{name}: {error}' for name, error in errors.items())}")
+    
+    return ResearchResults(
+        google=results.get("google"),
+        tavily=results.get("tavily"),
+        metaphor=results.get("metaphor"),
+        trends=results.get("trends"),
+        errors=errors
+    )
 
 
 def google_serp_search(
     query: str,
-    options: SearchOptions
+    options: SearchOptions,
+    timeout: Optional[float] = None
 ) -> Optional[GoogleSerpResult]:
     """
     Search using Google SERP API.
@@ -74,6 +144,7 @@ def google_serp_search(
     Args:
         query: The search query.
         options: Options for the search.
+        timeout: Timeout for each HTTP request in seconds.
         
     Returns:
         The search results.
@@ -100,7 +171,7 @@ def google_serp_search(
             "tbs": f"qdr:{options.time_range}" if options.time_range != "anytime" else ""
         }
         
-        response = requests.get(url, params=params)
+        response = requests.get(url, params=params, timeout=timeout)
         response.raise_for_status()
         
         data = response.json()
@@ -148,7 +219,8 @@ def google_serp_search(
 
 def tavily_ai_search(
     query: str,
-    options: SearchOptions
+    options: SearchOptions,
+    timeout: Optional[float] = None
 ) -> Optional[TavilySearchResult]:
     """
     Search using Tavily AI.
@@ -156,6 +228,7 @@ def tavily_ai_search(
     Args:
         query: The search query.
         options: Options for the search.
+        timeout: Timeout for each HTTP request in seconds.
         
     Returns:
         The search results.
@@ -187,7 +260,7 @@ def tavily_ai_search(
             "include_images": False
         }
         
-        response = requests.post(url, headers=headers, json=data)
+        response = requests.post(url, headers=headers, json=data, timeout=timeout)
         response.raise_for_status()
         
         result = response.json()
@@ -216,7 +289,8 @@ def tavily_ai_search(
 
 def metaphor_ai_search(
     query: str,
-    options: SearchOptions
+    options: SearchOptions,
+    timeout: Optional[float] = None
 ) -> Optional[List[MetaphorResult]]:
     """
     Search using Metaphor AI.
@@ -224,6 +298,7 @@ def metaphor_ai_search(
     Args:
         query: The search query.
         options: Options for the search.
+        timeout: Timeout for each HTTP request in seconds.
         
     Returns:
         The search results.
@@ -255,31 +330,35 @@ def metaphor_ai_search(
             data["type"] = "neural"
             data["url"] = options.similar_url
         
-        response = requests.post(url, headers=headers, json=data)
+        response = requests.post(url, headers=headers, json=data, timeout=timeout)
         response.raise_for_status()
         
         result = response.json()
         
+        items = result.get("results", [])
+        
+        # Get the content of all results in one request
+        contents = {}
+        ids = [item.get("id") for item in items if item.get("id")]
+        if ids:
+            content_response = requests.post(
+                "https://api.metaphor.systems/contents",
+                headers=headers,
+                json={"ids": ids},
+                timeout=timeout
+            )
+            content_response.raise_for_status()
+            for content in content_response.json().get("contents", []):
+                contents[content.get("id")] = content.get("extract", "")
+        
         # Extract results
         metaphor_results = []
-        for item in result.get("results", []):
-            # Get content for each result
-            content_url = f"https://api.metaphor.systems/contents"
-            content_data = {
-                "ids": [item.get("id")]
-            }
-            
-            content_response = requests.post(content_url, headers=headers, json=content_data)
-            content_response.raise_for_status()
-            
-            content_result = content_response.json()
-            content = content_result.get("contents", [{}])[0].get("extract", "")
-            
+        for item in items:
             metaphor_results.append(
                 MetaphorResult(
                     title=item.get("title", ""),
                     url=item.get("url", ""),
-                    text=content
+                    text=contents.get(item.get("id"), "")
                 )
             )
         
@@ -292,7 +371,8 @@ def metaphor_ai_search(
 
 def google_trends_analysis(
     keywords: List[str],
-    options: SearchOptions
+    options: SearchOptions,
+    timeout: Optional[float] = None
 ) -> Optional[GoogleTrendsResult]:
     """
     Analyze trends using Google Trends.
@@ -300,6 +380,7 @@ def google_trends_analysis(
     Args:
         keywords: The keywords to analyze.
         options: Options for the analysis.
+        timeout: Timeout for each HTTP request in seconds.
         
     Returns:
         The analysis results.
@@ -317,7 +398,7 @@ def google_trends_analysis(
             return None
         
         # Initialize pytrends
-        pytrends = TrendReq(hl=options.language, geo=options.location.upper())
+        pytrends = TrendReq(hl=options.language, geo=options.location.upper(), timeout=timeout or (2, 5))
         
         # Build payload
         pytrends.build_payload([keyword], timeframe="today 12-m")
@@ -6,11 +6,10 @@ import json
 import os
 from datetime import datetime
 
-from ..text_generation.core import generate_text, LLMProvider, GenerationOptions
+from ..text_generation.core import generate_text, LLMProvider, GenerationOptions, get_llm_client
 from ..types.seo import SemanticKeywords
+from ..shared import get_keyword_matcher
 
-# OpenAI for backward compatibility
-import openai
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -20,28 +19,26 @@ load_dotenv()
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 DEFAULT_MODEL = "gpt-3.5-turbo"
 
-# Set OpenAI API key
-openai.api_key = OPENAI_API_KEY
-
 
 class SemanticKeywordError(Exception):
     """Exception raised for errors in the semantic keyword generation process."""
     pass
 
 
-def generate_text_with_openai(prompt: str, model: str = DEFAULT_MODEL) -> str:
+def generate_text_with_openai(prompt: str, model: str = DEFAULT_MODEL, use_cache: bool = True) -> str:
     """Generate text using OpenAI API - backward compatibility function"""
     try:
-        response = openai.ChatCompletion.create(
-            model=model,
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant that creates high-quality SEO content and semantic keywords."},
-                {"role": "user", "content": prompt}
-            ],
+        response = get_llm_client().complete(
+            "openai",
+            model,
+            prompt,
+            system="You are a helpful assistant that creates high-quality SEO content and semantic keywords.",
+            api_key=OPENAI_API_KEY,
             max_tokens=2000,
-            temperature=0.7
+            temperature=0.7,
+            use_cache=use_cache
         )
-        return response.choices[0].message.content.strip()
+        return response.strip()
     except Exception as e:
         raise SemanticKeywordError(f"OpenAI API error: {str(e)}")
 
@@ -416,7 +413,6 @@ def optimize_keywords_for_content(
         Dictionary with optimization suggestions.
     """
     try:
-        content_lower = content.lower()
         word_count = len(content.split())
         
         optimization_data = {
@@ -426,13 +422,20 @@ def optimize_keywords_for_content(
             "suggestions": []
         }
         
-        # Analyze each keyword category
-        for category, kw_list in [
+        categories = [
             ("primary", keywords.primary_keywords),
             ("secondary", keywords.secondary_keywords),
             ("long_tail", keywords.long_tail_keywords),
             ("related", keywords.related_keywords)
-        ]:
+        ]
+        
+        # Every keyword of every category is located in a single pass over the content
+        positions = get_keyword_matcher(tuple(
+            keyword for _, kw_list in categories for keyword in kw_list
+        )).find(content)
+        
+        # Analyze each keyword category
+        for category, kw_list in categories:
             category_data = {
                 "keywords": [],
                 "total_occurrences": 0,
@@ -440,13 +443,15 @@ def optimize_keywords_for_content(
             }
             
             for keyword in kw_list:
-                occurrences = content_lower.count(keyword.lower())
+                keyword_positions = positions.get(keyword, [])
+                occurrences = len(keyword_positions)
                 density = (occurrences / word_count) * 100 if word_count > 0 else 0
                 
                 category_data["keywords"].append({
                     "keyword": keyword,
                     "occurrences": occurrences,
-                    "density": density
+                    "density": density,
+                    "positions": keyword_positions
                 })
                 category_data["total_occurrences"] += occurrences
             
@@ -0,0 +1,19 @@
+"""
+Backend modules shared with the rest of the project.
+
+The LLM client, the keyword matcher and the stage executor live outside this package
+(app/ and the repository root), so they are imported here, after the repository root
+is put on sys.path, and the rest of the package imports them from this module.
+"""
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from app.llm_client import get_llm_client, LLMClientError  # noqa: E402
+from app.keyword_matcher import get_keyword_matcher  # noqa: E402
+from stage_executor import StageExecutor  # noqa: E402
+
+__all__ = ["PROJECT_ROOT", "get_llm_client", "LLMClientError", "get_keyword_matcher", "StageExecutor"]
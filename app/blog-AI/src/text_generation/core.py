@@ -4,6 +4,8 @@ Core text generation functionality.
 import os
 from typing import Dict, Any, Optional
 
+from ..shared import get_llm_client, LLMClientError
+
 from ..types.providers import (
     LLMProvider,
     GenerationOptions,
@@ -73,24 +75,19 @@ def generate_with_openai(
         TextGenerationError: If an error occurs during text generation.
     """
     try:
-        import openai
-        
-        openai.api_key = config.api_key
-        
-        response = openai.chat.completions.create(
-            model=config.model,
-            messages=[{"role": "user", "content": prompt}],
+        return get_llm_client().complete(
+            "openai",
+            config.model,
+            prompt,
+            api_key=config.api_key,
             temperature=options.temperature,
             max_tokens=options.max_tokens,
             top_p=options.top_p,
             frequency_penalty=options.frequency_penalty,
-            presence_penalty=options.presence_penalty
+            presence_penalty=options.presence_penalty,
+            use_cache=options.use_cache
         )
-        
-        return response.choices[0].message.content
-    except ImportError:
-        raise TextGenerationError("OpenAI package not installed. Install it with 'pip install openai'.")
-    except Exception as e:
+    except LLMClientError as e:
         raise TextGenerationError(f"Error generating text with OpenAI: {str(e)}")
 
 
@@ -114,21 +111,16 @@ def generate_with_anthropic(
         TextGenerationError: If an error occurs during text generation.
     """
     try:
-        import anthropic
-        
-        client = anthropic.Anthropic(api_key=config.api_key)
-        
-        response = client.messages.create(
-            model=config.model,
-            max_tokens=options.max_tokens,
+        return get_llm_client().complete(
+            "anthropic",
+            config.model,
+            prompt,
+            api_key=config.api_key,
             temperature=options.temperature,
-            messages=[{"role": "user", "content": prompt}]
+            max_tokens=options.max_tokens,
+            use_cache=options.use_cache
         )
-        
-        return response.content[0].text
-    except ImportError:
-        raise TextGenerationError("Anthropic package not installed. Install it with 'pip install anthropic'.")
-    except Exception as e:
+    except LLMClientError as e:
         raise TextGenerationError(f"Error generating text with Anthropic: {str(e)}")
 
 
@@ -152,27 +144,17 @@ def generate_with_gemini(
         TextGenerationError: If an error occurs during text generation.
     """
     try:
-        import google.generativeai as genai
-        
-        genai.configure(api_key=config.api_key)
-        
-        generation_config = {
-            "temperature": options.temperature,
-            "top_p": options.top_p,
-            "max_output_tokens": options.max_tokens,
-        }
-        
-        model = genai.GenerativeModel(
+        return get_llm_client().complete(
+            "gemini",
             config.model,
-            generation_config=generation_config
+            prompt,
+            api_key=config.api_key,
+            temperature=options.temperature,
+            max_tokens=options.max_tokens,
+            top_p=options.top_p,
+            use_cache=options.use_cache
         )
-        
-        response = model.generate_content(prompt)
-        
-        return response.text
-    except ImportError:
-        raise TextGenerationError("Google Generative AI package not installed. Install it with 'pip install google-generativeai'.")
-    except Exception as e:
+    except LLMClientError as e:
         raise TextGenerationError(f"Error generating text with Gemini: {str(e)}")
 
 
@@ -33,6 +33,7 @@ class BlogPost:
     image: str
     tags: List[str]
     sections: List[Section]
+    timings: Dict[str, float]
     
     def __init__(
         self,
@@ -41,7 +42,8 @@ class BlogPost:
         sections: List[Section],
         date: Optional[str] = None,
         image: str = "/images/blog/default.jpg",
-        tags: Optional[List[str]] = None
+        tags: Optional[List[str]] = None,
+        timings: Optional[Dict[str, float]] = None
     ):
         self.title = title
         self.description = description
@@ -49,6 +51,8 @@ class BlogPost:
         self.image = image
         self.tags = tags or ["AI", "technology"]
         self.sections = sections
+        # Seconds each generation stage took (introduction, section_1, ..., faq)
+        self.timings = timings or {}
 
 
 class FAQ:
@@ -59,6 +59,7 @@ class GenerationOptions:
     top_p: float
     frequency_penalty: float
     presence_penalty: float
+    use_cache: bool
     
     def __init__(
         self,
@@ -66,10 +67,12 @@ class GenerationOptions:
         max_tokens: int = 4000,
         top_p: float = 0.9,
         frequency_penalty: float = 0.0,
-        presence_penalty: float = 0.0
+        presence_penalty: float = 0.0,
+        use_cache: bool = True
     ):
         self.temperature = temperature
         self.max_tokens = max_tokens
         self.top_p = top_p
         self.frequency_penalty = frequency_penalty
         self.presence_penalty = presence_penalty
+        self.use_cache = use_cache
@@ -157,15 +157,19 @@ class ResearchResults:
     tavily: Optional[TavilySearchResult]
     metaphor: Optional[List[MetaphorResult]]
     trends: Optional[GoogleTrendsResult]
+    errors: Dict[str, str]
     
     def __init__(
         self,
         google: Optional[GoogleSerpResult] = None,
         tavily: Optional[TavilySearchResult] = None,
         metaphor: Optional[List[MetaphorResult]] = None,
-        trends: Optional[GoogleTrendsResult] = None
+        trends: Optional[GoogleTrendsResult] = None,
+        errors: Optional[Dict[str, str]] = None
     ):
         self.google = google
         self.tavily = tavily
         self.metaphor = metaphor
         self.trends = trends
+        # Source name -> why it is missing (failed or missed its deadline)
+        self.errors = errors or {}
@@ -0,0 +1,228 @@
+"""
+Celery task queue for the content pipeline.
+
+Jobs move through three stages, each a Celery task keyed by job ID:
+
+    generate_outline(job_id)  keywords + competitor scraping + outline (outline_generation.process_job)
+    generate_blog(job_id)     Markdown → HTML for an approved job, then enqueues publish
+    publish(job_id)           upload to WordPress and mark the job as posted
+
+The API enqueues generate_outline from /create-job and generate_blog from
+/jobs/{id}/approve, so work starts immediately instead of waiting for the next
+cron poll. The polling scripts keep working alongside the queue; every task
+re-checks the job state before doing any work.
+
+Run a worker from the project root (each stage has its own queue, so stages can
+also be given separate workers):
+    celery -A app.celery_worker worker -Q outline,blog,publish --loglevel=info
+
+Configuration (environment variables):
+    CELERY_BROKER_URL        Broker URL, e.g. redis://localhost:6379/0
+                             (default: local SQLite broker in cache/celery_broker.sqlite3)
+    CELERY_CONCURRENCY       Worker processes (default: 2)
+    CELERY_MAX_RETRIES       Retries per task before giving up (default: 5)
+    CELERY_RETRY_BACKOFF     Base delay in seconds for exponential backoff (default: 30)
+    CELERY_RETRY_BACKOFF_MAX Maximum retry delay in seconds (default: 900)
+    OUTLINE_RATE_LIMIT       Per-worker rate limit for outline tasks (default: 10/m)
+    BLOG_RATE_LIMIT          Per-worker rate limit for blog tasks (default: 4/m)
+    PUBLISH_RATE_LIMIT       Per-worker rate limit for publish tasks (default: 30/m)
+"""
+
+import os
+import sys
+import logging
+from typing import Optional
+
+from celery import Celery
+from dotenv import load_dotenv
+
+from .job_claims import WORKER_ID, claim_job, release_job
+from .job_events import publish_job_event
+
+load_dotenv()
+
+# Blog generation lives in the project root scripts
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+logger = logging.getLogger(__name__)
+
+CELERY_BROKER_DB = os.path.join(project_root, "cache", "celery_broker.sqlite3")
+CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", f"sqla+sqlite:///{CELERY_BROKER_DB}")
+CELERY_CONCURRENCY = int(os.getenv("CELERY_CONCURRENCY", 2))
+CELERY_MAX_RETRIES = int(os.getenv("CELERY_MAX_RETRIES", 5))
+CELERY_RETRY_BACKOFF = int(os.getenv("CELERY_RETRY_BACKOFF", 30))
+CELERY_RETRY_BACKOFF_MAX = int(os.getenv("CELERY_RETRY_BACKOFF_MAX", 900))
+OUTLINE_RATE_LIMIT = os.getenv("OUTLINE_RATE_LIMIT", "10/m")
+BLOG_RATE_LIMIT = os.getenv("BLOG_RATE_LIMIT", "4/m")
+PUBLISH_RATE_LIMIT = os.getenv("PUBLISH_RATE_LIMIT", "30/m")
+
+if CELERY_BROKER_URL.endswith(CELERY_BROKER_DB):
+    os.makedirs(os.path.dirname(CELERY_BROKER_DB), exist_ok=True)
+
+celery_app = Celery("content_pipeline", broker=CELERY_BROKER_URL)
+celery_app.conf.update(
+    worker_concurrency=CELERY_CONCURRENCY,
+    # Tasks run for minutes; hand them out one at a time and only ack once finished
+    worker_prefetch_multiplier=1,
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    task_ignore_result=True,
+    task_serializer="json",
+    accept_content=["json"],
+    task_routes={
+        "content_pipeline.generate_outline": {"queue": "outline"},
+        "content_pipeline.generate_blog": {"queue": "blog"},
+        "content_pipeline.publish": {"queue": "publish"},
+    },
+    task_create_missing_queues=True,
+    # Keep /create-job and /approve responsive when the broker is down
+    task_publish_retry_policy={"max_retries": 2, "interval_start": 0, "interval_step": 0.5, "interval_max": 1},
+)
+
+RETRY_OPTIONS = {
+    "autoretry_for": (Exception,),
+    "max_retries": CELERY_MAX_RETRIES,
+    "retry_backoff": CELERY_RETRY_BACKOFF,
+    "retry_backoff_max": CELERY_RETRY_BACKOFF_MAX,
+    "retry_jitter": True,
+}
+
+
+class JobTaskError(Exception):
+    """Exception raised when a pipeline stage fails and should be retried."""
+    pass
+
+
+_blog_automation = None
+
+
+def get_blog_automation():
+    """Return this worker process's CleanBlogAutomation, created on first use."""
+    global _blog_automation
+    if _blog_automation is None:
+        from blog_automation_clean import CleanBlogAutomation
+        _blog_automation = CleanBlogAutomation(workers=int(os.getenv("BLOG_SECTION_WORKERS", 3)))
+    return _blog_automation
+
+
+def claim_approved_job(automation, job_id: int, held_by: Optional[str] = None):
+    """
+    Claim a job that is outlined and approved.
+
+    Args:
+        automation: This worker's CleanBlogAutomation.
+        job_id: ID of the job to claim.
+        held_by: Worker ID that handed its lease to this task (generate_blog → publish).
+
+    Returns:
+        The claimed job, or None if it is not ready or another worker holds it.
+    """
+    from app.models import ContentJob
+
+    # The automation keeps one session per worker process; drop anything it cached
+    # from earlier tasks so job state is read fresh.
+    automation.db.rollback()
+    automation.db.expire_all()
+
+    job = claim_job(automation.db, ContentJob, job_id, automation.approved_job_filters(), held_by=held_by)
+    if not job:
+        logger.info(f"Job {job_id} is not approved, already published or claimed by another worker, skipping")
+    return job
+
+
+def release_blog_job(automation, job, success: bool) -> None:
+    """Release this worker's lease on a blog job, discarding any half-finished changes on failure."""
+    from app.database import SessionLocal
+    from app.models import ContentJob
+    job_id, user_id = job.id, job.user_id
+    if not success:
+        automation.db.rollback()
+        publish_job_event(SessionLocal, job_id, user_id, "failed")
+    release_job(automation.db, ContentJob, job_id, success)
+
+
+@celery_app.task(name="content_pipeline.generate_outline", rate_limit=OUTLINE_RATE_LIMIT, **RETRY_OPTIONS)
+def generate_outline(job_id: int) -> bool:
+    """Generate semantic keywords, competitor keywords and the outline for a pending job."""
+    from app import outline_generation
+
+    job = outline_generation.claim_pending_job(job_id)
+    if not job:
+        logger.info(f"Job {job_id} is already outlined or claimed by another worker, skipping")
+        return False
+
+    if not outline_generation.process_job(job):
+        raise JobTaskError(f"Outline generation failed for job {job_id}")
+    return True
+
+
+@celery_app.task(name="content_pipeline.generate_blog", rate_limit=BLOG_RATE_LIMIT, **RETRY_OPTIONS)
+def generate_blog(job_id: int) -> bool:
+    """Generate the blog post for an approved job and hand it, with its lease, to the publish stage."""
+    automation = get_blog_automation()
+
+    job = claim_approved_job(automation, job_id)
+    if not job:
+        return False
+
+    try:
+        result = automation.generate_html(job)
+    except Exception:
+        release_blog_job(automation, job, False)
+        raise
+    if not result:
+        release_blog_job(automation, job, False)
+        raise JobTaskError(f"Blog generation failed for job {job_id}")
+
+    html_content, seo_metadata = result
+    publish.delay(job_id, html_content, seo_metadata, WORKER_ID)
+    return True
+
+
+@celery_app.task(name="content_pipeline.publish", rate_limit=PUBLISH_RATE_LIMIT, **RETRY_OPTIONS)
+def publish(
+    job_id: int,
+    html_content: Optional[str] = None,
+    seo_metadata: Optional[dict] = None,
+    held_by: Optional[str] = None,
+) -> bool:
+    """Upload a generated blog post to WordPress, regenerating it if no content was passed."""
+    automation = get_blog_automation()
+
+    job = claim_approved_job(automation, job_id, held_by=held_by)
+    if not job:
+        return False
+
+    success = False
+    try:
+        if html_content is None:
+            # LLM responses are cached, so regenerating an unchanged job is cheap
+            result = automation.generate_html(job)
+            if not result:
+                raise JobTaskError(f"Blog generation failed for job {job_id}")
+            html_content, seo_metadata = result
+
+        if not automation.publish_html(job, html_content, seo_metadata or {}):
+            raise JobTaskError(f"Publishing failed for job {job_id}")
+        success = True
+        return True
+    finally:
+        release_blog_job(automation, job, success)
+
+
+def enqueue(task, job_id: int) -> bool:
+    """
+    Enqueue a pipeline task without failing the caller when the broker is unavailable.
+
+    Returns:
+        True if the task was enqueued, False otherwise (the polling scripts will pick the job up)
+    """
+    try:
+        task.delay(job_id)
+        logger.info(f"Enqueued {task.name} for job {job_id}")
+        return True
+    except Exception as e:
+        logger.warning(f"Could not enqueue {task.name} for job {job_id}: {str(e)}")
+        return False
@@ -1,12 +1,54 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 import os
+import logging
 from dotenv import load_dotenv
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 DATABASE_URL = os.getenv("DATABASE_URL")
 
+# Async pool used by the async API endpoints (asyncpg)
+DB_ASYNC_POOL_SIZE = int(os.getenv("DB_ASYNC_POOL_SIZE", 20))
+DB_ASYNC_MAX_OVERFLOW = int(os.getenv("DB_ASYNC_MAX_OVERFLOW", 10))
+DB_ASYNC_POOL_TIMEOUT = float(os.getenv("DB_ASYNC_POOL_TIMEOUT", 30))
+
 engine = create_engine(DATABASE_URL,pool_pre_ping=True,pool_recycle=280 )
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 Base = declarative_base()
+
+
+def async_database_url(database_url: str) -> URL:
+    """Map the sync DATABASE_URL to its async driver (postgresql → postgresql+asyncpg)."""
+    url = make_url(database_url)
+    if url.drivername in ("postgres", "postgresql", "postgresql+psycopg2"):
+        query = dict(url.query)
+        # asyncpg takes the libpq sslmode values as "ssl"
+        sslmode = query.pop("sslmode", None)
+        if sslmode:
+            query["ssl"] = sslmode
+        url = url.set(drivername="postgresql+asyncpg", query=query)
+    elif url.drivername == "sqlite":
+        url = url.set(drivername="sqlite+aiosqlite")
+    return url
+
+
+try:
+    _async_url = async_database_url(DATABASE_URL)
+    _pool_options = {}
+    if _async_url.get_backend_name() == "postgresql":
+        _pool_options = {
+            "pool_size": DB_ASYNC_POOL_SIZE,
+            "max_overflow": DB_ASYNC_MAX_OVERFLOW,
+            "pool_timeout": DB_ASYNC_POOL_TIMEOUT,
+        }
+    async_engine = create_async_engine(_async_url, pool_pre_ping=True, pool_recycle=280, **_pool_options)
+    AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+except ImportError as e:
+    async_engine = None
+    AsyncSessionLocal = None
+    logger.warning(f"Async database driver unavailable, async endpoints are disabled: {e}")
@@ -4,29 +4,66 @@ from __future__ import annotations
 import asyncio
 import base64
 import io
+import json
 import os
 import tempfile
 import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 from xml.sax.saxutils import escape
 
 import aiofiles
 import httpx
-from fastapi import FastAPI, HTTPException, Response
+from fastapi import FastAPI, Header, HTTPException, Response
 from fastapi.responses import StreamingResponse
 from PIL import Image, ImageDraw, ImageFont, ImageStat
 from pydantic import BaseModel, HttpUrl, validator
 import colorsys
 import math
 
+from render_cache import RenderCache, etag_matches, make_render_key, source_digest
+
 app = FastAPI(title="Enhanced Featured Image Generator", version="1.0.0")
 
+# Rendering is CPU-bound PIL work; it runs in a process pool so the event loop stays free
+RENDER_WORKERS = int(os.getenv("RENDER_WORKERS", os.cpu_count() or 2))
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", 20))
+
+_render_pool: Optional[ProcessPoolExecutor] = None
+
+# Rendered images are cached on (source digest, text, style, pattern, format)
+OUTPUT_FORMAT = "webp"
+render_cache = RenderCache()
+_renders_in_flight: Dict[str, "asyncio.Future[bytes]"] = {}
+
+
+def get_render_pool() -> ProcessPoolExecutor:
+    """Return the render process pool, created on first use."""
+    global _render_pool
+    if _render_pool is None:
+        _render_pool = ProcessPoolExecutor(max_workers=RENDER_WORKERS)
+    return _render_pool
+
+
+@app.on_event("shutdown")
+def shutdown_render_pool():
+    """Stop the render worker processes"""
+    global _render_pool
+    if _render_pool is not None:
+        _render_pool.shutdown(wait=False, cancel_futures=True)
+        _render_pool = None
+
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy", "message": "Featured Image Generator is running"}
+    return {
+        "status": "healthy",
+        "message": "Featured Image Generator is running",
+        "render_cache": render_cache.stats()
+    }
 
 
 class FeaturedImageRequest(BaseModel):
@@ -50,6 +87,10 @@ class FeaturedImageRequest(BaseModel):
         return v if v in valid_patterns else "none"
 
 
+class BatchFeaturedImageRequest(BaseModel):
+    items: List[FeaturedImageRequest]
+
+
 class StyleOption(BaseModel):
     value: str
     description: str
@@ -334,7 +375,12 @@ def wrap_text(text: str, max_length: int = 20) -> List[str]:
     return lines
 
 
-async def create_enhanced_featured_image(
+class RenderError(Exception):
+    """Exception raised when a featured image cannot be rendered"""
+    pass
+
+
+def render_featured_image(
     image_data: bytes,
     article_title: str,
     read_time: Optional[str] = None,
@@ -344,7 +390,7 @@ async def create_enhanced_featured_image(
     style: str = "vibrant",
     pattern: str = "none"
 ) -> bytes:
-    """Create enhanced featured image"""
+    """Render an enhanced featured image (CPU-bound, runs in a render worker process)"""
     
     # Load and process the main image
     image = Image.open(io.BytesIO(image_data))
@@ -595,8 +641,153 @@ async def create_enhanced_featured_image(
         
     except Exception as e:
         print(f"Error creating image: {e}")
+        raise RenderError(f"Error creating image: {str(e)}")
+
+
+async def create_enhanced_featured_image(
+    image_data: bytes,
+    article_title: str,
+    read_time: Optional[str] = None,
+    author: Optional[str] = None,
+    publish_date: Optional[str] = None,
+    author_image: Optional[str] = None,
+    style: str = "vibrant",
+    pattern: str = "none"
+) -> bytes:
+    """Create enhanced featured image in the render process pool"""
+    global _render_pool
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(
+            get_render_pool(),
+            render_featured_image,
+            image_data,
+            article_title,
+            read_time,
+            author,
+            publish_date,
+            author_image,
+            style,
+            pattern
+        )
+    except BrokenProcessPool:
+        # A worker died (e.g. out of memory); start a fresh pool for the next request
+        _render_pool = None
+        raise HTTPException(status_code=503, detail="Render worker crashed, please retry")
+    except RenderError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error creating image: {str(e)}")
 
+
+def render_key_for(request: FeaturedImageRequest, digest: str) -> str:
+    """Render cache key (and ETag) for a request and a source image digest"""
+    return make_render_key(
+        digest,
+        request.article_title,
+        request.read_time,
+        request.author,
+        request.publish_date,
+        request.style,
+        request.pattern,
+        OUTPUT_FORMAT
+    )
+
+
+async def download_source(request: FeaturedImageRequest) -> Tuple[str, bytes]:
+    """Download the source image for a request and remember its digest"""
+    url = str(request.image_url)
+    image_data = await download_image(url)
+    digest = source_digest(image_data)
+    render_cache.remember_source(url, digest)
+    return render_key_for(request, digest), image_data
+
+
+async def get_cached_render(key: str) -> Optional[bytes]:
+    """Look up a render: memory tier on the event loop, the disk tier in a worker thread"""
+    cached = render_cache.get_memory(key)
+    if cached is None:
+        cached = await asyncio.to_thread(render_cache.get, key)
+    return cached
+
+
+async def render_uncached(request: FeaturedImageRequest, image_data: bytes) -> bytes:
+    """Render a featured image from downloaded source bytes"""
+    # Process author image if provided
+    author_image_data = None
+    if request.author_image:
+        author_image_data = await image_url_to_data_url(str(request.author_image))
+
+    # Create the enhanced featured image
+    return await create_enhanced_featured_image(
+        image_data=image_data,
+        article_title=request.article_title,
+        read_time=request.read_time,
+        author=request.author,
+        publish_date=request.publish_date,
+        author_image=author_image_data,
+        style=request.style,
+        pattern=request.pattern
+    )
+
+
+async def render_request(
+    request: FeaturedImageRequest,
+    if_none_match: Optional[str] = None
+) -> Tuple[str, Optional[bytes], bool]:
+    """
+    Render the featured image for a request, using the render cache.
+
+    The source image is only downloaded when its digest is unknown or the render is
+    not cached. Identical renders already in progress are shared.
+
+    Returns:
+        Tuple of (etag, image bytes, cache hit). Image bytes are None when
+        `if_none_match` matches the etag.
+    """
+    image_data = None
+    digest = render_cache.lookup_source(str(request.image_url))
+    if digest is None:
+        key, image_data = await download_source(request)
+    else:
+        key = render_key_for(request, digest)
+
+    if etag_matches(if_none_match, key):
+        return key, None, True
+
+    cached = await get_cached_render(key)
+    if cached is not None:
+        return key, cached, True
+
+    if image_data is None:
+        # Known source but the render was evicted; the source may have changed since
+        key, image_data = await download_source(request)
+        if etag_matches(if_none_match, key):
+            return key, None, True
+        cached = await get_cached_render(key)
+        if cached is not None:
+            return key, cached, True
+
+    task = _renders_in_flight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(render_uncached(request, image_data))
+        _renders_in_flight[key] = task
+
+        def finish_render(done: "asyncio.Future[bytes]") -> None:
+            _renders_in_flight.pop(key, None)
+            if not done.cancelled() and done.exception() is None:
+                # Memory tier right away, the file write and disk eviction in a thread
+                render_cache.put_memory(key, done.result())
+                asyncio.get_running_loop().run_in_executor(None, render_cache.put_disk, key, done.result())
+
+        task.add_done_callback(finish_render)
+
+    # Shielded so one cancelled caller does not cancel a render others are waiting for
+    return key, await asyncio.shield(task), False
+
+
 @app.get("/featured-image/options", response_model=OptionsResponse)
 async def get_options():
     """Get available styles and patterns"""
@@ -617,34 +808,24 @@ async def get_options():
 
 
 @app.post("/featured-image/create")
-async def create_featured_image(request: FeaturedImageRequest):
+async def create_featured_image(
+    request: FeaturedImageRequest,
+    if_none_match: Optional[str] = Header(None)
+):
     """Create enhanced featured image"""
     try:
-        # Download the main image
-        image_data = await download_image(str(request.image_url))
-        
-        # Process author image if provided
-        author_image_data = None
-        if request.author_image:
-            author_image_data = await image_url_to_data_url(str(request.author_image))
-        
-        # Create the enhanced featured image
-        image_bytes = await create_enhanced_featured_image(
-            image_data=image_data,
-            article_title=request.article_title,
-            read_time=request.read_time,
-            author=request.author,
-            publish_date=request.publish_date,
-            author_image=author_image_data,
-            style=request.style,
-            pattern=request.pattern
-        )
+        etag, image_bytes, cache_hit = await render_request(request, if_none_match)
+
+        if image_bytes is None:
+            return Response(status_code=304, headers={"ETag": f'"{etag}"'})
         
         return Response(
             content=image_bytes,
             media_type="image/webp",
             headers={
-                "Content-Disposition": "attachment; filename=enhanced-featured-image.webp"
+                "Content-Disposition": "attachment; filename=enhanced-featured-image.webp",
+                "ETag": f'"{etag}"',
+                "X-Render-Cache": "hit" if cache_hit else "miss"
             }
         )
         
@@ -652,6 +833,49 @@ async def create_featured_image(request: FeaturedImageRequest):
         raise HTTPException(status_code=500, detail=f"Error creating featured image: {str(e)}")
 
 
+@app.post("/featured-image/batch")
+async def create_featured_image_batch(request: BatchFeaturedImageRequest):
+    """
+    Create several featured images in parallel.
+
+    Results are streamed as newline-delimited JSON in completion order, one line per item:
+    {"index": 0, "status": "ok", "etag": "...", "content_type": "image/webp", "image": "<base64>"} or
+    {"index": 1, "status": "error", "error": "..."}
+    """
+    if not request.items:
+        raise HTTPException(status_code=400, detail="Batch must contain at least one item")
+    if len(request.items) > BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"Batch is limited to {BATCH_MAX_ITEMS} items")
+
+    async def render_item(index: int, item: FeaturedImageRequest) -> Dict[str, Any]:
+        try:
+            etag, image_bytes, _ = await render_request(item)
+            return {
+                "index": index,
+                "status": "ok",
+                "etag": etag,
+                "content_type": "image/webp",
+                "image": base64.b64encode(image_bytes).decode('utf-8')
+            }
+        except HTTPException as e:
+            return {"index": index, "status": "error", "error": e.detail}
+        except Exception as e:
+            return {"index": index, "status": "error", "error": str(e)}
+
+    async def stream_results():
+        tasks = [asyncio.ensure_future(render_item(i, item)) for i, item in enumerate(request.items)]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                result = await next_result
+                yield json.dumps(result) + "\n"
+        finally:
+            # Client went away: stop downloads that have not finished yet
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -0,0 +1,236 @@
+"""
+Render cache for featured images.
+
+Rendered images are keyed on the source image digest plus every input that changes
+the output (title, read time, author, publish date, style, pattern, output format).
+The key doubles as the ETag, so clients that already hold an image get a 304 back.
+
+Two tiers:
+- memory: LRU bounded by total bytes
+- disk:   one file per render in RENDER_CACHE_DIR, bounded by total bytes, evicted by
+          least recent access (file mtime)
+
+Source URLs are also mapped to the digest of their last download for a while, so a
+repeated render of the same URL is served without downloading the source again.
+
+The memory tier never touches the disk (get_memory, put_memory), so an async server
+can use it on the event loop and run get/put_disk, which read, write and evict files,
+in a worker thread. Disk eviction holds its own lock, never the memory tier's.
+
+Configuration (environment variables):
+    RENDER_CACHE_DIR              Directory for cached renders (default: cache/renders)
+    RENDER_CACHE_MEMORY_MAX_BYTES Memory tier size (default: 67108864, 64MB)
+    RENDER_CACHE_DISK_MAX_BYTES   Disk tier size (default: 1073741824, 1GB)
+    SOURCE_DIGEST_TTL             Seconds a source URL is trusted to be unchanged (default: 3600)
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+RENDER_CACHE_DIR = os.getenv("RENDER_CACHE_DIR", os.path.join("cache", "renders"))
+RENDER_CACHE_MEMORY_MAX_BYTES = int(os.getenv("RENDER_CACHE_MEMORY_MAX_BYTES", 64 * 1024 * 1024))
+RENDER_CACHE_DISK_MAX_BYTES = int(os.getenv("RENDER_CACHE_DISK_MAX_BYTES", 1024 * 1024 * 1024))
+SOURCE_DIGEST_TTL = int(os.getenv("SOURCE_DIGEST_TTL", 3600))
+
+# Bump when the layout in render_featured_image changes so old renders are not served
+RENDER_VERSION = "1"
+
+MAX_SOURCE_URLS = 10000
+
+
+def source_digest(image_data: bytes) -> str:
+    """Digest of downloaded source image bytes"""
+    return hashlib.sha256(image_data).hexdigest()
+
+
+def make_render_key(
+    digest: str,
+    article_title: str,
+    read_time: Optional[str],
+    author: Optional[str],
+    publish_date: Optional[str],
+    style: str,
+    pattern: str,
+    output_format: str
+) -> str:
+    """Cache key (and ETag) for one render"""
+    material = json.dumps(
+        [RENDER_VERSION, digest, article_title, read_time, author, publish_date, style, pattern, output_format],
+        separators=(",", ":")
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def etag_matches(if_none_match: Optional[str], key: str) -> bool:
+    """Check an If-None-Match header against a render key"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate.strip('"') == key:
+            return True
+    return False
+
+
+class RenderCache:
+    """Two-tier (memory + disk) cache of rendered featured images"""
+
+    def __init__(
+        self,
+        directory: str = RENDER_CACHE_DIR,
+        memory_max_bytes: int = RENDER_CACHE_MEMORY_MAX_BYTES,
+        disk_max_bytes: int = RENDER_CACHE_DISK_MAX_BYTES,
+        source_ttl: int = SOURCE_DIGEST_TTL
+    ):
+        self.directory = directory
+        self.memory_max_bytes = memory_max_bytes
+        self.disk_max_bytes = disk_max_bytes
+        self.source_ttl = source_ttl
+
+        self._lock = threading.Lock()
+        # Serializes disk eviction without blocking the memory tier
+        self._evict_lock = threading.Lock()
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._sources: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._disk_bytes = sum(entry.stat().st_size for entry in os.scandir(self.directory) if entry.is_file())
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key)
+
+    def lookup_source(self, url: str) -> Optional[str]:
+        """Digest of the last download of `url`, if it is recent enough to trust"""
+        with self._lock:
+            entry = self._sources.get(url)
+            if entry is None:
+                return None
+            digest, expires_at = entry
+            if expires_at < time.time():
+                del self._sources[url]
+                return None
+            return digest
+
+    def remember_source(self, url: str, digest: str) -> None:
+        """Record the digest of a freshly downloaded source image"""
+        with self._lock:
+            self._sources[url] = (digest, time.time() + self.source_ttl)
+            self._sources.move_to_end(url)
+            while len(self._sources) > MAX_SOURCE_URLS:
+                self._sources.popitem(last=False)
+
+    def get_memory(self, key: str) -> Optional[bytes]:
+        """Return cached render bytes from the memory tier only (no disk I/O), or None"""
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+            return data
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return cached render bytes from memory or disk, or None"""
+        data = self.get_memory(key)
+        if data is not None:
+            return data
+
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.disk_hits += 1
+            self._store_in_memory(key, data)
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        """Store a render in both tiers"""
+        self.put_memory(key, data)
+        self.put_disk(key, data)
+
+    def put_memory(self, key: str, data: bytes) -> None:
+        """Store a render in the memory tier only (no disk I/O)"""
+        with self._lock:
+            self._store_in_memory(key, data)
+
+    def put_disk(self, key: str, data: bytes) -> None:
+        """Write a render to the disk tier, evicting old renders when it is over size"""
+        path = self._path(key)
+        try:
+            replaced = os.path.getsize(path) if os.path.exists(path) else 0
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Render cache write failed: {e}")
+            return
+
+        with self._lock:
+            self._disk_bytes += len(data) - replaced
+            over_size = self._disk_bytes > self.disk_max_bytes
+        if over_size:
+            self._evict_disk()
+
+    def _store_in_memory(self, key: str, data: bytes) -> None:
+        if len(data) > self.memory_max_bytes:
+            return
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous)
+        self._memory[key] = data
+        self._memory_bytes += len(data)
+        while self._memory_bytes > self.memory_max_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    def _evict_disk(self) -> None:
+        with self._evict_lock:
+            entries = sorted(
+                (entry for entry in os.scandir(self.directory) if entry.is_file() and not entry.name.endswith(".tmp")),
+                key=lambda entry: entry.stat().st_mtime
+            )
+            disk_bytes = sum(entry.stat().st_size for entry in entries)
+            for entry in entries:
+                if disk_bytes <= self.disk_max_bytes:
+                    break
+                try:
+                    size = entry.stat().st_size
+                    os.remove(entry.path)
+                    disk_bytes -= size
+                except FileNotFoundError:
+                    pass
+            with self._lock:
+                self._disk_bytes = disk_bytes
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and tier sizes"""
+        with self._lock:
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_bytes": self._disk_bytes,
+            }
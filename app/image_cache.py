@@ -0,0 +1,215 @@
+"""
+Local caches for stock image searches and downloaded image files.
+
+Image searches for the same heading or keyword repeat on every rerun of an article.
+ImageSearchCache keeps provider search results (including "no hit" results) keyed on
+provider + normalized query + search parameters, so reruns stay off the Pexels,
+Pixabay and Unsplash quotas. ImageAssetStore keeps downloaded image bytes on disk,
+content-addressed by URL hash, with a total size cap and LRU eviction.
+
+Both share one SQLite index file next to the stored images.
+
+Configuration (environment variables):
+    IMAGE_CACHE_DIR             Directory for the index and stored images (default: cache/images)
+    IMAGE_SEARCH_CACHE_TTL      Seconds a search result is reused (default: 604800, 7 days)
+    IMAGE_SEARCH_MISS_TTL       Seconds a search without hits is remembered (default: 86400)
+    IMAGE_STORE_MAX_BYTES       Max total size of stored images (default: 524288000, 500MB)
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import logging
+import sqlite3
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+IMAGE_CACHE_DIR = os.getenv("IMAGE_CACHE_DIR", os.path.join("cache", "images"))
+IMAGE_SEARCH_CACHE_TTL = int(os.getenv("IMAGE_SEARCH_CACHE_TTL", 7 * 24 * 3600))
+IMAGE_SEARCH_MISS_TTL = int(os.getenv("IMAGE_SEARCH_MISS_TTL", 24 * 3600))
+IMAGE_STORE_MAX_BYTES = int(os.getenv("IMAGE_STORE_MAX_BYTES", 500 * 1024 * 1024))
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase a search query and reduce it to its words, so trivial variations share a cache entry."""
+    return " ".join(re.findall(r"\w+", query.lower()))
+
+
+class _SQLiteIndex:
+    """Shared SQLite connection for the image caches, serialized with a lock."""
+
+    def __init__(self, directory: str):
+        os.makedirs(directory, exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(os.path.join(directory, "index.sqlite3"), check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS image_searches (
+                key TEXT PRIMARY KEY,
+                provider TEXT NOT NULL,
+                query TEXT NOT NULL,
+                result TEXT,
+                expires_at REAL NOT NULL
+            )
+            """
+        )
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS image_assets (
+                url_hash TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_accessed REAL NOT NULL
+            )
+            """
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_image_assets_last_accessed ON image_assets (last_accessed)")
+
+
+_indexes: Dict[str, _SQLiteIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def _get_index(directory: str) -> _SQLiteIndex:
+    directory = os.path.abspath(directory)
+    with _indexes_lock:
+        if directory not in _indexes:
+            _indexes[directory] = _SQLiteIndex(directory)
+        return _indexes[directory]
+
+
+class ImageSearchCache:
+    """Provider search results keyed on (provider, normalized query, parameters) with TTL."""
+
+    def __init__(self, directory: str = IMAGE_CACHE_DIR, ttl: int = IMAGE_SEARCH_CACHE_TTL, miss_ttl: int = IMAGE_SEARCH_MISS_TTL):
+        self.index = _get_index(directory)
+        self.ttl = ttl
+        self.miss_ttl = miss_ttl
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(provider: str, query: str, params: Optional[Dict[str, Any]] = None) -> str:
+        material = json.dumps([provider, normalize_query(query), sorted((params or {}).items())], separators=(",", ":"))
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def lookup(self, provider: str, query: str, params: Optional[Dict[str, Any]] = None) -> Tuple[bool, Any]:
+        """
+        Look up a cached search result.
+
+        Returns:
+            Tuple of (found, result). A cached search without hits is returned as (True, None).
+        """
+        key = self.make_key(provider, query, params)
+        try:
+            with self.index.lock:
+                row = self.index.conn.execute(
+                    "SELECT result, expires_at FROM image_searches WHERE key = ?", (key,)
+                ).fetchone()
+        except Exception as e:
+            logger.warning(f"Image search cache read failed: {str(e)}")
+            row = None
+
+        if row is None or row[1] < time.time():
+            self.misses += 1
+            return False, None
+
+        self.hits += 1
+        return True, json.loads(row[0]) if row[0] is not None else None
+
+    def store(self, provider: str, query: str, result: Any, params: Optional[Dict[str, Any]] = None) -> None:
+        """Cache a search result; None (no hits) is kept for the shorter miss TTL."""
+        key = self.make_key(provider, query, params)
+        ttl = self.ttl if result is not None else self.miss_ttl
+        try:
+            with self.index.lock:
+                self.index.conn.execute(
+                    "INSERT OR REPLACE INTO image_searches (key, provider, query, result, expires_at) VALUES (?, ?, ?, ?, ?)",
+                    (key, provider, normalize_query(query), json.dumps(result) if result is not None else None, time.time() + ttl),
+                )
+                self.index.conn.execute("DELETE FROM image_searches WHERE expires_at < ?", (time.time(),))
+        except Exception as e:
+            logger.warning(f"Image search cache write failed: {str(e)}")
+
+
+class ImageAssetStore:
+    """Downloaded image bytes stored by URL hash, bounded by total size with LRU eviction."""
+
+    def __init__(self, directory: str = IMAGE_CACHE_DIR, max_bytes: int = IMAGE_STORE_MAX_BYTES):
+        self.index = _get_index(directory)
+        self.assets_dir = os.path.join(directory, "assets")
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.assets_dir, exist_ok=True)
+
+    @staticmethod
+    def url_hash(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _path(self, url_hash: str) -> str:
+        return os.path.join(self.assets_dir, url_hash[:2], url_hash)
+
+    def get(self, url: str) -> Optional[bytes]:
+        """Return the stored bytes for a URL, or None if it has not been downloaded."""
+        url_hash = self.url_hash(url)
+        path = self._path(url_hash)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+
+        try:
+            with self.index.lock:
+                self.index.conn.execute(
+                    "UPDATE image_assets SET last_accessed = ? WHERE url_hash = ?", (time.time(), url_hash)
+                )
+        except Exception as e:
+            logger.warning(f"Image store index update failed: {str(e)}")
+
+        self.hits += 1
+        return data
+
+    def put(self, url: str, data: bytes) -> None:
+        """Store downloaded bytes for a URL and evict least recently used files over the size cap."""
+        url_hash = self.url_hash(url)
+        path = self._path(url_hash)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+            with self.index.lock:
+                self.index.conn.execute(
+                    "INSERT OR REPLACE INTO image_assets (url_hash, url, size, last_accessed) VALUES (?, ?, ?, ?)",
+                    (url_hash, url, len(data), time.time()),
+                )
+                self._evict()
+        except Exception as e:
+            logger.warning(f"Image store write failed: {str(e)}")
+
+    def _evict(self) -> None:
+        total_bytes = self.index.conn.execute("SELECT COALESCE(SUM(size), 0) FROM image_assets").fetchone()[0]
+        if total_bytes <= self.max_bytes:
+            return
+
+        rows = self.index.conn.execute("SELECT url_hash, size FROM image_assets ORDER BY last_accessed ASC").fetchall()
+        for url_hash, size in rows:
+            if total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(self._path(url_hash))
+            except FileNotFoundError:
+                pass
+            self.index.conn.execute("DELETE FROM image_assets WHERE url_hash = ?", (url_hash,))
+            total_bytes -= size
+            logger.debug(f"Evicted stored image {url_hash}")
@@ -0,0 +1,199 @@
+"""
+Lease-based claiming of content jobs.
+
+Outline and blog workers claim jobs before processing them so several workers
+(processes or hosts) can run side by side without paying for the same job twice.
+A claim row-locks candidate jobs with SELECT ... FOR UPDATE SKIP LOCKED, stamps them
+with the worker ID and a lease expiry, and bumps the attempt count. Jobs whose lease
+expired (crashed or stuck worker) become claimable again; jobs that used up their
+attempts are left alone.
+
+Stages that can run longer than the lease renew it with renew_lease() as they go, and
+the final write of a job goes through lock_claimed_job(), so a worker that lost its
+lease (another worker reclaimed the job) cannot commit results over the new owner's.
+
+Requires the claimed_by, lease_expires_at and attempt_count columns
+(migrations/001_content_job_leases.sql).
+
+Configuration (environment variables):
+    JOB_LEASE_SECONDS   Lease length for a claimed job (default: 900)
+    JOB_MAX_ATTEMPTS    Claims per job before it is no longer picked up (default: 5)
+"""
+
+import os
+import socket
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, List, Optional
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+JOB_LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", 900))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", 5))
+
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+
+class LeaseLostError(Exception):
+    """Raised when a worker no longer holds the lease on a job it is processing."""
+
+
+def _claimable(model, held_by: Optional[str] = None) -> List[Any]:
+    now = datetime.now(timezone.utc)
+    unleased = [model.lease_expires_at.is_(None), model.lease_expires_at < now]
+    if held_by:
+        # Lets the next stage of a pipeline take over a lease it was handed
+        unleased.append(model.claimed_by == held_by)
+    return [
+        or_(*unleased),
+        model.attempt_count < JOB_MAX_ATTEMPTS,
+    ]
+
+
+def _stamp(jobs: List[Any], worker_id: str, lease_seconds: int) -> None:
+    lease_expires_at = datetime.now(timezone.utc) + timedelta(seconds=lease_seconds)
+    for job in jobs:
+        job.claimed_by = worker_id
+        job.lease_expires_at = lease_expires_at
+        job.attempt_count = (job.attempt_count or 0) + 1
+
+
+def claim_jobs(
+    db: Session,
+    model,
+    filters: List[Any],
+    limit: int,
+    worker_id: str = WORKER_ID,
+    lease_seconds: int = JOB_LEASE_SECONDS,
+    held_by: Optional[str] = None,
+) -> List[Any]:
+    """
+    Atomically claim up to `limit` jobs matching `filters`.
+
+    Args:
+        db: Database session; the claim is committed before returning.
+        model: ContentJob model class.
+        filters: SQLAlchemy filter expressions selecting jobs ready for this stage.
+        limit: Maximum number of jobs to claim.
+        worker_id: Identifier stored in claimed_by.
+        lease_seconds: How long the claim is held before other workers may take over.
+        held_by: Also claim jobs currently leased by this worker ID (lease hand-over).
+
+    Returns:
+        The claimed jobs, oldest first.
+    """
+    try:
+        jobs = (
+            db.query(model)
+            .filter(*filters, *_claimable(model, held_by))
+            .order_by(model.created_at, model.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        _stamp(jobs, worker_id, lease_seconds)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    if jobs:
+        logger.info(f"Worker {worker_id} claimed jobs {[job.id for job in jobs]}")
+    return jobs
+
+
+def claim_job(
+    db: Session,
+    model,
+    job_id: int,
+    filters: List[Any],
+    worker_id: str = WORKER_ID,
+    lease_seconds: int = JOB_LEASE_SECONDS,
+    held_by: Optional[str] = None,
+) -> Optional[Any]:
+    """
+    Atomically claim one specific job if it matches `filters` and is not leased.
+
+    Returns:
+        The claimed job, or None if it is not ready or another worker holds it.
+    """
+    jobs = claim_jobs(db, model, [model.id == job_id, *filters], 1, worker_id, lease_seconds, held_by)
+    return jobs[0] if jobs else None
+
+
+def release_job(db: Session, model, job_id: int, success: bool, worker_id: str = WORKER_ID) -> None:
+    """
+    Release this worker's lease on a job.
+
+    A successful job has its attempt count reset for the next stage; a failed job keeps
+    it so repeated failures eventually stop being retried.
+    """
+    try:
+        values = {"claimed_by": None, "lease_expires_at": None}
+        if success:
+            values["attempt_count"] = 0
+
+        db.query(model).filter(
+            model.id == job_id,
+            model.claimed_by == worker_id
+        ).update(values, synchronize_session=False)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error releasing lease on job {job_id}: {e}")
+
+
+def renew_lease(
+    db: Session,
+    model,
+    job_id: int,
+    worker_id: str = WORKER_ID,
+    lease_seconds: int = JOB_LEASE_SECONDS,
+) -> bool:
+    """
+    Extend this worker's lease on a job (heartbeat for long-running stages).
+
+    Returns:
+        True if the lease was extended, False if this worker no longer holds it.
+    """
+    try:
+        renewed = db.query(model).filter(
+            model.id == job_id,
+            model.claimed_by == worker_id
+        ).update(
+            {"lease_expires_at": datetime.now(timezone.utc) + timedelta(seconds=lease_seconds)},
+            synchronize_session=False
+        )
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error renewing lease on job {job_id}: {e}")
+        return False
+
+    if not renewed:
+        logger.warning(f"Worker {worker_id} lost its lease on job {job_id}")
+    return bool(renewed)
+
+
+def lock_claimed_job(db: Session, model, job_id: int, worker_id: str = WORKER_ID) -> Any:
+    """
+    Row-lock a job for its final write, provided this worker still holds its lease.
+
+    The lock is held until the caller commits, so no other worker can claim the job
+    between the check and the write.
+
+    Raises:
+        LeaseLostError: If another worker has claimed the job (or it was released).
+    """
+    job = (
+        db.query(model)
+        .filter(model.id == job_id, model.claimed_by == worker_id)
+        .with_for_update()
+        .first()
+    )
+    if job is None:
+        raise LeaseLostError(f"Worker {worker_id} no longer holds the lease on job {job_id}")
+    return job
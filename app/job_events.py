@@ -0,0 +1,238 @@
+"""
+Job progress events for the /jobs/stream endpoint.
+
+Workers and the API report job stage transitions (keywords done, outline done,
+sections N/M, images N/M, published, ...) as small JSON events. On PostgreSQL an event
+is sent with pg_notify on the JOB_EVENTS_CHANNEL channel, so it reaches the API from
+any worker process; the API holds one LISTEN connection and fans events out to the
+connected clients of the job's owner. On other databases (local SQLite setups) events
+only reach clients connected to the same process.
+
+notify_job_event() queues the event in the caller's transaction, so a client is told
+"outlined" only once the outline is committed, and never about a write that was rolled
+back. publish_job_event() sends progress that has no database write of its own
+(sections, images) in a short transaction.
+
+Event payload:
+    {"job_id": 12, "user_id": 3, "stage": "sections", "completed": 4, "total": 7,
+     "at": "2025-01-01T12:00:00+00:00"}
+
+Configuration (environment variables):
+    JOB_EVENTS_CHANNEL      NOTIFY channel name (default: job_events)
+    JOB_STREAM_QUEUE_SIZE   Events buffered per client before it is resynced (default: 100)
+    JOB_STREAM_HEARTBEAT    Seconds between keep-alive comments on a stream (default: 15)
+"""
+
+import os
+import json
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional, Set
+
+from sqlalchemy import event as sa_event, text
+
+logger = logging.getLogger(__name__)
+
+JOB_EVENTS_CHANNEL = os.getenv("JOB_EVENTS_CHANNEL", "job_events")
+JOB_STREAM_QUEUE_SIZE = int(os.getenv("JOB_STREAM_QUEUE_SIZE", 100))
+JOB_STREAM_HEARTBEAT = float(os.getenv("JOB_STREAM_HEARTBEAT", 15))
+
+# PostgreSQL rejects NOTIFY payloads of 8000 bytes or more
+MAX_PAYLOAD_BYTES = 7900
+LISTENER_CHECK_INTERVAL = 10
+LISTENER_MAX_BACKOFF = 30
+
+# Put on a client's queue when events may have been missed; the stream re-reads job state
+RESYNC = None
+
+# Session.info key of the events waiting for their session to commit (non-PostgreSQL)
+PENDING_EVENTS_KEY = "pending_job_events"
+
+
+def make_event(job_id: int, user_id: int, stage: str, **fields: Any) -> Dict[str, Any]:
+    return {
+        "job_id": job_id,
+        "user_id": user_id,
+        "stage": stage,
+        **fields,
+        "at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def _dispatch_pending(session) -> None:
+    for event in session.info.pop(PENDING_EVENTS_KEY, []):
+        job_event_broker.dispatch(event)
+
+
+def _drop_pending(session, previous_transaction) -> None:
+    # A rolled back savepoint leaves the outer transaction (and its events) alive
+    if not previous_transaction.nested:
+        session.info.pop(PENDING_EVENTS_KEY, None)
+
+
+def _queue_local_event(db, event: Dict[str, Any]) -> None:
+    """Hold an event on the session until its transaction commits (dropped on rollback)."""
+    if not db.in_transaction():
+        # Tie the event to a transaction, so a rollback before any write still drops it
+        db.begin()
+    pending = db.info.get(PENDING_EVENTS_KEY)
+    if pending is None:
+        pending = db.info[PENDING_EVENTS_KEY] = []
+        if not sa_event.contains(db, "after_commit", _dispatch_pending):
+            sa_event.listen(db, "after_commit", _dispatch_pending)
+            sa_event.listen(db, "after_soft_rollback", _drop_pending)
+    pending.append(event)
+
+
+def notify_job_event(db, job_id: int, user_id: int, stage: str, **fields: Any) -> None:
+    """
+    Queue a job event on `db`; it is delivered when the session commits, and dropped if
+    the transaction rolls back.
+
+    Never raises and never breaks the caller's transaction: on PostgreSQL the NOTIFY runs
+    in a savepoint, so a failed NOTIFY does not abort the write it reports on.
+    """
+    event = make_event(job_id, user_id, stage, **fields)
+    try:
+        if db.get_bind().dialect.name != "postgresql":
+            # No LISTEN/NOTIFY: only clients of this process can be reached
+            _queue_local_event(db, event)
+            return
+
+        payload = json.dumps(event, default=str)
+        if len(payload.encode("utf-8")) > MAX_PAYLOAD_BYTES:
+            payload = json.dumps(make_event(job_id, user_id, stage))
+        with db.begin_nested():
+            db.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": JOB_EVENTS_CHANNEL, "payload": payload})
+    except Exception as e:
+        logger.warning(f"Failed to send {stage} event for job {job_id}: {str(e)}")
+
+
+def publish_job_event(session_factory: Callable[[], Any], job_id: int, user_id: int, stage: str, **fields: Any) -> None:
+    """Send a job event right away, in its own short transaction."""
+    db = session_factory()
+    try:
+        notify_job_event(db, job_id, user_id, stage, **fields)
+        db.commit()
+    except Exception as e:
+        logger.warning(f"Failed to send {stage} event for job {job_id}: {str(e)}")
+    finally:
+        db.close()
+
+
+class JobEventBroker:
+    """Fans job events out to the stream clients of this API process, per user."""
+
+    def __init__(self, channel: str = JOB_EVENTS_CHANNEL, queue_size: int = JOB_STREAM_QUEUE_SIZE):
+        self.channel = channel
+        self.queue_size = queue_size
+        self._subscribers: Dict[int, Set[asyncio.Queue]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._listener: Optional[asyncio.Task] = None
+
+    def subscribe(self, user_id: int, engine=None) -> asyncio.Queue:
+        """
+        Register a stream client for a user's events.
+
+        Args:
+            user_id: Owner of the jobs the client is interested in.
+            engine: AsyncEngine to LISTEN on; the listener starts with the first
+                subscriber when it is a PostgreSQL engine.
+        """
+        self._loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.setdefault(user_id, set()).add(queue)
+
+        if engine is not None and engine.dialect.name == "postgresql" and self._listener is None:
+            self._listener = asyncio.ensure_future(self._listen(engine))
+        return queue
+
+    def unsubscribe(self, user_id: int, queue: asyncio.Queue) -> None:
+        queues = self._subscribers.get(user_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[user_id]
+
+    def dispatch(self, event: Dict[str, Any]) -> None:
+        """Deliver an event to this process's subscribers; safe to call from any thread."""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            loop.call_soon_threadsafe(self._deliver, event)
+        except RuntimeError:
+            # Loop shut down between the check and the call
+            pass
+
+    def _deliver(self, event: Dict[str, Any]) -> None:
+        for queue in list(self._subscribers.get(event.get("user_id"), ())):
+            self._offer(queue, event)
+
+    @staticmethod
+    def _offer(queue: asyncio.Queue, item: Optional[Dict[str, Any]]) -> None:
+        try:
+            queue.put_nowait(item)
+        except asyncio.QueueFull:
+            # The client fell behind; drop its backlog and have it re-read job state
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(RESYNC)
+
+    def _resync_all(self) -> None:
+        for queues in self._subscribers.values():
+            for queue in queues:
+                self._offer(queue, RESYNC)
+
+    def _on_notify(self, connection, pid, channel, payload) -> None:
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            logger.warning(f"Ignoring malformed job event: {payload[:200]}")
+            return
+        self._deliver(event)
+
+    async def _listen(self, engine) -> None:
+        """Hold a LISTEN connection, reconnecting with backoff when it drops."""
+        delay = 1
+        reconnecting = False
+        while True:
+            try:
+                async with engine.connect() as conn:
+                    raw = await conn.get_raw_connection()
+                    driver = raw.driver_connection
+                    await driver.add_listener(self.channel, self._on_notify)
+                    logger.info(f"Listening for job events on channel {self.channel}")
+                    if reconnecting:
+                        # Events sent while disconnected are lost
+                        self._resync_all()
+                    delay = 1
+                    try:
+                        while True:
+                            await asyncio.sleep(LISTENER_CHECK_INTERVAL)
+                            # Also detects a connection that died while idle
+                            await driver.execute("SELECT 1")
+                    finally:
+                        if not driver.is_closed():
+                            await driver.remove_listener(self.channel, self._on_notify)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Job event listener disconnected, retrying in {delay}s: {str(e)}")
+
+            reconnecting = True
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, LISTENER_MAX_BACKOFF)
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+
+job_event_broker = JobEventBroker()
@@ -0,0 +1,116 @@
+"""
+Keyword occurrence counting for SEO analysis.
+
+Keyword density used to be measured with one str.count() per keyword, which scans
+the whole article once per keyword (about 200 scans for a semantic keyword set) and
+also counts matches inside longer words ("art" in "start"). KeywordMatcher builds an
+Aho-Corasick automaton over the keywords once and finds every keyword in a single
+pass over the text.
+
+Matching is word-based and case-insensitive: text and keywords are split into words
+(runs of letters, digits and underscores), so a keyword only matches whole words, and
+a multi-word keyword matches the same words in sequence regardless of the spacing or
+punctuation between them ("long-tail keywords" matches "long tail keywords").
+Occurrences of different keywords may overlap ("keto diet" also counts for "diet").
+
+Usage:
+    from app.keyword_matcher import get_keyword_matcher
+    matcher = get_keyword_matcher(("keto diet", "ketosis", "low carb"))
+    counts = matcher.count(article)       # {"keto diet": 4, "ketosis": 2, "low carb": 0}
+    spans = matcher.find(article)         # {"keto diet": [(120, 129), ...], ...}
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+WORD_PATTERN = re.compile(r'\w+')
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over the words of a keyword set."""
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: List[str] = list(dict.fromkeys(keywords))
+        # Per state: word -> next state, failure state, and the (keyword, word count)
+        # pairs that end in this state
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[str, int]]] = [[]]
+
+        for keyword in self.keywords:
+            words = WORD_PATTERN.findall(keyword.lower())
+            if not words:
+                continue
+            state = 0
+            for word in words:
+                next_state = self._goto[state].get(word)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][word] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                state = next_state
+            self._output[state].append((keyword, len(words)))
+
+        self._build_failure_links()
+
+    def _build_failure_links(self) -> None:
+        # Breadth-first, so a state's failure target is finished before its children
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for word, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and word not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(word, 0)
+                self._fail[child] = target if target != child else 0
+                # A state also ends every keyword its failure target ends
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def _scan(self, words: Iterable[str]) -> Iterator[Tuple[int, str, int]]:
+        """Yield (index of the last word, keyword, keyword word count) for every occurrence."""
+        goto, fail, output = self._goto, self._fail, self._output
+        root = goto[0]
+        state = 0
+        for index, word in enumerate(words):
+            if state:
+                while state and word not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(word, 0)
+            else:
+                # Most words start no keyword; skip them with a single lookup
+                state = root.get(word, 0)
+                if not state:
+                    continue
+            for keyword, length in output[state]:
+                yield index, keyword, length
+
+    def find(self, text: str) -> Dict[str, List[Tuple[int, int]]]:
+        """
+        Locate every keyword in one pass over the text.
+
+        Returns:
+            Keyword -> (start, end) character offsets of each occurrence in the text, in
+            order. Keywords that do not occur map to an empty list.
+        """
+        positions: Dict[str, List[Tuple[int, int]]] = {keyword: [] for keyword in self.keywords}
+        matches = list(WORD_PATTERN.finditer(text))
+        for last, keyword, length in self._scan(match.group().lower() for match in matches):
+            positions[keyword].append((matches[last - length + 1].start(), matches[last].end()))
+        return positions
+
+    def count(self, text: str) -> Dict[str, int]:
+        """Occurrences of every keyword in the text (0 for keywords that do not occur)."""
+        counts = dict.fromkeys(self.keywords, 0)
+        for _, keyword, _ in self._scan(WORD_PATTERN.findall(text.lower())):
+            counts[keyword] += 1
+        return counts
+
+
+@lru_cache(maxsize=128)
+def get_keyword_matcher(keywords: Tuple[str, ...]) -> KeywordMatcher:
+    """Shared matcher for a keyword set, built once and reused for the same set."""
+    return KeywordMatcher(keywords)
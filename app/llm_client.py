@@ -0,0 +1,428 @@
+"""
+Shared LLM HTTP client.
+
+Every text generator in the backend (outline generation, the blog generators and
+the blog-AI library) sends its completions through the process-wide client returned
+by get_llm_client(). It keeps one httpx connection pool per process so the 6-15 LLM
+calls an article makes (and every job in a batch) reuse warm keep-alive connections
+instead of paying a new TLS handshake per request.
+
+Configuration (environment variables):
+    LLM_TIMEOUT                 Read/write timeout in seconds (default: 120)
+    LLM_CONNECT_TIMEOUT         Connect timeout in seconds (default: 10)
+    LLM_MAX_CONNECTIONS         Max pooled connections (default: 20)
+    LLM_MAX_KEEPALIVE           Max idle keep-alive connections (default: 10)
+    LLM_KEEPALIVE_EXPIRY        Seconds an idle connection is kept (default: 60)
+    LLM_HTTP2                   Enable HTTP/2 when the h2 package is installed (default: 1)
+    LLM_CONCURRENCY_<PROVIDER>  In-flight request limit per provider, e.g. LLM_CONCURRENCY_OPENAI
+    LLM_MAX_IN_FLIGHT           In-flight request limit across all providers (default: 16)
+
+Responses are served from the LLM response cache (see llm_cache.py) unless a call
+site passes use_cache=False.
+"""
+
+import os
+import asyncio
+import logging
+import threading
+import weakref
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+from dotenv import load_dotenv
+
+load_dotenv()
+
+try:
+    from app.llm_cache import LLMCache, create_cache_from_env
+except ImportError:
+    from llm_cache import LLMCache, create_cache_from_env
+
+logger = logging.getLogger(__name__)
+
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", 120))
+LLM_CONNECT_TIMEOUT = float(os.getenv("LLM_CONNECT_TIMEOUT", 10))
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", 20))
+LLM_MAX_KEEPALIVE = int(os.getenv("LLM_MAX_KEEPALIVE", 10))
+LLM_KEEPALIVE_EXPIRY = float(os.getenv("LLM_KEEPALIVE_EXPIRY", 60))
+LLM_MAX_IN_FLIGHT = int(os.getenv("LLM_MAX_IN_FLIGHT", 16))
+LLM_HTTP2 = os.getenv("LLM_HTTP2", "1") not in ("0", "false", "False")
+
+PROVIDER_BASE_URLS = {
+    "openai": os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1"),
+    "anthropic": os.getenv("ANTHROPIC_BASE_URL", "https://api.anthropic.com/v1"),
+    "gemini": os.getenv("GEMINI_BASE_URL", "https://generativelanguage.googleapis.com/v1beta"),
+}
+
+PROVIDER_API_KEY_ENV = {
+    "openai": "OPENAI_API_KEY",
+    "anthropic": "ANTHROPIC_API_KEY",
+    "gemini": "GEMINI_API_KEY",
+}
+
+DEFAULT_CONCURRENCY = {
+    "openai": 8,
+    "anthropic": 4,
+    "gemini": 4,
+}
+
+ANTHROPIC_VERSION = "2023-06-01"
+
+
+class LLMClientError(Exception):
+    """Exception raised when an LLM provider request fails."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def _http2_enabled() -> bool:
+    """HTTP/2 needs the optional h2 package; fall back to HTTP/1.1 keep-alive without it."""
+    if not LLM_HTTP2:
+        return False
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _provider_concurrency(provider: str) -> int:
+    env_value = os.getenv(f"LLM_CONCURRENCY_{provider.upper()}")
+    if env_value:
+        return max(1, int(env_value))
+    return DEFAULT_CONCURRENCY.get(provider, 4)
+
+
+class LLMClient:
+    """Pooled HTTP client for chat-completion style requests to every supported provider."""
+
+    def __init__(
+        self,
+        timeout: float = LLM_TIMEOUT,
+        connect_timeout: float = LLM_CONNECT_TIMEOUT,
+        max_connections: int = LLM_MAX_CONNECTIONS,
+        max_keepalive: int = LLM_MAX_KEEPALIVE,
+        keepalive_expiry: float = LLM_KEEPALIVE_EXPIRY,
+        cache: Optional[LLMCache] = None,
+        max_in_flight: int = LLM_MAX_IN_FLIGHT,
+    ):
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = _http2_enabled()
+        self.cache = cache
+
+        self._lock = threading.Lock()
+        self._client: Optional[httpx.Client] = None
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self.max_in_flight = max_in_flight
+        self._in_flight = threading.BoundedSemaphore(max_in_flight)
+
+        # Async clients and semaphores are bound to the event loop that created them
+        self._async_state: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Tuple[httpx.AsyncClient, Dict[str, asyncio.Semaphore]]]" = weakref.WeakKeyDictionary()
+
+    # ----- pools -----
+
+    @property
+    def client(self) -> httpx.Client:
+        """Lazily created synchronous pool shared by every thread in the process."""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = httpx.Client(timeout=self.timeout, limits=self.limits, http2=self.http2)
+                    logger.info(f"Created shared LLM connection pool (http2={self.http2}, max_connections={self.limits.max_connections})")
+        return self._client
+
+    def _semaphore(self, provider: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            if provider not in self._semaphores:
+                self._semaphores[provider] = threading.BoundedSemaphore(_provider_concurrency(provider))
+            return self._semaphores[provider]
+
+    def set_max_in_flight(self, max_in_flight: int) -> None:
+        """
+        Change the global in-flight request budget shared by every provider.
+
+        Call this before issuing requests (e.g. from a batch runner's CLI flags);
+        requests already waiting on the old budget keep using it.
+        """
+        with self._lock:
+            self.max_in_flight = max(1, max_in_flight)
+            self._in_flight = threading.BoundedSemaphore(self.max_in_flight)
+
+    def _async_pool(self, provider: str) -> Tuple[httpx.AsyncClient, asyncio.Semaphore, asyncio.Semaphore]:
+        loop = asyncio.get_running_loop()
+        state = self._async_state.get(loop)
+        if state is None:
+            state = (httpx.AsyncClient(timeout=self.timeout, limits=self.limits, http2=self.http2), {})
+            self._async_state[loop] = state
+        async_client, semaphores = state
+        if provider not in semaphores:
+            semaphores[provider] = asyncio.Semaphore(_provider_concurrency(provider))
+        if "*" not in semaphores:
+            semaphores["*"] = asyncio.Semaphore(self.max_in_flight)
+        return async_client, semaphores[provider], semaphores["*"]
+
+    # ----- request building -----
+
+    def _build_request(
+        self,
+        provider: str,
+        model: str,
+        prompt: str,
+        system: Optional[str],
+        api_key: Optional[str],
+        temperature: float,
+        max_tokens: int,
+        top_p: Optional[float],
+        frequency_penalty: Optional[float],
+        presence_penalty: Optional[float],
+    ) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
+        if provider not in PROVIDER_BASE_URLS:
+            raise LLMClientError(f"Unsupported provider: {provider}")
+
+        api_key = api_key or os.getenv(PROVIDER_API_KEY_ENV[provider])
+        if not api_key:
+            raise LLMClientError(f"{PROVIDER_API_KEY_ENV[provider]} environment variable not set")
+
+        base_url = PROVIDER_BASE_URLS[provider].rstrip('/')
+
+        if provider == "openai":
+            messages: List[Dict[str, str]] = []
+            if system:
+                messages.append({"role": "system", "content": system})
+            messages.append({"role": "user", "content": prompt})
+
+            payload: Dict[str, Any] = {
+                "model": model,
+                "messages": messages,
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+            }
+            if top_p is not None:
+                payload["top_p"] = top_p
+            if frequency_penalty is not None:
+                payload["frequency_penalty"] = frequency_penalty
+            if presence_penalty is not None:
+                payload["presence_penalty"] = presence_penalty
+
+            headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+            return f"{base_url}/chat/completions", headers, payload
+
+        if provider == "anthropic":
+            payload = {
+                "model": model,
+                "max_tokens": max_tokens,
+                "temperature": temperature,
+                "messages": [{"role": "user", "content": prompt}],
+            }
+            if system:
+                payload["system"] = system
+            if top_p is not None:
+                payload["top_p"] = top_p
+
+            headers = {
+                "x-api-key": api_key,
+                "anthropic-version": ANTHROPIC_VERSION,
+                "Content-Type": "application/json",
+            }
+            return f"{base_url}/messages", headers, payload
+
+        # gemini
+        generation_config: Dict[str, Any] = {"temperature": temperature, "maxOutputTokens": max_tokens}
+        if top_p is not None:
+            generation_config["topP"] = top_p
+
+        payload = {
+            "contents": [{"role": "user", "parts": [{"text": prompt}]}],
+            "generationConfig": generation_config,
+        }
+        if system:
+            payload["systemInstruction"] = {"parts": [{"text": system}]}
+
+        headers = {"x-goog-api-key": api_key, "Content-Type": "application/json"}
+        return f"{base_url}/models/{model}:generateContent", headers, payload
+
+    def _parse_response(self, provider: str, response: httpx.Response) -> str:
+        if response.status_code != 200:
+            raise LLMClientError(
+                f"{provider} API error: {response.status_code} - {response.text[:500]}",
+                status_code=response.status_code,
+            )
+
+        data = response.json()
+        try:
+            if provider == "openai":
+                return data["choices"][0]["message"]["content"]
+            if provider == "anthropic":
+                return "".join(block.get("text", "") for block in data["content"] if block.get("type") == "text")
+            return "".join(part.get("text", "") for part in data["candidates"][0]["content"]["parts"])
+        except (KeyError, IndexError, TypeError) as e:
+            raise LLMClientError(f"Unexpected {provider} response format: {str(e)}")
+
+    def _cache_key(
+        self,
+        use_cache: bool,
+        provider: str,
+        model: str,
+        prompt: str,
+        system: Optional[str],
+        temperature: float,
+        max_tokens: int,
+        top_p: Optional[float],
+        frequency_penalty: Optional[float],
+        presence_penalty: Optional[float],
+    ) -> Optional[str]:
+        if not use_cache or self.cache is None:
+            return None
+        return self.cache.make_key(
+            provider, model, prompt, temperature, max_tokens, system=system,
+            top_p=top_p, frequency_penalty=frequency_penalty, presence_penalty=presence_penalty
+        )
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Return LLM response cache counters (empty when caching is disabled)."""
+        return self.cache.stats() if self.cache is not None else {}
+
+    # ----- public API -----
+
+    def complete(
+        self,
+        provider: str,
+        model: str,
+        prompt: str,
+        system: Optional[str] = None,
+        api_key: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        top_p: Optional[float] = None,
+        frequency_penalty: Optional[float] = None,
+        presence_penalty: Optional[float] = None,
+        use_cache: bool = True,
+        timeout: Optional[float] = None,
+    ) -> str:
+        """
+        Generate a completion, blocking the calling thread.
+
+        Args:
+            provider: "openai", "anthropic" or "gemini".
+            model: Provider model name.
+            prompt: The user prompt.
+            system: Optional system prompt.
+            api_key: API key; defaults to the provider's environment variable.
+            temperature: Sampling temperature.
+            max_tokens: Maximum tokens to generate.
+            top_p: Optional nucleus sampling value.
+            frequency_penalty: Optional frequency penalty (OpenAI only).
+            presence_penalty: Optional presence penalty (OpenAI only).
+            use_cache: Serve and store the response through the LLM response cache.
+            timeout: Timeout in seconds for this request, e.g. what is left of a job's
+                deadline (default: LLM_TIMEOUT).
+
+        Returns:
+            The generated text.
+
+        Raises:
+            LLMClientError: If the request fails or the provider returns an error.
+        """
+        url, headers, payload = self._build_request(
+            provider, model, prompt, system, api_key, temperature, max_tokens,
+            top_p, frequency_penalty, presence_penalty
+        )
+
+        cache_key = self._cache_key(
+            use_cache, provider, model, prompt, system, temperature, max_tokens,
+            top_p, frequency_penalty, presence_penalty
+        )
+        if cache_key:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        with self._in_flight, self._semaphore(provider):
+            try:
+                response = self.client.post(
+                    url, headers=headers, json=payload,
+                    timeout=self.timeout if timeout is None else httpx.Timeout(timeout)
+                )
+            except httpx.HTTPError as e:
+                raise LLMClientError(f"{provider} request failed: {str(e)}")
+
+        text = self._parse_response(provider, response)
+        if cache_key:
+            self.cache.set(cache_key, text)
+        return text
+
+    async def acomplete(
+        self,
+        provider: str,
+        model: str,
+        prompt: str,
+        system: Optional[str] = None,
+        api_key: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        top_p: Optional[float] = None,
+        frequency_penalty: Optional[float] = None,
+        presence_penalty: Optional[float] = None,
+        use_cache: bool = True,
+    ) -> str:
+        """Async counterpart of complete() using the event loop's pooled AsyncClient."""
+        url, headers, payload = self._build_request(
+            provider, model, prompt, system, api_key, temperature, max_tokens,
+            top_p, frequency_penalty, presence_penalty
+        )
+
+        cache_key = self._cache_key(
+            use_cache, provider, model, prompt, system, temperature, max_tokens,
+            top_p, frequency_penalty, presence_penalty
+        )
+        if cache_key:
+            # The cache does SQLite I/O under a lock; keep it off the event loop
+            cached = await asyncio.to_thread(self.cache.get, cache_key)
+            if cached is not None:
+                return cached
+
+        async_client, semaphore, in_flight = self._async_pool(provider)
+        async with in_flight, semaphore:
+            try:
+                response = await async_client.post(url, headers=headers, json=payload)
+            except httpx.HTTPError as e:
+                raise LLMClientError(f"{provider} request failed: {str(e)}")
+
+        text = self._parse_response(provider, response)
+        if cache_key:
+            await asyncio.to_thread(self.cache.set, cache_key, text)
+        return text
+
+    def close(self) -> None:
+        """Close the synchronous pool."""
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+
+    async def aclose(self) -> None:
+        """Close the async pool bound to the running event loop."""
+        state = self._async_state.pop(asyncio.get_running_loop(), None)
+        if state is not None:
+            await state[0].aclose()
+
+
+_client_instance: Optional[LLMClient] = None
+_client_instance_lock = threading.Lock()
+
+
+def get_llm_client() -> LLMClient:
+    """Return the process-wide LLM client."""
+    global _client_instance
+    if _client_instance is None:
+        with _client_instance_lock:
+            if _client_instance is None:
+                _client_instance = LLMClient(cache=create_cache_from_env())
+    return _client_instance
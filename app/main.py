@@ -1,18 +1,20 @@
-from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi import FastAPI, Depends, HTTPException, Query, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field, validator
-from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Text, cast, select, text, tuple_
 import logging
 import traceback
-from fastapi.responses import JSONResponse
-from typing import List, Optional, Dict, Any
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
 from fastapi.responses import FileResponse
 import os
 from fastapi import Header
-import ast
+import base64
 import json
+import asyncio
 
 
 from .models import WordPressCredentials
@@ -32,14 +34,24 @@ ALGORITHM = os.getenv("ALGORITHM")
 
 # Try to import your backend modules with error handling
 try:
-    from .database import SessionLocal, engine
+    from .database import SessionLocal, AsyncSessionLocal, async_engine, engine
     from .models import User, Base, ContentJob
-    from .auth import verify_password, get_password_hash, create_access_token
+    from .auth import verify_password, get_password_hash, create_access_token, user_token_claims
+    from .user_cache import CurrentUser, user_cache
+    from .wordpress_sites import site_info_cache
+    from .job_events import JOB_STREAM_HEARTBEAT, RESYNC, job_event_broker, notify_job_event
     logger.info("Successfully imported app modules")
 except ImportError as e:
     logger.error(f"Failed to import app modules: {e}")
     raise
 
+# The task queue is optional; without it jobs are picked up by the polling scripts
+try:
+    from .celery_worker import enqueue, generate_outline, generate_blog
+except ImportError as e:
+    enqueue = None
+    logger.warning(f"Task queue unavailable, jobs will wait for the polling scripts: {e}")
+
 # Don't create tables - they already exist in your database
 # Base.metadata.create_all(bind=engine)
 
@@ -52,6 +64,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 class UserCreate(BaseModel):
@@ -80,18 +93,58 @@ def get_db():
     finally:
         db.close()
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+async def get_async_db():
+    """Async session for endpoints that run on the event loop instead of the threadpool."""
+    if AsyncSessionLocal is None:
+        raise HTTPException(status_code=503, detail="Async database driver is not installed")
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def decode_access_token(token: str) -> Dict[str, Any]:
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username = payload.get("sub")
-        if username is None:
-            raise HTTPException(status_code=401, detail="Invalid authentication")
-        user = db.query(User).filter(User.username == username).first()
-        if user is None:
-            raise HTTPException(status_code=404, detail="User not found")
-        return user
     except jwt.PyJWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
+    if payload.get("sub") is None:
+        raise HTTPException(status_code=401, detail="Invalid authentication")
+    return payload
+
+# Both dependencies return a CurrentUser (id, username, name, role) rather than a
+# session-bound User; most requests resolve it from the token claims or the user cache
+# without touching the database. Session is opened lazily, only on a cache miss.
+def get_current_user(token: str = Depends(oauth2_scheme)):
+    payload = decode_access_token(token)
+    user = user_cache.resolve_claims(payload) or user_cache.get(payload["sub"])
+    if user is not None:
+        return user
+
+    db = SessionLocal()
+    try:
+        db_user = db.query(User).filter(User.username == payload["sub"]).first()
+    finally:
+        db.close()
+    if db_user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    user = CurrentUser.from_user(db_user)
+    user_cache.put(user)
+    return user
+
+async def get_current_user_async(token: str = Depends(oauth2_scheme)):
+    payload = decode_access_token(token)
+    user = user_cache.resolve_claims(payload) or user_cache.get(payload["sub"])
+    if user is not None:
+        return user
+
+    if AsyncSessionLocal is None:
+        raise HTTPException(status_code=503, detail="Async database driver is not installed")
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(User).where(User.username == payload["sub"]))
+        db_user = result.scalars().first()
+    if db_user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    user = CurrentUser.from_user(db_user)
+    user_cache.put(user)
+    return user
 
 def get_bearer_token(authorization: str = Header(None)):
     if not authorization or not authorization.startswith("Bearer "):
@@ -327,6 +380,7 @@ def register(user: UserCreate, db: Session = Depends(get_db)):
         db.add(new_user)
         db.commit()
         db.refresh(new_user)
+        user_cache.invalidate_user(new_user.username)
         
         logger.info(f"User {user.username} registered successfully")
         return {"msg": "User registered successfully"}
@@ -360,7 +414,7 @@ def login(user: UserLogin, db: Session = Depends(get_db)):
                 detail="Incorrect username or password"
             )
         
-        token = create_access_token({"sub": user.username})
+        token = create_access_token(user_token_claims(db_user))
         
         logger.info(f"User {user.username} logged in successfully")
 
@@ -396,28 +450,104 @@ def health_check():
         logger.error(f"Health check failed: {e}")
         return {"status": "unhealthy", "error": str(e)}
 
+MY_JOBS_DEFAULT_LIMIT = 50
+MY_JOBS_MAX_LIMIT = 200
+MY_JOBS_INCLUDES = {"outline", "keywords"}
+
+# Columns of the /my-jobs list view; the outline and keyword blobs are only loaded on request
+MY_JOBS_LIST_COLUMNS = (
+    ContentJob.id,
+    ContentJob.title,
+    ContentJob.mainKeyword,
+    ContentJob.related_keywords,
+    ContentJob.article_word_count,
+    ContentJob.article_length,
+    ContentJob.competitor_url_1,
+    ContentJob.competitor_url_2,
+    ContentJob.status,
+    ContentJob.isApproved,
+    ContentJob.created_at,
+    ContentJob.wordpress_credentials_id,
+)
+
+
+def encode_jobs_cursor(job: ContentJob) -> str:
+    """
+    Opaque keyset cursor pointing just after `job` in (created_at DESC, id DESC) order.
+
+    created_at is NOT NULL (migrations/004_content_jobs_created_at_not_null.sql), so
+    every job can be encoded and every encoded cursor decodes.
+    """
+    raw = json.dumps([job.created_at.isoformat(), job.id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_jobs_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, job_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(job_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
 @app.get("/my-jobs", response_model=List[ContentJobOut])
-def get_my_jobs(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+async def get_my_jobs(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MY_JOBS_MAX_LIMIT),
+    cursor: Optional[str] = None,
+    include: Optional[str] = None,
+    current_user: CurrentUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    List the current user's jobs, newest first.
+
+    Without `limit` or `cursor` every job is returned, as before pagination existed.
+    With either, one page of `limit` jobs (default MY_JOBS_DEFAULT_LIMIT) is returned,
+    and when more jobs exist the `X-Next-Cursor` response header holds the `cursor`
+    value for the next page.
+
+    The outline and semantic keywords are left out unless requested with
+    `?include=outline,keywords`.
+    """
+    includes = {part.strip() for part in include.split(",") if part.strip()} if include else set()
+    unknown = includes - MY_JOBS_INCLUDES
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown include: {', '.join(sorted(unknown))}")
+
     try:
-        jobs = db.query(ContentJob).filter(ContentJob.user_id == current_user.id).order_by(ContentJob.created_at.desc()).all()
+        columns = list(MY_JOBS_LIST_COLUMNS)
+        if "outline" in includes:
+            columns.append(ContentJob.Outline)
+        if "keywords" in includes:
+            columns.extend([ContentJob.semantic_keywords, ContentJob.semantic_keywords_2])
+
+        query = (
+            select(ContentJob)
+            .options(load_only(*columns))
+            .where(ContentJob.user_id == current_user.id)
+        )
+        if cursor:
+            cursor_created_at, cursor_id = decode_jobs_cursor(cursor)
+            query = query.where(tuple_(ContentJob.created_at, ContentJob.id) < (cursor_created_at, cursor_id))
+        # Served by ix_content_jobs_user_created (migrations/002_content_jobs_user_created_index.sql)
+        query = query.order_by(ContentJob.created_at.desc(), ContentJob.id.desc())
+        paginated = limit is not None or cursor is not None
+        if paginated:
+            limit = limit or MY_JOBS_DEFAULT_LIMIT
+            query = query.limit(limit + 1)
+
+        result = await db.execute(query)
+        jobs = result.scalars().all()
+
+        if paginated and len(jobs) > limit:
+            jobs = jobs[:limit]
+            response.headers["X-Next-Cursor"] = encode_jobs_cursor(jobs[-1])
         
         # Convert jobs to the response format
         job_list = []
         for job in jobs:
-            # Parse outline safely if it's a string
-            outline = {}
-            if job.Outline:
-                if isinstance(job.Outline, dict):
-                    outline = job.Outline
-                elif isinstance(job.Outline, str):
-                    try:
-                        outline = json.loads(job.Outline)
-                    except json.JSONDecodeError:
-                        try:
-                            outline = ast.literal_eval(job.Outline)
-                        except (ValueError, SyntaxError):
-                            outline = {}
-
             job_dict = {
                 "id": job.id,
                 "title": job.title,
@@ -429,15 +559,22 @@ def get_my_jobs(current_user: User = Depends(get_current_user), db: Session = De
                 "competitor_url_2": job.competitor_url_2,
                 "status": job.status,  # Now boolean
                 "isApproved": job.isApproved,  # New field
-                "semantic_keywords": job.semantic_keywords if job.semantic_keywords else {},
-                "semantic_keywords_2": job.semantic_keywords_2 if isinstance(job.semantic_keywords_2, dict) else {"keywords": job.semantic_keywords_2} if job.semantic_keywords_2 else {},
-                "outline": outline,
                 "created_at": job.created_at.isoformat() if isinstance(job.created_at, datetime) else str(job.created_at),
                 "wordpress_credentials_id": job.wordpress_credentials_id,  # <-- Add this line
             }
+
+            if "outline" in includes:
+                job_dict["outline"] = job.Outline or {}
+
+            if "keywords" in includes:
+                job_dict["semantic_keywords"] = job.semantic_keywords if job.semantic_keywords else {}
+                job_dict["semantic_keywords_2"] = job.semantic_keywords_2 if isinstance(job.semantic_keywords_2, dict) else {"keywords": job.semantic_keywords_2} if job.semantic_keywords_2 else {}
+
             job_list.append(job_dict)
         
         return job_list
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error retrieving jobs: {e}")
         logger.error(f"Traceback: {traceback.format_exc()}")
@@ -447,7 +584,7 @@ def get_my_jobs(current_user: User = Depends(get_current_user), db: Session = De
 @app.post("/create-job", response_model=ContentJobOut)
 def create_job(
     job: ContentJobCreate, 
-    current_user: User = Depends(get_current_user), 
+    current_user: CurrentUser = Depends(get_current_user), 
     db: Session = Depends(get_db)
 ):
     try:
@@ -468,7 +605,7 @@ def create_job(
             try:
                 # Validate outline against schema if provided
                 outline_schema = OutlineSchema(**job.Outline)
-                outline_json = json.dumps(outline_schema.dict(), indent=2)
+                outline_json = outline_schema.dict()
                 job_status = True  # True = outlined
                 logger.info(f"Job created with valid outline for user {current_user.username}")
             except Exception as e:
@@ -498,9 +635,15 @@ def create_job(
         )
 
         db.add(new_job)
+        db.flush()
+        notify_job_event(db, new_job.id, current_user.id, "created", status=job_status, isApproved=False)
         db.commit()
         db.refresh(new_job)
 
+        # Start outline generation right away for jobs created without one
+        if enqueue and not new_job.status:
+            enqueue(generate_outline, new_job.id)
+
         return ContentJobOut(
             id=new_job.id,
             title=new_job.title,
@@ -514,7 +657,7 @@ def create_job(
             isApproved=new_job.isApproved,
             semantic_keywords=new_job.semantic_keywords,
             semantic_keywords_2=new_job.semantic_keywords_2,
-            outline=json.loads(new_job.Outline) if new_job.Outline else {},
+            outline=new_job.Outline or {},
             created_at=new_job.created_at.isoformat() if isinstance(new_job.created_at, datetime) else str(new_job.created_at),
             wordpress_credentials_id=new_job.wordpress_credentials_id
         )
@@ -535,7 +678,7 @@ def create_job(
 @app.post("/wordpress/connect", response_model=WordPressCredentialsOut)
 def connect_wordpress_account(
     credentials: WordPressCredentialsCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -650,17 +793,18 @@ def connect_wordpress_account(
         raise HTTPException(status_code=500, detail=f"Failed to connect WordPress account: {str(e)}")
 
 @app.get("/wordpress/accounts", response_model=List[WordPressCredentialsOut])
-def get_wordpress_accounts(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+async def get_wordpress_accounts(
+    current_user: CurrentUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get all WordPress accounts connected to the current user
     """
     try:
-        wp_accounts = db.query(WordPressCredentials).filter(
-            WordPressCredentials.userId == current_user.id
-        ).all()
+        result = await db.execute(
+            select(WordPressCredentials).where(WordPressCredentials.userId == current_user.id)
+        )
+        wp_accounts = result.scalars().all()
         
         return [
             WordPressCredentialsOut(
@@ -682,7 +826,7 @@ def get_wordpress_accounts(
 def update_wordpress_account(
     account_id: int,
     credentials: WordPressCredentialsUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -725,6 +869,7 @@ def update_wordpress_account(
         
         db.commit()
         db.refresh(wp_account)
+        site_info_cache.invalidate(wp_account.id)
         
         logger.info(f"WordPress account updated for user {current_user.username}: {wp_account.siteUrl}")
         
@@ -746,7 +891,7 @@ def update_wordpress_account(
 @app.delete("/wordpress/accounts/{account_id}")
 def delete_wordpress_account(
     account_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -764,6 +909,7 @@ def delete_wordpress_account(
         
         db.delete(wp_account)
         db.commit()
+        site_info_cache.invalidate(account_id)
         
         logger.info(f"WordPress account deleted for user {current_user.username}: {wp_account.siteUrl}")
         
@@ -780,7 +926,7 @@ def delete_wordpress_account(
 @app.post("/wordpress/test/{account_id}")
 def test_wordpress_connection(
     account_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -816,59 +962,23 @@ def test_wordpress_connection(
         raise HTTPException(status_code=500, detail=f"Failed to test WordPress connection: {str(e)}")
 
 @app.get("/wordpress/sites")
-def get_wordpress_sites_info(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+async def get_wordpress_sites_info(
+    current_user: CurrentUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
-    Get detailed information about all connected WordPress sites
+    Get detailed information about all connected WordPress sites.
+
+    Site metadata is served from a TTL cache and refreshed in the background; each
+    site reports its freshness ("fresh", "stale" or "pending").
     """
     try:
-        wp_accounts = db.query(WordPressCredentials).filter(
-            WordPressCredentials.userId == current_user.id
-        ).all()
-        
-        sites_info = []
+        result = await db.execute(
+            select(WordPressCredentials).where(WordPressCredentials.userId == current_user.id)
+        )
+        wp_accounts = result.scalars().all()
         
-        for account in wp_accounts:
-            try:
-                # Get site information
-                site_info_url = f"{account.siteUrl}/wp-json/wp/v2/settings"
-                response = requests.get(
-                    site_info_url,
-                    auth=(account.username, account.applicationPassword),
-                    timeout=10
-                )
-                
-                if response.status_code == 200:
-                    site_data = response.json()
-                    sites_info.append({
-                        "id": account.id,
-                        "siteUrl": account.siteUrl,
-                        "username": account.username,
-                        "title": site_data.get("title", "Unknown"),
-                        "description": site_data.get("description", ""),
-                        "status": "connected"
-                    })
-                else:
-                    sites_info.append({
-                        "id": account.id,
-                        "siteUrl": account.siteUrl,
-                        "username": account.username,
-                        "title": "Connection Error",
-                        "description": "Unable to fetch site information",
-                        "status": "error"
-                    })
-            except Exception as e:
-                logger.warning(f"Failed to get info for {account.siteUrl}: {e}")
-                sites_info.append({
-                    "id": account.id,
-                    "siteUrl": account.siteUrl,
-                    "username": account.username,
-                    "title": "Connection Error",
-                    "description": str(e),
-                    "status": "error"
-                })
+        sites_info = await site_info_cache.get_sites(wp_accounts)
         
         return {"sites": sites_info}
     
@@ -884,7 +994,7 @@ def get_wordpress_sites_info(
 def update_job_outline(
     job_id: int,
     request: OutlineUpdateRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -936,8 +1046,9 @@ def update_job_outline(
         outline_json["updated_at"] = datetime.now().isoformat()
         
         # Update the job in database
-        job.Outline = json.dumps(outline_json, indent=2)
+        job.Outline = outline_json
         job.status = True  # True = outlined
+        notify_job_event(db, job_id, current_user.id, "outline_updated", status=True, isApproved=job.isApproved)
         
         db.commit()
         
@@ -969,20 +1080,31 @@ def update_job_outline(
         )
 
 @app.get("/jobs/{job_id}/outline")
-def get_job_outline(
+async def get_job_outline(
     job_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get the current outline for a specific job.
+
+    The stored outline JSON is written into the response as-is, without being
+    parsed and re-serialized.
     """
     try:
         # Validate job exists and belongs to current user
-        job = db.query(ContentJob).filter(
-            ContentJob.id == job_id,
-            ContentJob.user_id == current_user.id
-        ).first()
+        result = await db.execute(
+            select(
+                ContentJob.title,
+                ContentJob.status,
+                ContentJob.created_at,
+                cast(ContentJob.Outline, Text).label("outline_json")
+            ).where(
+                ContentJob.id == job_id,
+                ContentJob.user_id == current_user.id
+            )
+        )
+        job = result.first()
         
         if not job:
             raise HTTPException(
@@ -990,23 +1112,17 @@ def get_job_outline(
                 detail="Content job not found or you don't have permission to access it"
             )
         
-        # Parse outline if it exists
-        outline_data = {}
-        if job.Outline:
-            try:
-                outline_data = json.loads(job.Outline)
-            except json.JSONDecodeError:
-                logger.warning(f"Invalid JSON in outline for job {job_id}")
-                outline_data = {}
-        
-        return {
+        has_outline = job.outline_json not in (None, "null", "{}")
+        envelope = json.dumps({
             "job_id": job_id,
             "title": job.title,
             "status": job.status,
-            "has_outline": bool(job.Outline),
-            "outline": outline_data,
+            "has_outline": has_outline,
             "created_at": job.created_at.isoformat() if job.created_at else None
-        }
+        })
+        body = f'{envelope[:-1]}, "outline": {job.outline_json if has_outline else "{}"}}}'
+        
+        return Response(content=body, media_type="application/json")
         
     except HTTPException:
         raise
@@ -1023,7 +1139,7 @@ def get_job_outline(
 @app.put("/jobs/{job_id}/approve")
 def approve_job(
     job_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -1060,9 +1176,13 @@ def approve_job(
         
         # Approve the job
         job.isApproved = True
+        notify_job_event(db, job_id, current_user.id, "approved", status=job.status, isApproved=True)
         db.commit()
         
         logger.info(f"Job {job_id} approved by user {current_user.username}")
+
+        if enqueue:
+            enqueue(generate_blog, job_id)
         
         return {
             "success": True,
@@ -1085,7 +1205,7 @@ def approve_job(
 @app.put("/jobs/{job_id}/unapprove")
 def unapprove_job(
     job_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -1115,6 +1235,7 @@ def unapprove_job(
         
         # Unapprove the job
         job.isApproved = False
+        notify_job_event(db, job_id, current_user.id, "unapproved", status=job.status, isApproved=False)
         db.commit()
         
         logger.info(f"Job {job_id} unapproved by user {current_user.username}")
@@ -1138,20 +1259,30 @@ def unapprove_job(
         )
 
 @app.get("/jobs/{job_id}/status")
-def get_job_status(
+async def get_job_status(
     job_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get the status and approval status of a job
     """
     try:
         # Validate job exists and belongs to current user
-        job = db.query(ContentJob).filter(
-            ContentJob.id == job_id,
-            ContentJob.user_id == current_user.id
-        ).first()
+        # Polled by the frontend, so only the small columns are read (not the outline)
+        result = await db.execute(
+            select(
+                ContentJob.title,
+                ContentJob.status,
+                ContentJob.isApproved,
+                ContentJob.created_at,
+                ContentJob.Outline.isnot(None).label("has_outline")
+            ).where(
+                ContentJob.id == job_id,
+                ContentJob.user_id == current_user.id
+            )
+        )
+        job = result.first()
         
         if not job:
             raise HTTPException(
@@ -1170,7 +1301,7 @@ def get_job_status(
             "status_text": status_text,
             "isApproved": job.isApproved,
             "approval_text": approval_text,
-            "has_outline": bool(job.Outline),
+            "has_outline": bool(job.has_outline),
             "created_at": job.created_at.isoformat() if job.created_at else None
         }
         
@@ -1184,3 +1315,114 @@ def get_job_status(
             detail=f"Failed to retrieve job status: {str(e)}"
         )
 
+
+JOB_STREAM_SNAPSHOT_LIMIT = 50
+
+
+async def get_stream_user(
+    access_token: Optional[str] = Query(None),
+    authorization: Optional[str] = Header(None)
+):
+    """EventSource cannot set headers, so the stream also takes the token as ?access_token=."""
+    if authorization and authorization.startswith("Bearer "):
+        access_token = authorization.split(" ", 1)[1]
+    if not access_token:
+        raise HTTPException(status_code=401, detail="Missing or invalid Authorization header")
+    return await get_current_user_async(access_token)
+
+
+async def job_state_events(user_id: int, job_ids: Optional[List[int]]) -> List[Dict[str, Any]]:
+    """Current state of a user's jobs, sent when a stream opens or has to catch up."""
+    query = select(
+        ContentJob.id,
+        ContentJob.status,
+        ContentJob.isApproved,
+        ContentJob.Outline.isnot(None).label("has_outline")
+    ).where(ContentJob.user_id == user_id)
+    if job_ids:
+        query = query.where(ContentJob.id.in_(job_ids))
+    else:
+        query = query.order_by(ContentJob.created_at.desc(), ContentJob.id.desc()).limit(JOB_STREAM_SNAPSHOT_LIMIT)
+
+    # A short-lived session: the stream must not hold a pooled connection while idle
+    async with AsyncSessionLocal() as db:
+        rows = (await db.execute(query)).all()
+
+    return [
+        {
+            "job_id": row.id,
+            "user_id": user_id,
+            "stage": "snapshot",
+            "status": row.status,
+            "isApproved": row.isApproved,
+            "has_outline": bool(row.has_outline),
+        }
+        for row in rows
+    ]
+
+
+def format_sse(event: Dict[str, Any]) -> str:
+    return f"event: job\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+@app.get("/jobs/stream")
+async def stream_jobs(
+    request: Request,
+    job_id: Optional[List[int]] = Query(None),
+    current_user: CurrentUser = Depends(get_stream_user)
+):
+    """
+    Server-Sent Events stream of job progress, replacing polling of /jobs/{id}/status.
+
+    The stream opens with a "snapshot" event per job (the given job_id values, or the
+    user's most recent jobs), then pushes stage transitions as workers report them:
+    created, keywords, outlined, outline_updated, approved, unapproved, sections and
+    images (with completed/total), generated, published and failed. A snapshot is
+    sent again whenever events may have been missed.
+    """
+    if AsyncSessionLocal is None:
+        raise HTTPException(status_code=503, detail="Async database driver is not installed")
+
+    user_id = current_user.id
+    job_ids = set(job_id or [])
+
+    async def events():
+        # Subscribe before reading state so no transition falls in between
+        queue = job_event_broker.subscribe(user_id, async_engine)
+        try:
+            yield "retry: 5000\n\n"
+            for event in await job_state_events(user_id, job_id):
+                yield format_sse(event)
+
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=JOB_STREAM_HEARTBEAT)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": keep-alive\n\n"
+                    continue
+
+                if event is RESYNC:
+                    for state in await job_state_events(user_id, job_id):
+                        yield format_sse(state)
+                elif not job_ids or event.get("job_id") in job_ids:
+                    yield format_sse(event)
+        finally:
+            job_event_broker.unsubscribe(user_id, queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.on_event("shutdown")
+async def stop_job_events():
+    await job_event_broker.stop()
+
+
+@app.on_event("shutdown")
+async def close_site_info_cache():
+    await site_info_cache.aclose()
@@ -1,5 +1,6 @@
 # models.py - Updated ContentJob model
 from sqlalchemy import Column, Integer, String, TIMESTAMP, func, ForeignKey, Text, JSON, Boolean
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from .database import Base
 
@@ -26,14 +27,15 @@ class ContentJob(Base):
     title = Column(Text, nullable=True)
     status = Column(Boolean, nullable=False, default=False)  # False = pending, True = outlined
     isApproved = Column("isapproved", Boolean, nullable=False, default=False)  # PostgreSQL converts to lowercase
-    created_at = Column(TIMESTAMP, server_default=func.now())
+    created_at = Column(TIMESTAMP, nullable=False, server_default=func.now())
     outline_prompt = Column(Text, nullable=True)
     
     # WordPress credentials reference - NOW REQUIRED!
     wordpress_credentials_id = Column(Integer, ForeignKey("WordPressCredentials.id"), nullable=False)
     
     # Content job specific fields from your schema
-    Outline = Column(Text, nullable=True)
+    # Parsed outline dict, stored as JSONB (migrations/003_content_jobs_outline_jsonb.sql)
+    Outline = Column(JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql"), nullable=True)
     audienceType = Column(Text, nullable=True)
     contentFormat = Column(Text, nullable=True)
     mainKeyword = Column(Text, nullable=True)
@@ -46,6 +48,11 @@ class ContentJob(Base):
     semantic_keywords = Column(JSON, nullable=True)
     semantic_keywords_2 = Column(JSON, nullable=True)
     
+    # Worker lease (see job_claims.py)
+    claimed_by = Column(String, nullable=True)
+    lease_expires_at = Column(TIMESTAMP(timezone=True), nullable=True)
+    attempt_count = Column(Integer, nullable=False, default=0)
+    
     # Relationships
     owner = relationship("User", back_populates="content_jobs")
     wordpress_credentials = relationship("WordPressCredentials", back_populates="content_jobs")
@@ -7,14 +7,20 @@ This script:
 2. Runs semantic keyword generation and competitor keyword extraction in parallel
 3. Generates JSON outlines for each job
 4. Updates the database with the results
+
+Jobs can be processed side by side:
+    python app/outline_generation.py --concurrency 4 --llm-budget 8 --job-timeout 300
 """
 
 import os
 import sys
 import json
+import time
 import logging
+import argparse
+import contextvars
 from typing import List, Dict, Any, Optional, Tuple
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
 from datetime import datetime
 import requests
 from dotenv import load_dotenv
@@ -26,7 +32,18 @@ load_dotenv()
 sys.path.append(os.path.dirname(__file__))
 
 from database import SessionLocal, Base
+
+# Import as part of the app package when available so the whole process shares one pool
+try:
+    from app.llm_client import get_llm_client
+    from app.job_claims import claim_jobs, claim_job, release_job, renew_lease, lock_claimed_job, LeaseLostError
+    from app.job_events import notify_job_event, publish_job_event
+except ImportError:
+    from llm_client import get_llm_client
+    from job_claims import claim_jobs, claim_job, release_job, renew_lease, lock_claimed_job, LeaseLostError
+    from job_events import notify_job_event, publish_job_event
 from sqlalchemy import Column, Integer, String, TIMESTAMP, func, ForeignKey, Text, JSON, Boolean
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 
 # Define ContentJob model inline to avoid import issues
@@ -38,14 +55,14 @@ class ContentJob(Base):
     title = Column(Text, nullable=True)
     status = Column(Boolean, nullable=False, default=False)  # False = pending, True = outlined
     isApproved = Column("isapproved", Boolean, nullable=False, default=False)  # PostgreSQL converts to lowercase
-    created_at = Column(TIMESTAMP, server_default=func.now())
+    created_at = Column(TIMESTAMP, nullable=False, server_default=func.now())
     outline_prompt = Column(Text, nullable=True)
     
     # WordPress credentials reference (make nullable to avoid foreign key issues)
     wordpress_credentials_id = Column(Integer, nullable=True)
     
     # Content job specific fields
-    Outline = Column(Text, nullable=True)
+    Outline = Column(JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql"), nullable=True)
     audienceType = Column(Text, nullable=True)
     contentFormat = Column(Text, nullable=True)
     mainKeyword = Column(Text, nullable=True)
@@ -57,11 +74,17 @@ class ContentJob(Base):
     competitor_url_2 = Column(String, nullable=True)
     semantic_keywords = Column(JSON, nullable=True)
     semantic_keywords_2 = Column(JSON, nullable=True)
+    
+    # Worker lease (see job_claims.py)
+    claimed_by = Column(String, nullable=True)
+    lease_expires_at = Column(TIMESTAMP(timezone=True), nullable=True)
+    attempt_count = Column(Integer, nullable=False, default=0)
 
 # Configuration
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 DEFAULT_MODEL = "gpt-3.5-turbo"
 SCRAPER_API_URL = "http://157.245.210.116:3000/api/scrape"
+SCRAPER_TIMEOUT = 30
 
 # Configure logging
 logging.basicConfig(
@@ -75,9 +98,37 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+class JobTimeoutError(Exception):
+    """Raised when a job has run past its deadline."""
+
+
+# Monotonic deadline of the job running in this context (set by process_jobs_concurrently)
+_job_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("job_deadline", default=None)
+
+
+def request_timeout(default: Optional[float]) -> Optional[float]:
+    """
+    Timeout for an HTTP call made by the current job: `default`, capped by what is left
+    of the job's deadline.
+    
+    Raises:
+        JobTimeoutError: If the job's deadline has passed.
+    """
+    deadline = _job_deadline.get()
+    if deadline is None:
+        return default
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise JobTimeoutError("Job deadline exceeded")
+    return remaining if default is None else min(default, remaining)
+
+
 def get_pending_jobs(limit: int = 10) -> List[ContentJob]:
     """
-    Fetch pending jobs from the database.
+    Claim pending jobs from the database.
+    
+    Jobs are leased to this worker, so other outline workers running at the same
+    time skip them until the lease is released or expires.
     
     Args:
         limit: Maximum number of jobs to fetch
@@ -85,11 +136,11 @@ def get_pending_jobs(limit: int = 10) -> List[ContentJob]:
     Returns:
         List of pending ContentJob objects
     """
-    db = SessionLocal()
+    db = SessionLocal(expire_on_commit=False)
     try:
-        jobs = db.query(ContentJob).filter(
+        jobs = claim_jobs(db, ContentJob, [
             ContentJob.status == False  # False = pending
-        ).limit(limit).all()
+        ], limit)
         
         logger.info(f"Retrieved {len(jobs)} pending jobs from database")
         return jobs
@@ -100,23 +151,56 @@ def get_pending_jobs(limit: int = 10) -> List[ContentJob]:
         db.close()
 
 
-def generate_text_with_openai(prompt: str, model: str = DEFAULT_MODEL) -> str:
-    """Generate text using OpenAI API"""
-    try:
-        from openai import OpenAI
-        
-        client = OpenAI(api_key=OPENAI_API_KEY)
+def claim_pending_job(job_id: int) -> Optional[ContentJob]:
+    """
+    Claim a single pending job from the database.
+    
+    Args:
+        job_id: ID of the job to claim
         
-        response = client.chat.completions.create(
-            model=model,
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant that creates high-quality SEO content and semantic keywords."},
-                {"role": "user", "content": prompt}
-            ],
+    Returns:
+        The ContentJob, or None if it is already outlined or leased by another worker
+    """
+    db = SessionLocal(expire_on_commit=False)
+    try:
+        return claim_job(db, ContentJob, job_id, [ContentJob.status == False])
+    finally:
+        db.close()
+
+
+def renew_job_claim(job_id: int) -> bool:
+    """Extend this worker's lease on a job between stages; False if the lease was lost."""
+    db = SessionLocal()
+    try:
+        return renew_lease(db, ContentJob, job_id)
+    finally:
+        db.close()
+
+
+def release_job_claim(job_id: int, success: bool) -> None:
+    """Release this worker's lease on a job once processing has finished."""
+    db = SessionLocal()
+    try:
+        release_job(db, ContentJob, job_id, success)
+    finally:
+        db.close()
+
+
+def generate_text_with_openai(prompt: str, model: str = DEFAULT_MODEL, use_cache: bool = True) -> str:
+    """Generate text using OpenAI API through the shared pooled LLM client and response cache"""
+    try:
+        response = get_llm_client().complete(
+            "openai",
+            model,
+            prompt,
+            system="You are a helpful assistant that creates high-quality SEO content and semantic keywords.",
+            api_key=OPENAI_API_KEY,
             max_tokens=2000,
-            temperature=0.7
+            temperature=0.7,
+            use_cache=use_cache,
+            timeout=request_timeout(None)
         )
-        return response.choices[0].message.content.strip()
+        return response.strip()
     except Exception as e:
         raise Exception(f"OpenAI API error: {str(e)}")
 
@@ -258,7 +342,7 @@ def scrape_competitor_url(url: str) -> Optional[Dict[str, Any]]:
         response = requests.post(
             SCRAPER_API_URL,
             json={"url": url},
-            timeout=30,
+            timeout=request_timeout(SCRAPER_TIMEOUT),
             headers={"Content-Type": "application/json"}
         )
         
@@ -637,24 +721,28 @@ def update_job_with_results(job_id: int, semantic_keywords: Dict[str, Any], comp
     """
     db = SessionLocal()
     try:
-        job = db.query(ContentJob).filter(ContentJob.id == job_id).first()
-        if not job:
-            logger.error(f"Job {job_id} not found in database")
-            return False
+        # Only write if this worker still holds the lease (another may have reclaimed the job)
+        job = lock_claimed_job(db, ContentJob, job_id)
         
         # Update job with results
         job.semantic_keywords = semantic_keywords
-        job.Outline = json.dumps(outline, indent=2)
+        job.Outline = outline
         job.status = True  # True = outlined
         
         # Store competitor keywords in semantic_keywords_2 field (as a workaround)
         if competitor_keywords:
             job.semantic_keywords_2 = {"competitor_keywords": competitor_keywords}
         
+        # Delivered to /jobs/stream clients together with the commit
+        notify_job_event(db, job_id, job.user_id, "outlined", status=True, isApproved=job.isApproved)
         db.commit()
         logger.info(f"Successfully updated job {job_id} with outline and keywords")
         return True
         
+    except LeaseLostError as e:
+        logger.error(f"Not saving results for job {job_id}: {e}")
+        db.rollback()
+        return False
     except Exception as e:
         logger.error(f"Error updating job {job_id}: {e}")
         db.rollback()
@@ -673,19 +761,26 @@ def process_job(job: ContentJob) -> bool:
     Returns:
         True if processing was successful, False otherwise
     """
+    success = False
     try:
         logger.info(f"Processing job {job.id}: {job.title}")
         
         # Run semantic keyword generation and competitor scraping in parallel
         with ThreadPoolExecutor(max_workers=2) as executor:
-            # Submit both tasks
-            semantic_future = executor.submit(generate_semantic_keywords_for_job_wrapper, job)
-            competitor_future = executor.submit(scrape_competitor_keywords_wrapper, job)
+            # Submit both tasks (in copies of this context, so they see the job's deadline)
+            semantic_future = executor.submit(contextvars.copy_context().run, generate_semantic_keywords_for_job_wrapper, job)
+            competitor_future = executor.submit(contextvars.copy_context().run, scrape_competitor_keywords_wrapper, job)
             
             # Wait for both to complete
             semantic_job_id, semantic_keywords = semantic_future.result()
             competitor_job_id, competitor_keywords = competitor_future.result()
         
+        publish_job_event(SessionLocal, job.id, job.user_id, "keywords")
+        
+        # Keep the lease for the outline stage; stop if another worker took the job over
+        if not renew_job_claim(job.id):
+            return False
+        
         # Generate outline using both sets of keywords
         outline = generate_outline_json(job, semantic_keywords, competitor_keywords)
         
@@ -693,6 +788,9 @@ def process_job(job: ContentJob) -> bool:
             logger.error(f"Failed to generate outline for job {job.id}")
             return False
         
+        # A job past its deadline has been reported as timed out; don't write its results
+        request_timeout(None)
+        
         # Update database with results
         success = update_job_with_results(job.id, semantic_keywords, competitor_keywords, outline)
         
@@ -706,32 +804,142 @@ def process_job(job: ContentJob) -> bool:
     except Exception as e:
         logger.error(f"Error processing job {job.id}: {e}")
         return False
+    finally:
+        if not success:
+            publish_job_event(SessionLocal, job.id, job.user_id, "failed")
+        release_job_claim(job.id, success)
+
 
+def _process_job_with_deadline(job: ContentJob, deadline: float) -> bool:
+    """Run process_job with every LLM and scraper call bounded by the job's deadline."""
+    _job_deadline.set(deadline)
+    return process_job(job)
 
-def main():
+
+def process_jobs_concurrently(jobs: List[ContentJob], concurrency: int, job_timeout: float) -> Tuple[int, int, int]:
+    """
+    Process jobs with up to `concurrency` jobs in flight at once.
+    
+    Each job gets a deadline `job_timeout` seconds after it starts. Its LLM and scraper
+    requests time out at the deadline and it does not write results after it, so a stuck
+    job stops on its own. A job still running past its deadline is reported as timed out,
+    and keeps its slot until its thread has actually finished: `concurrency` is a hard
+    bound on the jobs running at once.
+    
+    Args:
+        jobs: Jobs to process
+        concurrency: Maximum number of jobs processed at the same time
+        job_timeout: Seconds a job may run
+        
+    Returns:
+        Tuple of (successful, failed, timed_out) job counts
+    """
+    successful_jobs = 0
+    failed_jobs = 0
+    timed_out_jobs = 0
+    
+    queue = list(jobs)
+    running: Dict[Any, Tuple[ContentJob, float]] = {}
+    # Timed out jobs whose threads are still winding down
+    abandoned: Dict[Any, ContentJob] = {}
+    
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="outline-job") as executor:
+        while queue or running:
+            while queue and len(running) + len(abandoned) < concurrency:
+                job = queue.pop(0)
+                deadline = time.monotonic() + job_timeout
+                future = executor.submit(contextvars.copy_context().run, _process_job_with_deadline, job, deadline)
+                running[future] = (job, deadline)
+            
+            done, _ = wait(list(running) + list(abandoned), timeout=1, return_when=FIRST_COMPLETED)
+            
+            for future in done:
+                if future in abandoned:
+                    logger.info(f"Timed out job {abandoned.pop(future).id} has stopped, freeing its slot")
+                    continue
+                
+                job, deadline = running.pop(future)
+                try:
+                    success = future.result()
+                except Exception as e:
+                    logger.error(f"Error processing job {job.id}: {e}")
+                    success = False
+                
+                if success:
+                    successful_jobs += 1
+                elif time.monotonic() > deadline:
+                    logger.error(f"Job {job.id} exceeded the {job_timeout:.0f}s job timeout")
+                    timed_out_jobs += 1
+                else:
+                    failed_jobs += 1
+            
+            now = time.monotonic()
+            for future, (job, deadline) in list(running.items()):
+                if now > deadline:
+                    logger.error(f"Job {job.id} exceeded the {job_timeout:.0f}s job timeout, moving on")
+                    running.pop(future)
+                    abandoned[future] = job
+                    timed_out_jobs += 1
+        
+        if abandoned:
+            logger.info(f"Waiting for {len(abandoned)} timed out jobs to stop")
+    
+    return successful_jobs, failed_jobs, timed_out_jobs
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments for the outline generation script."""
+    parser = argparse.ArgumentParser(description="Generate outlines for pending content jobs")
+    parser.add_argument(
+        '--limit',
+        type=int,
+        default=10,
+        help='Maximum number of pending jobs to process (default: 10)'
+    )
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=int(os.getenv("OUTLINE_CONCURRENCY", 1)),
+        help='Number of jobs processed at the same time (default: 1)'
+    )
+    parser.add_argument(
+        '--llm-budget',
+        type=int,
+        default=None,
+        help='Maximum in-flight LLM requests across all jobs (default: LLM_MAX_IN_FLIGHT)'
+    )
+    parser.add_argument(
+        '--job-timeout',
+        type=float,
+        default=float(os.getenv("OUTLINE_JOB_TIMEOUT", 600)),
+        help='Seconds before a job is considered stuck (default: 600)'
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
     """Main function to process pending jobs."""
-    logger.info("Starting outline generation process")
+    args = parse_args(argv)
+    logger.info(f"Starting outline generation process (concurrency={args.concurrency})")
     
     try:
+        if args.llm_budget:
+            get_llm_client().set_max_in_flight(args.llm_budget)
+        
         # Get pending jobs
-        jobs = get_pending_jobs(limit=10)
+        jobs = get_pending_jobs(limit=args.limit)
         
         if not jobs:
             logger.info("No pending jobs found")
             return
         
         # Process jobs
-        successful_jobs = 0
-        failed_jobs = 0
-        
-        for job in jobs:
-            success = process_job(job)
-            if success:
-                successful_jobs += 1
-            else:
-                failed_jobs += 1
+        successful_jobs, failed_jobs, timed_out_jobs = process_jobs_concurrently(
+            jobs, max(1, args.concurrency), args.job_timeout
+        )
         
-        logger.info(f"Processing complete. Successful: {successful_jobs}, Failed: {failed_jobs}")
+        logger.info(f"Processing complete. Successful: {successful_jobs}, Failed: {failed_jobs}, Timed out: {timed_out_jobs}")
+        logger.info(f"LLM cache: {get_llm_client().cache_stats()}")
         
     except Exception as e:
         logger.error(f"Error in main process: {e}")
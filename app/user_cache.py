@@ -0,0 +1,129 @@
+"""
+Authenticated user lookups for the API's get_current_user dependencies.
+
+The frontend polls endpoints like /jobs/{id}/status, so looking the user up by
+username on every request kept the database busy with the same query. Requests are
+now authenticated without a database round-trip in two ways:
+
+- tokens issued by /login carry the claims endpoints need (user id, name, role), so
+  a valid token is enough on its own
+- tokens without those claims (issued before this change) are resolved through a
+  per-process TTL cache keyed on the token subject
+
+invalidate_user() must be called whenever a user is created, changed or deleted. It
+drops the cached entry and makes tokens issued before the change go back to the
+database until they expire, so a deleted user stops authenticating right away (in
+this process; other workers pick it up within USER_CACHE_TTL for subject lookups).
+
+Configuration (environment variables):
+    USER_CACHE_TTL          Seconds a user looked up by subject is reused (default: 60)
+    USER_CACHE_MAX_ENTRIES  Max cached users per process (default: 10000)
+"""
+
+import os
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", 60))
+USER_CACHE_MAX_ENTRIES = int(os.getenv("USER_CACHE_MAX_ENTRIES", 10000))
+ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 60))
+
+
+class CurrentUser:
+    """
+    Snapshot of the authenticated user.
+
+    Carries the User columns endpoints read (id, username, name, role) without being
+    attached to a database session.
+    """
+    id: int
+    username: str
+    name: Optional[str]
+    role: Optional[str]
+
+    def __init__(self, id: int, username: str, name: Optional[str] = None, role: Optional[str] = None):
+        self.id = id
+        self.username = username
+        self.name = name
+        self.role = role
+
+    @classmethod
+    def from_user(cls, user) -> "CurrentUser":
+        return cls(user.id, user.username, user.name, user.role)
+
+    @classmethod
+    def from_claims(cls, payload: Dict[str, Any]) -> Optional["CurrentUser"]:
+        """Build the user from token claims, or None if the token predates them."""
+        if payload.get("uid") is None:
+            return None
+        return cls(payload["uid"], payload["sub"], payload.get("name"), payload.get("role"))
+
+
+class UserCache:
+    """Per-process TTL cache of users keyed on the token subject (username)."""
+
+    def __init__(self, ttl: float = USER_CACHE_TTL, max_entries: int = USER_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        # username -> time of the last change; older tokens are checked against the database
+        self._changed_at: Dict[str, float] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def resolve_claims(self, payload: Dict[str, Any]) -> Optional[CurrentUser]:
+        """
+        Authenticate from token claims alone.
+
+        Returns:
+            The user, or None if the token has no user claims or was issued before
+            the user last changed; the caller then falls back to get()/the database.
+        """
+        user = CurrentUser.from_claims(payload)
+        if user is None:
+            return None
+        with self._lock:
+            changed_at = self._changed_at.get(user.username)
+        issued_at = payload.get("iat")
+        if changed_at is not None and (issued_at is None or issued_at <= changed_at):
+            return None
+        return user
+
+    def get(self, username: str) -> Optional[CurrentUser]:
+        """Cached user for a token subject, or None on a miss or expired entry."""
+        with self._lock:
+            entry = self._entries.get(username)
+            if entry is None or entry[1] < time.time():
+                self.misses += 1
+                return None
+            self._entries.move_to_end(username)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, user: CurrentUser) -> None:
+        with self._lock:
+            self._entries[user.username] = (user, time.time() + self.ttl)
+            self._entries.move_to_end(user.username)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_user(self, username: str) -> None:
+        """Forget a user after it is created, changed or deleted."""
+        now = time.time()
+        with self._lock:
+            self._entries.pop(username, None)
+            self._changed_at[username] = now
+            # Tokens issued before this are expired anyway
+            horizon = now - ACCESS_TOKEN_EXPIRE_MINUTES * 60
+            for name in [name for name, changed in self._changed_at.items() if changed < horizon]:
+                del self._changed_at[name]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+
+user_cache = UserCache()
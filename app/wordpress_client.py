@@ -0,0 +1,253 @@
+"""
+Pooled WordPress REST client.
+
+Every publisher in the backend (blog automation, the Markdown and standalone blog
+generators) talks to WordPress through the per-site client returned by
+get_wordpress_client(). Each site gets one requests.Session with a keep-alive
+connection pool, so the media uploads and post writes of an article reuse warm
+connections instead of paying a new TLS handshake per request.
+
+Requests that fail with 429 or a 5xx status (and connection errors) are retried with
+exponential backoff, honouring Retry-After. Creates (POST) are only retried on 429, 503
+and connection errors: after a 500, 502 or 504 the post or upload may already exist.
+Concurrent media uploads to one site are capped so small hosts are not flooded.
+
+Configuration (environment variables):
+    WP_TIMEOUT              Read timeout in seconds (default: 60)
+    WP_CONNECT_TIMEOUT      Connect timeout in seconds (default: 10)
+    WP_MAX_RETRIES          Retries on 429/5xx/connection errors (default: 3)
+    WP_RETRY_BACKOFF        Backoff factor in seconds (default: 1)
+    WP_UPLOAD_CONCURRENCY   Concurrent media uploads per site (default: 4)
+"""
+
+import os
+import json
+import logging
+import mimetypes
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+WP_TIMEOUT = float(os.getenv("WP_TIMEOUT", 60))
+WP_CONNECT_TIMEOUT = float(os.getenv("WP_CONNECT_TIMEOUT", 10))
+WP_MAX_RETRIES = int(os.getenv("WP_MAX_RETRIES", 3))
+WP_RETRY_BACKOFF = float(os.getenv("WP_RETRY_BACKOFF", 1))
+WP_UPLOAD_CONCURRENCY = int(os.getenv("WP_UPLOAD_CONCURRENCY", 4))
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# A 500, 502 or 504 may come after WordPress already created the post or attachment, so
+# creates (POST) are only retried on statuses that mean the request was not processed
+CREATE_RETRY_STATUSES = (429, 503)
+
+
+class WordPressAPIError(Exception):
+    """Exception raised when a WordPress REST request fails."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def seo_meta_fields(meta_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Map SEO metadata (from SEOContentEnhancer.prepare_wordpress_metadata) to the post
+    meta keys read by the common SEO plugins (Yoast, RankMath, AIOSEO, Genesis).
+    """
+    wp_meta: Dict[str, Any] = {}
+
+    # Add meta description (for SEO plugins like Yoast, RankMath, etc.)
+    if 'meta_description' in meta_data:
+        wp_meta['_yoast_wpseo_metadesc'] = meta_data['meta_description']
+        wp_meta['_genesis_description'] = meta_data['meta_description']
+        wp_meta['_aioseop_description'] = meta_data['meta_description']
+        wp_meta['rank_math_description'] = meta_data['meta_description']
+        wp_meta['seo_meta_description'] = meta_data['meta_description']
+
+    # Add readability score
+    if 'readability_score' in meta_data:
+        wp_meta['seo_readability_score'] = meta_data['readability_score']
+        wp_meta['flesch_reading_ease'] = meta_data['readability_score']
+
+    # Add keyword information
+    if 'focus_keyword' in meta_data:
+        wp_meta['_yoast_wpseo_focuskw'] = meta_data['focus_keyword']
+        wp_meta['rank_math_focus_keyword'] = meta_data['focus_keyword']
+        wp_meta['seo_focus_keyword'] = meta_data['focus_keyword']
+
+    # Add content analysis
+    if 'content_analysis' in meta_data:
+        wp_meta['seo_content_analysis'] = json.dumps(meta_data['content_analysis'])
+
+    # Add external links count
+    if 'external_links_count' in meta_data:
+        wp_meta['seo_external_links_count'] = meta_data['external_links_count']
+
+    # Add word count
+    if 'word_count' in meta_data:
+        wp_meta['seo_word_count'] = meta_data['word_count']
+
+    return wp_meta
+
+
+class _WordPressRetry(Retry):
+    """Retry that re-sends non-idempotent requests only on CREATE_RETRY_STATUSES."""
+
+    def is_retry(self, method: str, status_code: int, has_retry_after: bool = False) -> bool:
+        if method.upper() not in Retry.DEFAULT_ALLOWED_METHODS and status_code not in CREATE_RETRY_STATUSES:
+            return False
+        return super().is_retry(method, status_code, has_retry_after)
+
+
+class WordPressSiteClient:
+    """Keep-alive REST client for one WordPress site and user."""
+
+    def __init__(
+        self,
+        site_url: str,
+        username: str,
+        app_password: str,
+        timeout: float = WP_TIMEOUT,
+        connect_timeout: float = WP_CONNECT_TIMEOUT,
+        max_retries: int = WP_MAX_RETRIES,
+        retry_backoff: float = WP_RETRY_BACKOFF,
+        upload_concurrency: int = WP_UPLOAD_CONCURRENCY,
+    ):
+        self.site_url = site_url.rstrip('/')
+        self.username = username
+        self.app_password = app_password
+        self.api_url = f"{self.site_url}/wp-json/wp/v2"
+        self.timeout = (connect_timeout, timeout)
+        self.upload_concurrency = max(1, upload_concurrency)
+        self._uploads = threading.BoundedSemaphore(self.upload_concurrency)
+
+        # Retrying a read timeout could duplicate a post or upload, so only connection
+        # failures (request not sent) and retryable statuses are retried; posts and
+        # uploads only on 429/503, other methods on any status in RETRY_STATUSES
+        retry = _WordPressRetry(
+            total=max_retries,
+            connect=max_retries,
+            read=0,
+            status=max_retries,
+            backoff_factor=retry_backoff,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=None,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.upload_concurrency + 2,
+            max_retries=retry,
+        )
+        self.session = requests.Session()
+        self.session.auth = (username, app_password)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _request(self, method: str, path: str, **kwargs) -> Dict[str, Any]:
+        url = f"{self.api_url}/{path.lstrip('/')}"
+        try:
+            response = self.session.request(method, url, timeout=self.timeout, **kwargs)
+        except requests.RequestException as e:
+            raise WordPressAPIError(f"WordPress request to {url} failed: {str(e)}")
+
+        if response.status_code not in (200, 201):
+            raise WordPressAPIError(
+                f"WordPress API error: {response.status_code} - {response.text[:500]}",
+                status_code=response.status_code
+            )
+        return response.json()
+
+    def create_post(
+        self,
+        title: str,
+        content: str,
+        status: str = "draft",
+        meta: Optional[Dict[str, Any]] = None,
+        featured_media: Optional[int] = None,
+        **fields: Any,
+    ) -> Dict[str, Any]:
+        """
+        Create a post with its meta fields and featured image in a single write.
+
+        Sites that reject the meta fields (e.g. a plugin registers one with a stricter
+        schema) get the post created without meta and the meta sent in a follow-up update.
+
+        Returns:
+            The created post as returned by the REST API.
+        """
+        post_data: Dict[str, Any] = {
+            'title': title,
+            'content': content,
+            'status': status,
+            'format': 'standard',
+            **fields,
+        }
+        if featured_media:
+            post_data['featured_media'] = featured_media
+        if meta:
+            post_data['meta'] = meta
+
+        try:
+            return self._request("POST", "posts", json=post_data)
+        except WordPressAPIError as e:
+            if not meta or e.status_code != 400:
+                raise
+            logger.warning(f"{self.site_url} rejected post meta in the create request, sending it separately: {str(e)}")
+
+        post_data.pop('meta')
+        result = self._request("POST", "posts", json=post_data)
+        try:
+            self.update_post(result['id'], meta=meta)
+        except WordPressAPIError as e:
+            logger.warning(f"Failed to update metadata for post ID {result['id']}: {str(e)}")
+        return result
+
+    def update_post(self, post_id: int, **fields: Any) -> Dict[str, Any]:
+        """Update fields (meta, featured_media, status, ...) of an existing post."""
+        return self._request("POST", f"posts/{post_id}", json=fields)
+
+    def upload_media(self, image_data: bytes, filename: str, content_type: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Upload a file to the media library.
+
+        Returns:
+            The media item; 'id' and 'source_url' are the fields callers need.
+        """
+        content_type = content_type or mimetypes.guess_type(filename)[0] or 'image/jpeg'
+        with self._uploads:
+            result = self._request("POST", "media", files={'file': (filename, image_data, content_type)})
+        logger.info(f"Uploaded {filename} to {self.site_url}: {result.get('source_url')}")
+        return result
+
+    def close(self) -> None:
+        self.session.close()
+
+
+_clients: Dict[Tuple[str, str], WordPressSiteClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_wordpress_client(site_url: str, username: str, app_password: str) -> WordPressSiteClient:
+    """Return the process-wide client for a site and user, creating it on first use."""
+    key = (site_url.rstrip('/'), username)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None or client.app_password != app_password:
+            if client is not None:
+                # Application password was rotated
+                client.close()
+            client = WordPressSiteClient(site_url, username, app_password)
+            _clients[key] = client
+        return client
+
+
+def get_client_for_credentials(wp_creds) -> WordPressSiteClient:
+    """Return the pooled client for a WordPressCredentials row."""
+    return get_wordpress_client(wp_creds.siteUrl, wp_creds.username, wp_creds.applicationPassword)
@@ -0,0 +1,217 @@
+"""
+Cached WordPress site metadata for the /wordpress/sites endpoint.
+
+Site title and description come from each site's /wp-json/wp/v2/settings. Probing
+every site on every request made the endpoint as slow as the slowest site, so results
+are kept in a per-process TTL cache:
+
+- fresh entries are returned as they are
+- stale entries are returned immediately and refreshed in the background
+- sites never probed before are probed concurrently, each with a short deadline;
+  sites that miss the deadline are reported as "pending" and keep loading in the
+  background, so the next request has them
+
+All probes share one pooled httpx.AsyncClient, so repeat probes of a site reuse its
+keep-alive connection; the API closes it on shutdown (aclose()).
+
+Configuration (environment variables):
+    WP_SITE_INFO_TTL        Seconds site metadata is considered fresh (default: 600)
+    WP_SITE_INFO_ERROR_TTL  Seconds a failed probe is reused before retrying (default: 60)
+    WP_SITE_PROBE_TIMEOUT   Timeout for one settings request in seconds (default: 10)
+    WP_SITE_PROBE_DEADLINE  How long a request waits for first-time probes (default: 2)
+    WP_SITE_PROBE_MAX_CONNECTIONS  Max pooled connections for probes (default: 20)
+"""
+
+import os
+import time
+import asyncio
+import hashlib
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Set
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+WP_SITE_INFO_TTL = float(os.getenv("WP_SITE_INFO_TTL", 600))
+WP_SITE_INFO_ERROR_TTL = float(os.getenv("WP_SITE_INFO_ERROR_TTL", 60))
+WP_SITE_PROBE_TIMEOUT = float(os.getenv("WP_SITE_PROBE_TIMEOUT", 10))
+WP_SITE_PROBE_DEADLINE = float(os.getenv("WP_SITE_PROBE_DEADLINE", 2))
+WP_SITE_PROBE_MAX_CONNECTIONS = int(os.getenv("WP_SITE_PROBE_MAX_CONNECTIONS", 20))
+
+
+class SiteInfo:
+    """Result of the last probe of one WordPress site."""
+    title: str
+    description: str
+    status: str
+    fetched_at: float
+    expires_at: float
+    fingerprint: str
+
+    def __init__(self, title: str, description: str, status: str, ttl: float, fingerprint: str):
+        self.title = title
+        self.description = description
+        self.status = status
+        self.fetched_at = time.time()
+        self.expires_at = self.fetched_at + ttl
+        self.fingerprint = fingerprint
+
+
+def _fingerprint(account) -> str:
+    """Changes whenever the site URL or credentials of an account change."""
+    material = f"{account.siteUrl}\0{account.username}\0{account.applicationPassword}"
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class SiteInfoCache:
+    """Per-process cache of WordPress site metadata with background refresh."""
+
+    def __init__(
+        self,
+        ttl: float = WP_SITE_INFO_TTL,
+        error_ttl: float = WP_SITE_INFO_ERROR_TTL,
+        probe_timeout: float = WP_SITE_PROBE_TIMEOUT,
+        probe_deadline: float = WP_SITE_PROBE_DEADLINE,
+        max_connections: int = WP_SITE_PROBE_MAX_CONNECTIONS,
+    ):
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        self.probe_timeout = probe_timeout
+        self.probe_deadline = probe_deadline
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max(1, max_connections // 2),
+        )
+        # Created on first probe, inside the running event loop
+        self._client: Optional[httpx.AsyncClient] = None
+        self._entries: Dict[int, SiteInfo] = {}
+        self._refreshing: Dict[int, "asyncio.Task[SiteInfo]"] = {}
+        # Keeps background tasks referenced until they finish
+        self._background: Set["asyncio.Task[SiteInfo]"] = set()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(timeout=self.probe_timeout, limits=self.limits, follow_redirects=True)
+        return self._client
+
+    async def aclose(self) -> None:
+        """Cancel running probes and close the connection pool."""
+        for task in list(self._background):
+            task.cancel()
+        if self._background:
+            await asyncio.gather(*self._background, return_exceptions=True)
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def invalidate(self, account_id: int) -> None:
+        """Forget cached metadata for an account (after it is updated or deleted)."""
+        self._entries.pop(account_id, None)
+
+    async def _probe(self, account, fingerprint: str) -> SiteInfo:
+        previous = self._entries.get(account.id)
+        try:
+            response = await self.client.get(
+                f"{account.siteUrl}/wp-json/wp/v2/settings",
+                auth=(account.username, account.applicationPassword),
+            )
+
+            if response.status_code == 200:
+                site_data = response.json()
+                return SiteInfo(
+                    site_data.get("title", "Unknown"),
+                    site_data.get("description", ""),
+                    "connected",
+                    self.ttl,
+                    fingerprint,
+                )
+            description = "Unable to fetch site information"
+        except Exception as e:
+            logger.warning(f"Failed to get info for {account.siteUrl}: {e}")
+            description = str(e) or type(e).__name__
+
+        # Keep the last known title so a flaky site does not lose its name in the UI
+        if previous is not None and previous.fingerprint == fingerprint and previous.status == "connected":
+            return SiteInfo(previous.title, previous.description, "error", self.error_ttl, fingerprint)
+        return SiteInfo("Connection Error", description, "error", self.error_ttl, fingerprint)
+
+    def _refresh(self, account, fingerprint: str) -> "asyncio.Task[SiteInfo]":
+        """Start (or join) a probe of one site; the result is stored when it finishes."""
+        task = self._refreshing.get(account.id)
+        if task is not None:
+            return task
+
+        async def refresh() -> SiteInfo:
+            info = await self._probe(account, fingerprint)
+            self._entries[account.id] = info
+            return info
+
+        task = asyncio.ensure_future(refresh())
+        self._refreshing[account.id] = task
+        self._background.add(task)
+
+        def finished(done: "asyncio.Task[SiteInfo]") -> None:
+            self._refreshing.pop(account.id, None)
+            self._background.discard(done)
+
+        task.add_done_callback(finished)
+        return task
+
+    async def get_sites(self, accounts: Sequence[Any]) -> List[Dict[str, Any]]:
+        """
+        Site metadata for a user's WordPress accounts, in account order.
+
+        Every site carries `freshness` ("fresh", "stale" or "pending"), `fetchedAt`
+        and `ageSeconds` so the client can tell cached data from a live probe.
+        """
+        now = time.time()
+        first_probes = []
+
+        for account in accounts:
+            fingerprint = _fingerprint(account)
+            entry = self._entries.get(account.id)
+            if entry is None or entry.fingerprint != fingerprint:
+                first_probes.append(self._refresh(account, fingerprint))
+            elif entry.expires_at <= now:
+                # Serve the stale entry now, refresh for the next request
+                self._refresh(account, fingerprint)
+
+        if first_probes:
+            # Whatever misses the deadline keeps running in the background
+            await asyncio.wait(first_probes, timeout=self.probe_deadline)
+
+        now = time.time()
+        sites = []
+        for account in accounts:
+            site = {
+                "id": account.id,
+                "siteUrl": account.siteUrl,
+                "username": account.username,
+            }
+            entry = self._entries.get(account.id)
+            if entry is None or entry.fingerprint != _fingerprint(account):
+                site.update({
+                    "title": "Loading",
+                    "description": "Site information is being fetched",
+                    "status": "pending",
+                    "freshness": "pending",
+                    "fetchedAt": None,
+                    "ageSeconds": None,
+                })
+            else:
+                site.update({
+                    "title": entry.title,
+                    "description": entry.description,
+                    "status": entry.status,
+                    "freshness": "fresh" if entry.expires_at > now else "stale",
+                    "fetchedAt": datetime.fromtimestamp(entry.fetched_at, tz=timezone.utc).isoformat(),
+                    "ageSeconds": round(now - entry.fetched_at, 1),
+                })
+            sites.append(site)
+        return sites
+
+
+site_info_cache = SiteInfoCache()
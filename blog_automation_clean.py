@@ -16,16 +16,20 @@ import json
 import time
 import logging
 import requests
-import base64
 import re
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 
 # Add the parent directory to the path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.database import SessionLocal, engine
 from app.models import ContentJob, WordPressCredentials, User
+from app.llm_client import get_llm_client
+from app.job_claims import claim_jobs, release_job, renew_lease, lock_claimed_job, LeaseLostError
+from app.job_events import notify_job_event, publish_job_event
+from app.image_cache import ImageSearchCache
+from app.wordpress_client import get_client_for_credentials
 from blog_generation_markdown import MarkdownBlogGenerator
 from markdown_to_html_converter import MarkdownToHTMLConverter
 from blog_generation_standalone import WordPressClient
@@ -79,6 +83,7 @@ class ImageGenerator:
     def __init__(self, pixabay_api_key: str = None, featured_image_service_url: str = "http://localhost:8001"):
         self.pixabay_api_key = pixabay_api_key or os.getenv('PIXABAY_API_KEY')
         self.featured_image_service_url = featured_image_service_url
+        self.search_cache = ImageSearchCache()
         
     def get_stock_image(self, query: str) -> Optional[str]:
         """Get a stock image from a free service like Unsplash."""
@@ -146,12 +151,21 @@ class ImageGenerator:
                     'per_page': 5
                 }
             
+            found, cached = self.search_cache.lookup('pixabay', query, {'for_featured': for_featured})
+            if found:
+                if not cached:
+                    logger.warning(f"No images found for query: {query} (cached)")
+                return cached
+            
             response = requests.get(url, params=params)
             response.raise_for_status()
             
             data = response.json()
-            if data['hits']:
-                return data['hits'][0]['largeImageURL']
+            image_url = data['hits'][0]['largeImageURL'] if data['hits'] else None
+            self.search_cache.store('pixabay', query, image_url, {'for_featured': for_featured})
+            
+            if image_url:
+                return image_url
             
             logger.warning(f"No images found for query: {query}")
             return None
@@ -273,50 +287,31 @@ class ImageGenerator:
             logger.error(f"Error generating featured image: {str(e)}")
             return None
     
-    def set_featured_image_for_wordpress(self, post_id: int, image_data: bytes, filename: str, wp_creds) -> bool:
-        """Upload and set an image as the featured image for a WordPress post."""
+    def upload_featured_image(self, image_data: bytes, filename: str, wp_creds) -> Optional[int]:
+        """Upload a featured image to the WordPress media library and return its media ID."""
         try:
-            # First upload the image to WordPress media library
-            upload_url = f"{wp_creds.siteUrl.rstrip('/')}/wp-json/wp/v2/media"
-            
-            # Prepare the file upload
-            files = {
-                'file': (filename, image_data, 'image/webp' if filename.endswith('.webp') else 'image/jpeg')
-            }
-            
-            # Create basic auth header
-            credentials = f"{wp_creds.username}:{wp_creds.applicationPassword}"
-            auth_header = base64.b64encode(credentials.encode()).decode()
-            
-            headers = {
-                'Authorization': f'Basic {auth_header}'
-            }
-            
-            # Upload the image
-            response = requests.post(upload_url, files=files, headers=headers)
-            response.raise_for_status()
-            
-            result = response.json()
+            result = get_client_for_credentials(wp_creds).upload_media(image_data, filename)
             image_id = result.get('id')
             
             if not image_id:
                 logger.error("Failed to get image ID from WordPress response")
+                return None
+            
+            return image_id
+            
+        except Exception as e:
+            logger.error(f"Error uploading featured image: {str(e)}")
+            return None
+    
+    def set_featured_image_for_wordpress(self, post_id: int, image_data: bytes, filename: str, wp_creds) -> bool:
+        """Upload and set an image as the featured image for a WordPress post."""
+        try:
+            image_id = self.upload_featured_image(image_data, filename, wp_creds)
+            if not image_id:
                 return False
                 
             # Now set this image as the featured image for the post
-            update_url = f"{wp_creds.siteUrl.rstrip('/')}/wp-json/wp/v2/posts/{post_id}"
-            
-            update_data = {
-                'featured_media': image_id
-            }
-            
-            update_response = requests.post(
-                update_url,
-                json=update_data,
-                headers=headers
-            )
-            
-            update_response.raise_for_status()
+            get_client_for_credentials(wp_creds).update_post(post_id, featured_media=image_id)
             
             logger.info(f"Successfully set featured image (ID: {image_id}) for post ID: {post_id}")
             return True
@@ -348,15 +343,9 @@ class CleanBlogAutomation:
         os.makedirs(self.html_dir, exist_ok=True)
         
     def get_approved_jobs(self, max_jobs: int = 5) -> List[ContentJob]:
-        """Get approved jobs that are ready for blog generation."""
+        """Claim approved jobs that are ready for blog generation."""
         try:
-            jobs = self.db.query(ContentJob).filter(
-                and_(
-                    ContentJob.status == True,      # Has outline
-                    ContentJob.isApproved == True,  # Is approved
-                    ContentJob.Outline.isnot(None)  # Has outline content
-                )
-            ).limit(max_jobs).all()
+            jobs = claim_jobs(self.db, ContentJob, self.approved_job_filters(), max_jobs)
             
             logger.info(f"Found {len(jobs)} approved jobs ready for blog generation")
             return jobs
@@ -365,6 +354,17 @@ class CleanBlogAutomation:
             logger.error(f"Error getting approved jobs: {str(e)}")
             return []
     
+    @staticmethod
+    def approved_job_filters() -> list:
+        """Filters selecting jobs ready for blog generation."""
+        return [
+            and_(
+                ContentJob.status == True,      # Has outline
+                ContentJob.isApproved == True,  # Is approved
+                ContentJob.Outline.isnot(None)  # Has outline content
+            )
+        ]
+    
     def clean_html_content(self, html_content: str) -> str:
         """Clean HTML content to remove H1 tags and ensure proper formatting."""
         # Remove any H1 tags that might have slipped through
@@ -383,66 +383,15 @@ class CleanBlogAutomation:
         try:
             logger.info(f"🚀 Starting workflow for job {job.id}: {job.title}")
             
-            # Step 1: Generate Markdown content
-            logger.info(f"📝 Step 1: Generating Markdown content (using {self.workers} workers)...")
-            markdown_content = self.markdown_generator.generate_blog_post(job, max_workers=self.workers)
-            
-            if not markdown_content:
-                logger.error(f"❌ Failed to generate markdown for job {job.id}")
-                return False
-            
-            logger.info(f"✅ Markdown generated successfully")
-            
-            # Step 1.5: Analyze SEO metrics on clean Markdown content
-            logger.info(f"📊 Step 1.5: Analyzing SEO metrics on Markdown content...")
-            seo_metadata = self.seo_enhancer.prepare_wordpress_metadata(
-                title=job.title,
-                keyword=job.mainKeyword,
-                content=markdown_content  # Analyze the clean Markdown, not HTML
-            )
-            
-            # Step 2: Convert to HTML
-            logger.info(f"🔄 Step 2: Converting Markdown to HTML...")
-            html_content = self.html_converter.convert_markdown_to_html(markdown_content)
-            
-            if not html_content:
-                logger.error(f"❌ Failed to convert markdown to HTML for job {job.id}")
+            result = self.generate_html(job)
+            if not result:
                 return False
             
-            # Step 2.5: Clean HTML content to remove H1 tags
-            logger.info(f"🧹 Step 2.5: Cleaning HTML content...")
-            html_content = self.clean_html_content(html_content)
-            
-            # Clean HTML content to remove H1 tags and ensure proper formatting
-            html_content = self.clean_html_content(html_content)
+            html_content, seo_metadata = result
             
-            # Save HTML locally
-            safe_title = job.title.replace(' ', '-').replace('/', '-')
-            timestamp = datetime.now().strftime('%Y%m%d-%H%M%S')
-            html_filename = f"{safe_title}-{timestamp}.html"
-            html_filepath = os.path.join(self.html_dir, html_filename)
-            
-            with open(html_filepath, 'w', encoding='utf-8') as f:
-                f.write(html_content)
-            
-            logger.info(f"✅ HTML saved to: {html_filepath}")
-            
-            # Step 3: Upload to WordPress
-            logger.info(f"🌐 Step 3: Uploading to WordPress...")
-            post_id = self.upload_to_wordpress(html_content, job, seo_metadata)
-            
-            if not post_id:
-                logger.error(f"❌ Failed to upload to WordPress for job {job.id}")
+            if not self.publish_html(job, html_content, seo_metadata):
                 return False
             
-            logger.info(f"✅ Successfully uploaded to WordPress! Post ID: {post_id}")
-            
-            # Update job status and set isApproved to False once blog is posted
-            job.wordpress_post_id = post_id
-            job.isApproved = False
-            self.db.commit()
-            
-            logger.info(f"✅ Job {job.id} isApproved set to False after successful posting")
             logger.info(f"🎉 Complete workflow finished for job {job.id}")
             return True
             
@@ -450,6 +399,109 @@ class CleanBlogAutomation:
             logger.error(f"❌ Error processing job {job.id}: {str(e)}")
             return False
     
+    def generate_html(self, job: ContentJob) -> Optional[Tuple[str, dict]]:
+        """
+        Generate the blog post for a job and save it locally as HTML.
+        
+        Returns:
+            Tuple of (html_content, seo_metadata), or None if generation failed
+        """
+        # Step 1: Generate Markdown content
+        logger.info(f"📝 Step 1: Generating Markdown content (using {self.workers} workers)...")
+        job_id, user_id = job.id, job.user_id
+        
+        def report_progress(stage: str, **fields) -> None:
+            publish_job_event(SessionLocal, job_id, user_id, stage, **fields)
+            # Heartbeat: generation can outlast the lease. Stages report from worker
+            # threads, so each renewal uses its own session.
+            db = SessionLocal()
+            try:
+                renew_lease(db, ContentJob, job_id)
+            finally:
+                db.close()
+        
+        markdown_content = self.markdown_generator.generate_blog_post(job, max_workers=self.workers, progress=report_progress)
+        
+        if not markdown_content:
+            logger.error(f"❌ Failed to generate markdown for job {job.id}")
+            return None
+        
+        logger.info(f"✅ Markdown generated successfully")
+        
+        # Step 1.5: Analyze SEO metrics on clean Markdown content
+        logger.info(f"📊 Step 1.5: Analyzing SEO metrics on Markdown content...")
+        seo_metadata = self.seo_enhancer.prepare_wordpress_metadata(
+            title=job.title,
+            keyword=job.mainKeyword,
+            content=markdown_content  # Analyze the clean Markdown, not HTML
+        )
+        
+        # Step 2: Convert to HTML
+        logger.info(f"🔄 Step 2: Converting Markdown to HTML...")
+        html_content = self.html_converter.convert_markdown_to_html(markdown_content)
+        
+        if not html_content:
+            logger.error(f"❌ Failed to convert markdown to HTML for job {job.id}")
+            return None
+        
+        # Step 2.5: Clean HTML content to remove H1 tags
+        logger.info(f"🧹 Step 2.5: Cleaning HTML content...")
+        html_content = self.clean_html_content(html_content)
+        
+        # Clean HTML content to remove H1 tags and ensure proper formatting
+        html_content = self.clean_html_content(html_content)
+        
+        # Save HTML locally
+        safe_title = job.title.replace(' ', '-').replace('/', '-')
+        timestamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+        html_filename = f"{safe_title}-{timestamp}.html"
+        html_filepath = os.path.join(self.html_dir, html_filename)
+        
+        with open(html_filepath, 'w', encoding='utf-8') as f:
+            f.write(html_content)
+        
+        logger.info(f"✅ HTML saved to: {html_filepath}")
+        publish_job_event(SessionLocal, job.id, job.user_id, "generated")
+        return html_content, seo_metadata
+    
+    def publish_html(self, job: ContentJob, html_content: str, seo_metadata: dict) -> Optional[str]:
+        """
+        Upload generated HTML to WordPress and mark the job as posted.
+        
+        Returns:
+            The WordPress post ID, or None if the upload failed
+        """
+        # Another worker may have reclaimed the job while it was generated; don't post it twice
+        if not renew_lease(self.db, ContentJob, job.id):
+            logger.error(f"❌ Lost the lease on job {job.id}, not publishing it")
+            return None
+        
+        # Step 3: Upload to WordPress
+        logger.info(f"🌐 Step 3: Uploading to WordPress...")
+        post_id = self.upload_to_wordpress(html_content, job, seo_metadata)
+        
+        if not post_id:
+            logger.error(f"❌ Failed to upload to WordPress for job {job.id}")
+            return None
+        
+        logger.info(f"✅ Successfully uploaded to WordPress! Post ID: {post_id}")
+        
+        # Update job status and set isApproved to False once blog is posted, provided
+        # this worker still holds the lease
+        try:
+            job = lock_claimed_job(self.db, ContentJob, job.id)
+        except LeaseLostError as e:
+            logger.error(f"❌ Not marking job {job.id} as posted: {str(e)}")
+            self.db.rollback()
+            return None
+        job.wordpress_post_id = post_id
+        job.isApproved = False
+        notify_job_event(self.db, job.id, job.user_id, "published", status=True, isApproved=False, post_id=post_id)
+        self.db.commit()
+        
+        logger.info(f"✅ Job {job.id} isApproved set to False after successful posting")
+        return post_id
+    
     def upload_to_wordpress(self, html_content: str, job: ContentJob, seo_metadata: dict) -> Optional[str]:
         """Upload HTML content to WordPress with pre-calculated SEO metadata and set featured image."""
         try:
@@ -480,44 +532,42 @@ class CleanBlogAutomation:
             logger.info(f"  • Word Count: {seo_metadata.get('word_count', 'Not counted')}")
             logger.info(f"  • External Links: {seo_metadata.get('external_links_count', 0)}")
             
-            # Upload to WordPress with metadata
+            # Create the featured image first so the post, its SEO metadata and its
+            # featured image go out in a single write
+            logger.info(f"🖼️  Creating featured image for: {job.title}")
+            featured_media_id = None
+            featured_image_data = self.image_generator.generate_featured_image_with_fallback(
+                title=job.title,
+                main_keyword=job.mainKeyword
+            )
+            
+            if featured_image_data:
+                filename = f"{job.title.replace(' ', '-').replace('?', '').replace('!', '')}-featured.webp"
+                featured_media_id = self.image_generator.upload_featured_image(
+                    image_data=featured_image_data,
+                    filename=filename,
+                    wp_creds=wp_creds
+                )
+                if not featured_media_id:
+                    logger.warning("⚠️  Failed to upload featured image, posting without it")
+            else:
+                logger.warning("⚠️  Failed to generate featured image data after all attempts")
+            
+            # Upload to WordPress with metadata and featured image
             result = wp_client.post_content(
                 title=job.title,
                 content=html_content,
                 status="draft",
-                meta_data=seo_metadata
+                meta_data=seo_metadata,
+                featured_media=featured_media_id
             )
             
             post_id = result.get('id') if result else None
             
             if post_id:
                 logger.info(f"✅ Successfully posted to WordPress with SEO metadata. Post ID: {post_id}")
-                
-                # Create and set featured image after successful post
-                logger.info(f"🖼️  Creating featured image for WordPress post ID: {post_id}")
-                
-                # Use the enhanced featured image generation with fallback
-                featured_image_data = self.image_generator.generate_featured_image_with_fallback(
-                    title=job.title,
-                    main_keyword=job.mainKeyword
-                )
-                
-                if featured_image_data:
-                    # Set as WordPress featured image
-                    filename = f"{job.title.replace(' ', '-').replace('?', '').replace('!', '')}-featured.webp"
-                    success = self.image_generator.set_featured_image_for_wordpress(
-                        post_id=post_id,
-                        image_data=featured_image_data,
-                        filename=filename,
-                        wp_creds=wp_creds
-                    )
-                    
-                    if success:
-                        logger.info(f"✅ Successfully set WordPress featured image for post ID: {post_id}")
-                    else:
-                        logger.warning(f"⚠️  Failed to set WordPress featured image for post ID: {post_id}")
-                else:
-                    logger.warning("⚠️  Failed to generate featured image data after all attempts")
+                if featured_media_id:
+                    logger.info(f"✅ WordPress featured image (ID: {featured_media_id}) set for post ID: {post_id}")
             
             return post_id
             
@@ -572,6 +622,7 @@ class CleanBlogAutomation:
             for job in jobs:
                 logger.info("-" * 60)
                 success = self.process_single_job(job)
+                release_job(self.db, ContentJob, job.id, success)
                 
                 if success:
                     successful_jobs += 1
@@ -587,6 +638,7 @@ class CleanBlogAutomation:
             logger.info(f"✅ Successful jobs: {successful_jobs}")
             logger.info(f"❌ Failed jobs: {failed_jobs}")
             logger.info(f"📝 Total processed: {successful_jobs + failed_jobs}")
+            logger.info(f"🧠 LLM cache: {get_llm_client().cache_stats()}")
             logger.info("🎉 Blog automation complete!")
             
         except Exception as e:
@@ -16,7 +16,7 @@ import requests
 import re
 import base64
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any
 from urllib.parse import urljoin, quote
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
@@ -30,8 +30,12 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.database import SessionLocal, engine
 from app.models import ContentJob, WordPressCredentials, User
+from app.image_cache import ImageSearchCache, ImageAssetStore
+from app.wordpress_client import get_client_for_credentials
 from blog_generation_standalone import BlogGenerator as BaseGenerator, OpenAIClient, WordPressClient
 from seo_content_enhancer import SEOContentEnhancer
+from stage_executor import StageExecutor
+from markdown_renderer import render_markdown
 
 # Configure logging
 logging.basicConfig(
@@ -54,6 +58,19 @@ class EnhancedImageGenerator:
         self.featured_image_service_url = "http://localhost:8001"
         self.local_images_dir = "/Users/aditya/Desktop/backend/generated_content/images"
         
+        # Search results and downloaded images are reused across runs
+        self.search_cache = ImageSearchCache()
+        self.asset_store = ImageAssetStore()
+        
+        # Stock API searches for one query race each other on this pool
+        self.search_pool = concurrent.futures.ThreadPoolExecutor(max_workers=12, thread_name_prefix="image-search")
+        
+        # Featured image service health, checked once per batch
+        self.health_check_max_age = 60
+        self._service_available = False
+        self._health_checked_at = 0.0
+        self._health_lock = threading.Lock()
+        
         # Create images directory if it doesn't exist
         os.makedirs(self.local_images_dir, exist_ok=True)
         
@@ -61,6 +78,10 @@ class EnhancedImageGenerator:
         """Search for an image on Pexels."""
         if not self.pexels_api_key:
             return None
+        
+        found, cached = self.search_cache.lookup('pexels', query)
+        if found:
+            return cached
             
         try:
             url = "https://api.pexels.com/v1/search"
@@ -77,15 +98,17 @@ class EnhancedImageGenerator:
             response.raise_for_status()
             
             data = response.json()
+            result = None
             if data.get('photos'):
                 photo = data['photos'][0]
-                return {
+                result = {
                     'url': photo['src']['large'],
                     'alt': photo.get('alt', query),
                     'source': 'pexels'
                 }
             
-            return None
+            self.search_cache.store('pexels', query, result)
+            return result
             
         except Exception as e:
             logger.error(f"Error searching Pexels: {str(e)}")
@@ -95,6 +118,10 @@ class EnhancedImageGenerator:
         """Search for an image on Pixabay."""
         if not self.pixabay_api_key:
             return None
+        
+        found, cached = self.search_cache.lookup('pixabay', query)
+        if found:
+            return cached
             
         try:
             url = "https://pixabay.com/api/"
@@ -113,15 +140,17 @@ class EnhancedImageGenerator:
             response.raise_for_status()
             
             data = response.json()
+            result = None
             if data.get('hits'):
                 hit = data['hits'][0]
-                return {
+                result = {
                     'url': hit['largeImageURL'],
                     'alt': hit.get('tags', query),
                     'source': 'pixabay'
                 }
             
-            return None
+            self.search_cache.store('pixabay', query, result)
+            return result
             
         except Exception as e:
             logger.error(f"Error searching Pixabay: {str(e)}")
@@ -131,6 +160,10 @@ class EnhancedImageGenerator:
         """Search for an image on Unsplash."""
         if not self.unsplash_access_key:
             return None
+        
+        found, cached = self.search_cache.lookup('unsplash', query)
+        if found:
+            return cached
             
         try:
             url = "https://api.unsplash.com/search/photos"
@@ -147,15 +180,17 @@ class EnhancedImageGenerator:
             response.raise_for_status()
             
             data = response.json()
+            result = None
             if data.get('results'):
-                result = data['results'][0]
-                return {
-                    'url': result['urls']['regular'],
-                    'alt': result.get('alt_description', query),
+                photo = data['results'][0]
+                result = {
+                    'url': photo['urls']['regular'],
+                    'alt': photo.get('alt_description', query),
                     'source': 'unsplash'
                 }
             
-            return None
+            self.search_cache.store('unsplash', query, result)
+            return result
             
         except Exception as e:
             logger.error(f"Error searching Unsplash: {str(e)}")
@@ -171,38 +206,66 @@ class EnhancedImageGenerator:
         }
     
     def find_image(self, query: str) -> Dict:
-        """Find an image using multiple APIs with fallback."""
+        """Find an image by racing all image APIs and taking the first good hit, with fallback."""
         logger.info(f"Searching for image: {query}")
         
-        # Try APIs in order of preference
         apis = [
             ('Pexels', self.search_pexels_image),
             ('Pixabay', self.search_pixabay_image),
             ('Unsplash', self.search_unsplash_image)
         ]
         
-        for api_name, search_func in apis:
-            try:
-                result = search_func(query)
-                if result:
-                    logger.info(f"Found image from {api_name}: {result['url']}")
-                    return result
-            except Exception as e:
-                logger.warning(f"Failed to search {api_name}: {str(e)}")
-                continue
+        futures = {self.search_pool.submit(search_func, query): api_name for api_name, search_func in apis}
+        try:
+            for future in concurrent.futures.as_completed(futures):
+                api_name = futures[future]
+                try:
+                    result = future.result()
+                    if result:
+                        logger.info(f"Found image from {api_name}: {result['url']}")
+                        return result
+                except Exception as e:
+                    logger.warning(f"Failed to search {api_name}: {str(e)}")
+                    continue
+        finally:
+            # Searches still in flight finish in the background; their results are ignored
+            for future in futures:
+                future.cancel()
         
         # Use fallback if all APIs fail
         logger.warning(f"All APIs failed for query: {query}, using fallback")
         return self.get_fallback_image(query)
     
-    def generate_custom_image(self, image_info: Dict, heading_text: str, filename: str) -> Optional[str]:
+    def check_service_health(self) -> bool:
+        """
+        Check whether the featured image service is running.
+        
+        The result is reused for health_check_max_age seconds so a batch of images
+        costs one /health probe instead of one per image.
+        """
+        with self._health_lock:
+            if time.time() - self._health_checked_at < self.health_check_max_age:
+                return self._service_available
+            
+            try:
+                health_response = requests.get(f"{self.featured_image_service_url}/health", timeout=5)
+                self._service_available = health_response.status_code == 200
+            except Exception as e:
+                logger.warning(f"Featured image service health check failed: {str(e)}")
+                self._service_available = False
+            
+            self._health_checked_at = time.time()
+            return self._service_available
+    
+    def generate_custom_image(self, image_info: Dict, heading_text: str, filename: str, service_available: Optional[bool] = None) -> Optional[str]:
         """Generate custom image with heading using featured image service."""
         try:
             logger.info(f"Generating custom image for heading: {heading_text}")
             
             # Check if the featured image service is running
-            health_response = requests.get(f"{self.featured_image_service_url}/health", timeout=5)
-            if health_response.status_code != 200:
+            if service_available is None:
+                service_available = self.check_service_health()
+            if not service_available:
                 logger.warning("Featured image service not available, downloading original image")
                 return self.download_and_save_image(image_info, filename)
             
@@ -238,19 +301,26 @@ class EnhancedImageGenerator:
             return self.download_and_save_image(image_info, filename)
     
     def download_and_save_image(self, image_info: Dict, filename: str) -> Optional[str]:
-        """Download image and save locally."""
+        """Download image (or reuse a previously downloaded copy) and save locally."""
         try:
-            logger.info(f"Downloading image from {image_info['source']}: {image_info['url']}")
+            image_data = self.asset_store.get(image_info['url'])
             
-            response = requests.get(image_info['url'], timeout=30)
-            response.raise_for_status()
+            if image_data is None:
+                logger.info(f"Downloading image from {image_info['source']}: {image_info['url']}")
+                
+                response = requests.get(image_info['url'], timeout=30)
+                response.raise_for_status()
+                image_data = response.content
+                self.asset_store.put(image_info['url'], image_data)
+            else:
+                logger.info(f"Reusing stored image from {image_info['source']}: {image_info['url']}")
             
             # Create local filename
             local_path = os.path.join(self.local_images_dir, filename)
             
             # Save image locally
             with open(local_path, 'wb') as f:
-                f.write(response.content)
+                f.write(image_data)
             
             logger.info(f"Saved image locally: {local_path}")
             return local_path
@@ -275,26 +345,14 @@ class EnhancedImageGenerator:
     def upload_image_to_wordpress(self, image_path: str, wp_creds) -> Optional[str]:
         """Upload image to WordPress and return the URL."""
         try:
-            # WordPress media upload endpoint
-            upload_url = f"{wp_creds.siteUrl.rstrip('/')}/wp-json/wp/v2/media"
-            
             # Read the image file
             with open(image_path, 'rb') as f:
                 image_data = f.read()
             
-            # Prepare the file upload
-            files = {
-                'file': (os.path.basename(image_path), image_data, 'image/jpeg')
-            }
-            
-            # WordPress authentication
-            auth = (wp_creds.username, wp_creds.applicationPassword)
-            
-            # Upload to WordPress
-            response = requests.post(upload_url, files=files, auth=auth, timeout=30)
-            response.raise_for_status()
-            
-            upload_result = response.json()
+            # Upload through the site's pooled client (keep-alive, retries, upload cap)
+            upload_result = get_client_for_credentials(wp_creds).upload_media(
+                image_data, os.path.basename(image_path), 'image/jpeg'
+            )
             wp_image_url = upload_result.get('source_url')
             
             if wp_image_url:
@@ -316,6 +374,8 @@ class MarkdownBlogGenerator(BaseGenerator):
         self.image_generator = EnhancedImageGenerator()
         self.content_dir = "/Users/aditya/Desktop/backend/generated_content"
         self.images_per_headings = 2  # Add image every 2 headings
+        self.image_workers = int(os.getenv('IMAGE_WORKERS', 4))
+        self.stage_timings: Dict[str, float] = {}
         self.seo_enhancer = SEOContentEnhancer()
         
         # Create content directory if it doesn't exist
@@ -410,13 +470,32 @@ class MarkdownBlogGenerator(BaseGenerator):
         
         return headings
     
-    def add_images_to_markdown(self, content: str, job: ContentJob) -> str:
-        """Add images to Markdown content every 2 headings."""
+    def count_headings(self, content: str) -> int:
+        """Count Markdown heading lines, the same way add_images_to_markdown does."""
+        return sum(1 for line in content.split('\n') if re.match(r'^#{1,6}\s+', line))
+    
+    def get_wordpress_credentials(self, job: ContentJob) -> Optional[WordPressCredentials]:
+        """Get the WordPress credentials used for a job's image uploads."""
+        return self.db.query(WordPressCredentials).filter(
+            WordPressCredentials.id == job.wordpress_credentials_id
+        ).first()
+    
+    def add_images_to_markdown(self, content: str, job: ContentJob, heading_offset: int = 0, wp_creds=None) -> str:
+        """
+        Add images to Markdown content every 2 headings.
+        
+        Args:
+            content: Markdown content (a whole post or one part of it)
+            job: The content job
+            heading_offset: Number of headings before this content in the full post,
+                so images land on the same headings whether the post is processed
+                whole or part by part
+            wp_creds: WordPress credentials; looked up from the job if not given
+        """
         try:
             # Get WordPress credentials for image upload
-            wp_creds = self.db.query(WordPressCredentials).filter(
-                WordPressCredentials.id == job.wordpress_credentials_id
-            ).first()
+            if wp_creds is None:
+                wp_creds = self.get_wordpress_credentials(job)
             
             if not wp_creds:
                 logger.error("WordPress credentials not found, cannot upload images")
@@ -428,54 +507,50 @@ class MarkdownBlogGenerator(BaseGenerator):
                 logger.warning("No headings found in content")
                 return content
             
-            # Process headings and add images
+            # Find the headings that get an image (every 2 headings)
             content_lines = content.split('\n')
-            modified_content = []
-            heading_count = 0
+            image_slots = []
+            heading_count = heading_offset
             
-            for line in content_lines:
-                modified_content.append(line)
-                
+            for index, line in enumerate(content_lines):
                 # Check if this line is a heading
                 if re.match(r'^#{1,6}\s+', line):
                     heading_count += 1
                     
-                    # Add image every 2 headings
                     if heading_count % self.images_per_headings == 0:
-                        # Generate search query from heading
                         heading_text = re.sub(r'^#{1,6}\s+', '', line)
-                        search_query = f"{job.mainKeyword} {heading_text}"
-                        
-                        # Find image
-                        image_info = self.image_generator.find_image(search_query)
-                        
-                        if image_info:
-                            # Create SEO-friendly filename
-                            seo_filename = self.image_generator.create_seo_filename(heading_text, heading_count)
-                            
-                            # Generate custom image with heading
-                            local_path = self.image_generator.generate_custom_image(image_info, heading_text, seo_filename)
-                            
-                            if local_path:
-                                # Upload to WordPress
-                                wp_image_url = self.image_generator.upload_image_to_wordpress(local_path, wp_creds)
-                                
-                                if wp_image_url:
-                                    # Add Markdown image syntax with WordPress URL
-                                    modified_content.append("")  # Empty line for spacing
-                                    modified_content.append(f"![{image_info['alt']}]({wp_image_url})")
-                                    modified_content.append("")  # Empty line for spacing
-                                    
-                                    logger.info(f"Added WordPress image after heading {heading_count}: {seo_filename}")
-                                else:
-                                    # Fallback to local path if WordPress upload fails
-                                    modified_content.append("")  # Empty line for spacing
-                                    modified_content.append(f"![{image_info['alt']}](images/{seo_filename})")
-                                    modified_content.append("")  # Empty line for spacing
-                                    
-                                    logger.warning(f"WordPress upload failed, using local image: {seo_filename}")
-                            else:
-                                logger.error(f"Failed to generate/download image for heading: {heading_text}")
+                        image_slots.append((index, heading_text, heading_count))
+            
+            if not image_slots:
+                return content
+            
+            # One health probe for the whole batch
+            service_available = self.image_generator.check_service_health()
+            
+            # Acquire one image per distinct search query, concurrently
+            queries = {}
+            for _, heading_text, heading_count in image_slots:
+                search_query = f"{job.mainKeyword} {heading_text}"
+                queries.setdefault(search_query, (heading_text, heading_count))
+            
+            with concurrent.futures.ThreadPoolExecutor(max_workers=min(self.image_workers, len(queries))) as executor:
+                futures = {
+                    search_query: executor.submit(
+                        self.acquire_image, search_query, heading_text, heading_count, wp_creds, service_available
+                    )
+                    for search_query, (heading_text, heading_count) in queries.items()
+                }
+                images = {search_query: future.result() for search_query, future in futures.items()}
+            
+            # Insert images after their headings, in document order
+            image_lines = {
+                index: images[f"{job.mainKeyword} {heading_text}"]
+                for index, heading_text, _ in image_slots
+            }
+            modified_content = []
+            for index, line in enumerate(content_lines):
+                modified_content.append(line)
+                modified_content.extend(image_lines.get(index, []))
             
             return '\n'.join(modified_content)
             
@@ -483,6 +558,46 @@ class MarkdownBlogGenerator(BaseGenerator):
             logger.error(f"Error adding images to Markdown: {str(e)}")
             return content
     
+    def acquire_image(self, search_query: str, heading_text: str, heading_count: int, wp_creds, service_available: bool) -> List[str]:
+        """
+        Find, render and upload the image for one heading.
+        
+        Returns:
+            Markdown lines to insert after the heading (empty if no image could be produced)
+        """
+        try:
+            # Find image
+            image_info = self.image_generator.find_image(search_query)
+            
+            if not image_info:
+                return []
+            
+            # Create SEO-friendly filename
+            seo_filename = self.image_generator.create_seo_filename(heading_text, heading_count)
+            
+            # Generate custom image with heading
+            local_path = self.image_generator.generate_custom_image(image_info, heading_text, seo_filename, service_available)
+            
+            if not local_path:
+                logger.error(f"Failed to generate/download image for heading: {heading_text}")
+                return []
+            
+            # Upload to WordPress
+            wp_image_url = self.image_generator.upload_image_to_wordpress(local_path, wp_creds)
+            
+            if wp_image_url:
+                logger.info(f"Added WordPress image after heading {heading_count}: {seo_filename}")
+                # Empty lines for spacing
+                return ["", f"![{image_info['alt']}]({wp_image_url})", ""]
+            
+            # Fallback to local path if WordPress upload fails
+            logger.warning(f"WordPress upload failed, using local image: {seo_filename}")
+            return ["", f"![{image_info['alt']}](images/{seo_filename})", ""]
+            
+        except Exception as e:
+            logger.error(f"Error acquiring image for heading {heading_text}: {str(e)}")
+            return []
+    
     def save_markdown_locally(self, content: str, job: ContentJob) -> str:
         """Save Markdown content locally."""
         try:
@@ -589,61 +704,91 @@ Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
         except Exception as e:
             logger.error(f"Error generating/saving metadata: {str(e)}")
 
-    def generate_blog_post(self, job: ContentJob, max_workers: int = 3) -> str:
-        """Generate complete blog post in Markdown format with parallel processing."""
+    def generate_blog_post(
+        self,
+        job: ContentJob,
+        max_workers: int = 3,
+        progress: Optional[Callable[..., None]] = None
+    ) -> str:
+        """
+        Generate complete blog post in Markdown format.
+        
+        The work runs as a stage graph: introduction, every section and the conclusion
+        start at once, and images for each part start as soon as that part (and the
+        parts before it, which fix its heading numbers) are done. The critical path is
+        roughly the slowest section plus its images rather than the sum of all stages.
+        
+        Args:
+            job: The job to write.
+            max_workers: Concurrent section generations.
+            progress: Called as progress("sections", completed=N, total=M) each time a
+                part is written, and progress("images", ...) each time a part has its images.
+        """
         try:
             logger.info(f"Generating Markdown blog post for job {job.id}: {job.title}")
-            start_time = time.time()
             
             # Parse the outline
             chapters = self.parse_outline(job.Outline)
             logger.info(f"Parsed {len(chapters)} sections from outline (excluding intro/conclusion)")
             
-            # Start with content - NO H1 title as WordPress uses post title as H1
-            content = ""  # Remove H1 title generation
-            
             # Get SEO-enhanced prompts
             seo_prompts = self.seo_enhancer.get_enhanced_prompts(job)
             
-            # Generate introduction
-            logger.info("🚀 Generating introduction...")
-            intro_start = time.time()
-            introduction = self.openai_client.generate_text(seo_prompts['introduction'])
-            
-            # Enhance introduction for readability
-            introduction = self.seo_enhancer.enhance_content_readability(introduction)
-            content += self.clean_markdown(introduction) + "\n\n"
-            intro_time = time.time() - intro_start
-            logger.info(f"✅ Introduction generated in {intro_time:.2f} seconds")
-            
-            # Generate main content sections in parallel
-            logger.info(f"🚀 Generating {len(chapters)} sections in parallel...")
-            sections_start = time.time()
-            section_contents = self.generate_sections_parallel(chapters, job, max_workers)
-            sections_time = time.time() - sections_start
-            logger.info(f"✅ All sections generated in {sections_time:.2f} seconds")
-            
-            # Combine all sections
-            for section_content in section_contents:
-                content += section_content + "\n\n"
-            
-            # Generate conclusion
-            logger.info("🚀 Generating conclusion...")
-            conclusion_start = time.time()
-            conclusion = self.openai_client.generate_text(seo_prompts['conclusion'])
-            
-            # Enhance conclusion for readability
-            conclusion = self.seo_enhancer.enhance_content_readability(conclusion)
-            content += "## Conclusion\n\n" + self.clean_markdown(conclusion) + "\n\n"
-            conclusion_time = time.time() - conclusion_start
-            logger.info(f"✅ Conclusion generated in {conclusion_time:.2f} seconds")
-            
-            # Add images to content
-            logger.info("🖼️ Adding images to content...")
-            image_start = time.time()
-            content = self.add_images_to_markdown(content, job)
-            image_time = time.time() - image_start
-            logger.info(f"✅ Images added in {image_time:.2f} seconds")
+            # Look up credentials once; the DB session is not shared with worker threads
+            wp_creds = self.get_wordpress_credentials(job)
+            if not wp_creds:
+                logger.error("WordPress credentials not found, cannot upload images")
+            
+            def generate_introduction() -> str:
+                introduction = self.openai_client.generate_text(seo_prompts['introduction'])
+                # Enhance introduction for readability
+                introduction = self.seo_enhancer.enhance_content_readability(introduction)
+                # NO H1 title as WordPress uses post title as H1
+                return self.clean_markdown(introduction)
+            
+            def generate_section(index: int, chapter: Dict) -> str:
+                _, section_content = self.generate_section_content_threaded(chapter, job, index)
+                return section_content
+            
+            def generate_conclusion() -> str:
+                conclusion = self.openai_client.generate_text(seo_prompts['conclusion'])
+                # Enhance conclusion for readability
+                conclusion = self.seo_enhancer.enhance_content_readability(conclusion)
+                return "## Conclusion\n\n" + self.clean_markdown(conclusion)
+            
+            def add_images(*parts: str) -> str:
+                # The last part gets images; the earlier ones only fix its heading numbers
+                if not wp_creds:
+                    return parts[-1]
+                heading_offset = sum(self.count_headings(part) for part in parts[:-1])
+                return self.add_images_to_markdown(parts[-1], job, heading_offset, wp_creds)
+            
+            executor = StageExecutor(pools={"llm": max_workers + 2, "images": self.image_workers})
+            
+            part_stages = ["introduction"]
+            executor.add_stage("introduction", generate_introduction, pool="llm")
+            for i, chapter in enumerate(chapters):
+                name = f"section_{i + 1}"
+                executor.add_stage(name, lambda i=i, chapter=chapter: generate_section(i, chapter), pool="llm")
+                part_stages.append(name)
+            executor.add_stage("conclusion", generate_conclusion, pool="llm")
+            part_stages.append("conclusion")
+            
+            for i, name in enumerate(part_stages):
+                executor.add_stage(f"images_{name}", add_images, deps=part_stages[:i + 1], pool="images")
+            
+            completed = {"sections": 0, "images": 0}
+            
+            def stage_done(name: str, result: str) -> None:
+                kind = "images" if name.startswith("images_") else "sections"
+                completed[kind] += 1
+                if progress:
+                    progress(kind, completed=completed[kind], total=len(part_stages))
+            
+            logger.info(f"🚀 Generating introduction, {len(chapters)} sections and conclusion concurrently...")
+            results = executor.run(on_stage_done=stage_done)
+            
+            content = "".join(results[f"images_{name}"] + "\n\n" for name in part_stages)
             
             # Save locally
             local_path = self.save_markdown_locally(content, job)
@@ -656,10 +801,12 @@ Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
                 logger.info("📝 Generating and saving metadata...")
                 self.generate_and_save_metadata(content, job, local_path)
             
-            total_time = time.time() - start_time
+            self.stage_timings = {name: timing.duration for name, timing in executor.timings.items()}
+            
             logger.info(f"✅ Successfully generated Markdown blog post for job {job.id}")
-            logger.info(f"⏱️ Total generation time: {total_time:.2f} seconds")
-            logger.info(f"📊 Time breakdown - Intro: {intro_time:.1f}s, Sections: {sections_time:.1f}s, Conclusion: {conclusion_time:.1f}s, Images: {image_time:.1f}s")
+            logger.info(f"⏱️ Total generation time: {executor.total_time:.2f} seconds")
+            logger.info(f"📊 Stage timings:\n{executor.timing_summary()}")
+            logger.info(f"🧭 Critical path: {' → '.join(executor.critical_path())}")
             
             return content
             
@@ -703,50 +850,17 @@ Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
             raise Exception(f"Error posting to WordPress: {str(e)}")
     
     def markdown_to_html(self, markdown_content: str) -> str:
-        """Convert Markdown to HTML for WordPress."""
-        try:
-            # Simple Markdown to HTML conversion
-            html = markdown_content
-            
-            # Convert headers
-            html = re.sub(r'^# (.+)$', r'<h1>\1</h1>', html, flags=re.MULTILINE)
-            html = re.sub(r'^## (.+)$', r'<h2>\1</h2>', html, flags=re.MULTILINE)
-            html = re.sub(r'^### (.+)$', r'<h3>\1</h3>', html, flags=re.MULTILINE)
-            html = re.sub(r'^#### (.+)$', r'<h4>\1</h4>', html, flags=re.MULTILINE)
-            
-            # Convert lists
-            html = re.sub(r'^- (.+)$', r'<li>\1</li>', html, flags=re.MULTILINE)
-            html = re.sub(r'(<li>.*</li>)', r'<ul>\1</ul>', html, flags=re.DOTALL)
-            
-            # Convert paragraphs
-            paragraphs = html.split('\n\n')
-            html_paragraphs = []
-            
-            for para in paragraphs:
-                para = para.strip()
-                if para and not para.startswith('<'):
-                    html_paragraphs.append(f'<p>{para}</p>')
-                else:
-                    html_paragraphs.append(para)
-            
-            html = '\n\n'.join(html_paragraphs)
-            
-            # Convert images
-            html = re.sub(r'!\[([^\]]*)\]\(([^)]+)\)', r'<img src="\2" alt="\1" />', html)
-            
-            return html
-            
-        except Exception as e:
-            logger.error(f"Error converting Markdown to HTML: {str(e)}")
-            return markdown_content
+        """Convert Markdown to WordPress block markup."""
+        return render_markdown(markdown_content)
     
-    def parse_outline(self, outline_json: str) -> List[Dict]:
-        """Parse the outline JSON and return sections."""
+    def parse_outline(self, outline: Any) -> List[Dict]:
+        """Return the sections of a job's outline (a dict; JSON text is still accepted)."""
         try:
-            if not outline_json:
+            if not outline:
                 return []
             
-            outline = json.loads(outline_json)
+            if isinstance(outline, str):
+                outline = json.loads(outline)
             
             # Handle new format with 'sections'
             if 'sections' in outline:
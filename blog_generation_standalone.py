@@ -16,7 +16,6 @@ from datetime import datetime
 from typing import Dict, List, Optional, Any
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
-from requests.auth import HTTPBasicAuth
 import concurrent.futures
 import threading
 
@@ -25,7 +24,10 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from app.database import SessionLocal, engine
 from app.models import ContentJob, WordPressCredentials, User
+from app.llm_client import get_llm_client
+from app.wordpress_client import get_wordpress_client, get_client_for_credentials, seo_meta_fields
 from seo_content_enhancer import SEOContentEnhancer
+from markdown_renderer import render_markdown
 
 # Configure logging
 logging.basicConfig(
@@ -43,85 +45,58 @@ class BlogGenerationError(Exception):
     pass
 
 class OpenAIClient:
-    """OpenAI client for text generation."""
+    """OpenAI client for text generation backed by the shared pooled LLM client."""
     
     def __init__(self, api_key: str, model: str = "gpt-4"):
         self.api_key = api_key
         self.model = model
-        self.api_url = "https://api.openai.com/v1/chat/completions"
+        self.llm = get_llm_client()
         
-    def generate_text(self, prompt: str, temperature: float = 0.7, max_tokens: int = 2000) -> str:
-        """Generate text using OpenAI API."""
+    def generate_text(self, prompt: str, temperature: float = 0.7, max_tokens: int = 2000, use_cache: bool = True) -> str:
+        """Generate text using OpenAI API. Pass use_cache=False to bypass the LLM response cache."""
         try:
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-            
-            data = {
-                "model": self.model,
-                "messages": [{"role": "user", "content": prompt}],
-                "temperature": temperature,
-                "max_tokens": max_tokens
-            }
-            
-            response = requests.post(self.api_url, headers=headers, json=data)
-            
-            if response.status_code == 200:
-                result = response.json()
-                return result["choices"][0]["message"]["content"]
-            else:
-                logger.error(f"OpenAI API error: {response.status_code} - {response.text}")
-                raise BlogGenerationError(f"OpenAI API error: {response.status_code}")
+            return self.llm.complete(
+                "openai",
+                self.model,
+                prompt,
+                api_key=self.api_key,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                use_cache=use_cache
+            )
                 
         except Exception as e:
             logger.error(f"Error generating text with OpenAI: {str(e)}")
             raise BlogGenerationError(f"Error generating text: {str(e)}")
 
 class WordPressClient:
-    """WordPress client for posting content."""
+    """WordPress client for posting content, backed by the pooled per-site REST client."""
     
     def __init__(self, site_url: str, username: str, app_password: str):
         self.site_url = site_url.rstrip('/')
         self.username = username
         self.app_password = app_password
         self.api_url = f"{self.site_url}/wp-json/wp/v2"
+        self.wp = get_wordpress_client(site_url, username, app_password)
         
-    def post_content(self, title: str, content: str, status: str = "draft", meta_data: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Post content to WordPress with optional metadata."""
+    def post_content(self, title: str, content: str, status: str = "draft", meta_data: Dict[str, Any] = None,
+                     featured_media: Optional[int] = None) -> Dict[str, Any]:
+        """Post content to WordPress with SEO metadata and featured image in one write."""
         try:
-            # Prepare the post data
-            post_data = {
-                'title': title,
-                'content': content,
-                'status': status,
-                'format': 'standard'
-            }
+            wp_meta = seo_meta_fields(meta_data) if meta_data else None
             
-            # Add meta data if provided
-            if meta_data:
-                post_data['meta'] = meta_data
-            
-            # Make the request
-            response = requests.post(
-                f"{self.api_url}/posts",
-                json=post_data,
-                auth=HTTPBasicAuth(self.username, self.app_password),
-                headers={'Content-Type': 'application/json'}
+            result = self.wp.create_post(
+                title=title,
+                content=content,
+                status=status,
+                meta=wp_meta,
+                featured_media=featured_media
             )
             
-            if response.status_code in [200, 201]:
-                result = response.json()
-                logger.info(f"Successfully posted to WordPress. Post ID: {result.get('id')}")
-                
-                # If we have metadata, update the post with additional meta fields
-                if meta_data and result.get('id'):
-                    self.update_post_metadata(result['id'], meta_data)
-                
-                return result
-            else:
-                logger.error(f"WordPress API error: {response.status_code} - {response.text}")
-                raise BlogGenerationError(f"WordPress API error: {response.status_code}")
+            logger.info(f"Successfully posted to WordPress. Post ID: {result.get('id')}")
+            if wp_meta:
+                logger.info(f"Meta fields sent: {list(wp_meta.keys())}")
+            return result
                 
         except Exception as e:
             logger.error(f"Error posting to WordPress: {str(e)}")
@@ -130,58 +105,13 @@ class WordPressClient:
     def update_post_metadata(self, post_id: int, meta_data: Dict[str, Any]) -> bool:
         """Update post metadata using WordPress REST API."""
         try:
-            # Prepare metadata for WordPress
-            wp_meta = {}
-            
-            # Add meta description (for SEO plugins like Yoast, RankMath, etc.)
-            if 'meta_description' in meta_data:
-                wp_meta['_yoast_wpseo_metadesc'] = meta_data['meta_description']
-                wp_meta['_genesis_description'] = meta_data['meta_description']
-                wp_meta['_aioseop_description'] = meta_data['meta_description']
-                wp_meta['rank_math_description'] = meta_data['meta_description']
-                wp_meta['seo_meta_description'] = meta_data['meta_description']
-                
-            # Add readability score
-            if 'readability_score' in meta_data:
-                wp_meta['seo_readability_score'] = meta_data['readability_score']
-                wp_meta['flesch_reading_ease'] = meta_data['readability_score']
-                
-            # Add keyword information
-            if 'focus_keyword' in meta_data:
-                wp_meta['_yoast_wpseo_focuskw'] = meta_data['focus_keyword']
-                wp_meta['rank_math_focus_keyword'] = meta_data['focus_keyword']
-                wp_meta['seo_focus_keyword'] = meta_data['focus_keyword']
-                
-            # Add content analysis
-            if 'content_analysis' in meta_data:
-                wp_meta['seo_content_analysis'] = json.dumps(meta_data['content_analysis'])
-                
-            # Add external links count
-            if 'external_links_count' in meta_data:
-                wp_meta['seo_external_links_count'] = meta_data['external_links_count']
-                
-            # Add word count
-            if 'word_count' in meta_data:
-                wp_meta['seo_word_count'] = meta_data['word_count']
-                
+            wp_meta = seo_meta_fields(meta_data)
+            
             # Update the post with metadata
             if wp_meta:
-                update_data = {'meta': wp_meta}
-                
-                response = requests.post(
-                    f"{self.api_url}/posts/{post_id}",
-                    json=update_data,
-                    auth=HTTPBasicAuth(self.username, self.app_password),
-                    headers={'Content-Type': 'application/json'}
-                )
-                
-                if response.status_code in [200, 201]:
-                    logger.info(f"Successfully updated metadata for post ID: {post_id}")
-                    logger.info(f"Updated meta fields: {list(wp_meta.keys())}")
-                    return True
-                else:
-                    logger.warning(f"Failed to update metadata: {response.status_code} - {response.text}")
-                    return False
+                self.wp.update_post(post_id, meta=wp_meta)
+                logger.info(f"Successfully updated metadata for post ID: {post_id}")
+                logger.info(f"Updated meta fields: {list(wp_meta.keys())}")
                     
             return True
             
@@ -266,34 +196,13 @@ class ImageGenerator:
             return None
             
         try:
-            # WordPress media upload endpoint
-            upload_url = f"{wp_creds.siteUrl.rstrip('/')}/wp-json/wp/v2/media"
-            
-            # Prepare the file upload
-            files = {
-                'file': (filename, image_data, 'image/webp')
-            }
-            
-            headers = {
-                'Authorization': f'Basic {self._get_basic_auth(wp_creds.username, wp_creds.applicationPassword)}'
-            }
-            
-            response = requests.post(upload_url, files=files, headers=headers)
-            response.raise_for_status()
-            
-            result = response.json()
+            result = get_client_for_credentials(wp_creds).upload_media(image_data, filename)
             return result.get('source_url')
             
         except Exception as e:
             logger.error(f"Error uploading image to WordPress: {str(e)}")
             return None
     
-    def _get_basic_auth(self, username: str, password: str) -> str:
-        """Generate basic auth header."""
-        import base64
-        credentials = f"{username}:{password}"
-        return base64.b64encode(credentials.encode()).decode()
-    
     def insert_image_after_first_h2(self, html_content: str, image_url: str, alt_text: str) -> str:
         """Insert image after the first </h2> tag in the content."""
         if not image_url:
@@ -344,10 +253,11 @@ class BlogGenerator:
             logger.error(f"Error fetching approved jobs: {str(e)}")
             raise BlogGenerationError(f"Error fetching approved jobs: {str(e)}")
     
-    def parse_outline(self, outline_json: str) -> List[Dict[str, Any]]:
-        """Parse the outline JSON to extract sections."""
+    def parse_outline(self, outline: Any) -> List[Dict[str, Any]]:
+        """Extract sections from a job's outline (a dict; JSON text is still accepted)."""
         try:
-            outline = json.loads(outline_json)
+            if isinstance(outline, str):
+                outline = json.loads(outline)
             
             # Extract chapters/sections from the outline
             chapters = []
@@ -587,28 +497,7 @@ Write the content now:"""
         formatted_content = f'<!-- wp:heading {{"level":{heading_level}}} -->\n<{heading_tag}>{title}</{heading_tag}>\n<!-- /wp:heading -->\n\n'
         
         # Add the generated content
-        # Split content into paragraphs and wrap in paragraph blocks
-        paragraphs = content.split('\n\n')
-        for paragraph in paragraphs:
-            paragraph = paragraph.strip()
-            if paragraph:
-                # Check if it's a list
-                if paragraph.startswith('- ') or paragraph.startswith('* ') or paragraph.startswith('1. '):
-                    # Format as list block
-                    formatted_content += '<!-- wp:list -->\n<ul>\n'
-                    items = paragraph.split('\n')
-                    for item in items:
-                        item = item.strip()
-                        if item.startswith('- ') or item.startswith('* '):
-                            item = item[2:]  # Remove list marker
-                            formatted_content += f'<li>{item}</li>\n'
-                        elif item.startswith(('1. ', '2. ', '3. ')):
-                            item = item[3:]  # Remove numbered list marker
-                            formatted_content += f'<li>{item}</li>\n'
-                    formatted_content += '</ul>\n<!-- /wp:list -->\n\n'
-                else:
-                    # Format as paragraph block
-                    formatted_content += f'<!-- wp:paragraph -->\n<p>{paragraph}</p>\n<!-- /wp:paragraph -->\n\n'
+        formatted_content += render_markdown(content) + '\n\n'
         
         # Add separator
         formatted_content += '<!-- wp:separator -->\n<hr class="wp-block-separator"/>\n<!-- /wp:separator -->\n\n'
@@ -634,29 +523,12 @@ Write the content now:"""
         content_category = self.seo_enhancer.determine_content_category(job.title, job.mainKeyword)
         generated_content = self.seo_enhancer.add_external_links(generated_content, job.mainKeyword, content_category)
         
-        # Convert markdown to HTML and format as WordPress blocks
-        html_content = self.convert_markdown_to_html(generated_content)
-        
-        # Format as WordPress blocks
-        formatted_content = '<!-- wp:paragraph -->\n<p>' + html_content.replace('\n\n', '</p>\n<!-- /wp:paragraph -->\n\n<!-- wp:paragraph -->\n<p>') + '</p>\n<!-- /wp:paragraph -->\n\n'
-        
-        return formatted_content
+        # Convert markdown to WordPress blocks
+        return self.convert_markdown_to_html(generated_content) + '\n\n'
     
     def convert_markdown_to_html(self, markdown_content: str) -> str:
-        """Convert basic markdown to HTML."""
-        # Convert basic markdown formatting
-        content = markdown_content
-        
-        # Bold text
-        content = re.sub(r'\*\*(.*?)\*\*', r'<strong>\1</strong>', content)
-        
-        # Italic text
-        content = re.sub(r'\*(.*?)\*', r'<em>\1</em>', content)
-        
-        # Links
-        content = re.sub(r'\[([^\]]+)\]\(([^)]+)\)', r'<a href="\2">\1</a>', content)
-        
-        return content
+        """Convert Markdown to WordPress block markup."""
+        return render_markdown(markdown_content)
     
     def generate_conclusion(self, job: ContentJob) -> str:
         """Generate conclusion section."""
@@ -677,12 +549,9 @@ Write the content now:"""
         content_category = self.seo_enhancer.determine_content_category(job.title, job.mainKeyword)
         generated_content = self.seo_enhancer.add_external_links(generated_content, job.mainKeyword, content_category)
         
-        # Convert markdown to HTML
-        html_content = self.convert_markdown_to_html(generated_content)
-        
         # Format as WordPress blocks
         formatted_content = '<!-- wp:heading {"level":2} -->\n<h2>Conclusion</h2>\n<!-- /wp:heading -->\n\n'
-        formatted_content += '<!-- wp:paragraph -->\n<p>' + html_content.replace('\n\n', '</p>\n<!-- /wp:paragraph -->\n\n<!-- wp:paragraph -->\n<p>') + '</p>\n<!-- /wp:paragraph -->\n\n'
+        formatted_content += self.convert_markdown_to_html(generated_content) + '\n\n'
         
         return formatted_content
     
@@ -965,6 +834,7 @@ Write 5-7 FAQs now:"""
                     continue
             
             logger.info(f"Blog generation completed. Successfully processed {success_count}/{len(jobs)} jobs")
+            logger.info(f"LLM cache: {get_llm_client().cache_stats()}")
             
         except Exception as e:
             logger.error(f"Error in blog generation process: {str(e)}")
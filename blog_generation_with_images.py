@@ -11,7 +11,6 @@ import time
 import logging
 import requests
 import re
-import base64
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 from urllib.parse import urljoin
@@ -25,6 +24,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.database import SessionLocal, engine
 from app.models import ContentJob, WordPressCredentials, User
+from app.wordpress_client import get_client_for_credentials
 from blog_generation_standalone import BlogGenerator as BaseGenerator, OpenAIClient, WordPressClient
 from seo_content_enhancer import SEOContentEnhancer
 
@@ -149,27 +149,7 @@ class ImageGenerator:
     def upload_image_to_wordpress(self, image_data: bytes, filename: str, wp_creds) -> Optional[str]:
         """Upload image to WordPress and return the URL."""
         try:
-            # WordPress media upload endpoint
-            upload_url = f"{wp_creds.siteUrl.rstrip('/')}/wp-json/wp/v2/media"
-            
-            # Prepare the file upload
-            files = {
-                'file': (filename, image_data, 'image/webp' if filename.endswith('.webp') else 'image/jpeg')
-            }
-            
-            # Create basic auth header
-            credentials = f"{wp_creds.username}:{wp_creds.applicationPassword}"
-            auth_header = base64.b64encode(credentials.encode()).decode()
-            
-            headers = {
-                'Authorization': f'Basic {auth_header}'
-            }
-            
-            response = requests.post(upload_url, files=files, headers=headers)
-            response.raise_for_status()
-            
-            result = response.json()
-            logger.info(f"Successfully uploaded image to WordPress: {result.get('source_url')}")
+            result = get_client_for_credentials(wp_creds).upload_media(image_data, filename)
             return result.get('source_url')
             
         except Exception as e:
@@ -198,27 +178,8 @@ class ImageGenerator:
     def set_featured_image_for_wordpress(self, post_id: int, image_data: bytes, filename: str, wp_creds) -> bool:
         """Upload and set an image as the featured image for a WordPress post."""
         try:
-            # First upload the image to WordPress media library
-            upload_url = f"{wp_creds.siteUrl.rstrip('/')}/wp-json/wp/v2/media"
-            
-            # Prepare the file upload
-            files = {
-                'file': (filename, image_data, 'image/webp' if filename.endswith('.webp') else 'image/jpeg')
-            }
-            
-            # Create basic auth header
-            credentials = f"{wp_creds.username}:{wp_creds.applicationPassword}"
-            auth_header = base64.b64encode(credentials.encode()).decode()
-            
-            headers = {
-                'Authorization': f'Basic {auth_header}'
-            }
-            
-            # Upload the image
-            response = requests.post(upload_url, files=files, headers=headers)
-            response.raise_for_status()
-            
-            result = response.json()
+            wp = get_client_for_credentials(wp_creds)
+            result = wp.upload_media(image_data, filename)
             image_id = result.get('id')
             
             if not image_id:
@@ -226,19 +187,7 @@ class ImageGenerator:
                 return False
                 
             # Now set this image as the featured image for the post
-            update_url = f"{wp_creds.siteUrl.rstrip('/')}/wp-json/wp/v2/posts/{post_id}"
-            
-            update_data = {
-                'featured_media': image_id
-            }
-            
-            update_response = requests.post(
-                update_url,
-                json=update_data,
-                headers=headers
-            )
-            
-            update_response.raise_for_status()
+            wp.update_post(post_id, featured_media=image_id)
             
             logger.info(f"Successfully set featured image (ID: {image_id}) for post ID: {post_id}")
             return True
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Single-pass Markdown → WordPress block renderer.
+
+Shared by MarkdownToHTMLConverter, MarkdownBlogGenerator and the standalone
+BlogGenerator. The document is read line by line once: each line is classified with
+one precompiled pattern (heading, list item, image, fence, rule, quote, HTML, blank
+or text), consecutive lines are grouped into blocks, and the text of each block gets one
+pass of a precompiled inline pattern (images, links, code, bold, italic). Output is
+Gutenberg block markup, so posts open in the block editor as native blocks.
+
+Supported Markdown is what the generators produce: YAML front matter (dropped),
+headings (H1 is dropped, WordPress renders the post title as H1), paragraphs,
+unordered and ordered lists, images, links, bold, italic, inline code, fenced code,
+block quotes and horizontal rules. Block-level HTML written by the model is kept as
+it is in an HTML block.
+
+Usage:
+    from markdown_renderer import render_markdown
+    blocks = render_markdown(markdown_text)
+"""
+
+import re
+from html import escape
+from typing import List, Optional, Tuple
+
+# One pattern classifies a line; exactly one named group matches
+BLOCK_PATTERN = re.compile(
+    r'(?P<blank>\s*$)'
+    r'|(?P<fence>\s*(?:```|~~~))'
+    r'|#(?P<hashes>#{0,5})\s+(?P<heading>.*?)(?:\s+#+)?\s*$'
+    r'|(?P<rule>\s*(?:-\s*){3,}$|\s*(?:\*\s*){3,}$|\s*(?:_\s*){3,}$)'
+    r'|\s*[-*+]\s+(?P<ul>.*)'
+    r'|\s*\d+[.)]\s+(?P<ol>.*)'
+    r'|\s*!\[(?P<image_alt>[^\]]*)\]\((?P<image_src>[^)\s]+)(?:\s+"[^"]*")?\)\s*$'
+    r'|\s*>\s?(?P<quote>.*)'
+    r'|(?P<html>\s*</?(?:h[1-6]|p|div|ul|ol|li|table|figure|blockquote|pre|section|hr|img)\b.*)'
+)
+
+INLINE_PATTERN = re.compile(
+    r'!\[(?P<img_alt>[^\]]*)\]\((?P<img_src>[^)\s]+)(?:\s+"[^"]*")?\)'
+    r'|\[(?P<link_text>[^\]]+)\]\((?P<link_href>[^)\s]+)(?:\s+"[^"]*")?\)'
+    r'|`(?P<code>[^`]+)`'
+    r'|\*\*(?P<strong>.+?)\*\*'
+    r'|\*(?P<em>[^*\s](?:[^*]*?[^*\s])?)\*'
+)
+
+FRONT_MATTER_PATTERN = re.compile(r'\A---\n.*?\n---\n', re.DOTALL)
+
+
+def _attr(value: str) -> str:
+    return escape(value, quote=True)
+
+
+def render_inline(text: str) -> str:
+    """Render the inline Markdown of one block's text in a single pass."""
+    return INLINE_PATTERN.sub(_render_inline_match, text)
+
+
+def _render_inline_match(match: "re.Match[str]") -> str:
+    kind = match.lastgroup
+    if kind == 'img_src':
+        return f'<img src="{_attr(match.group("img_src"))}" alt="{_attr(match.group("img_alt"))}"/>'
+    if kind in ('link_href', 'link_text'):
+        return f'<a href="{_attr(match.group("link_href"))}">{render_inline(match.group("link_text"))}</a>'
+    if kind == 'code':
+        return f'<code>{escape(match.group("code"), quote=False)}</code>'
+    if kind == 'strong':
+        return f'<strong>{render_inline(match.group("strong"))}</strong>'
+    return f'<em>{render_inline(match.group("em"))}</em>'
+
+
+def _paragraph(lines: List[str]) -> str:
+    return f'<!-- wp:paragraph -->\n<p>{render_inline(chr(10).join(lines))}</p>\n<!-- /wp:paragraph -->'
+
+
+def _list(kind: str, items: List[str]) -> str:
+    tag, attrs = ('ol', ' {"ordered":true}') if kind == 'ol' else ('ul', '')
+    body = '\n'.join(f'<li>{render_inline(item)}</li>' for item in items)
+    return f'<!-- wp:list{attrs} -->\n<{tag}>\n{body}\n</{tag}>\n<!-- /wp:list -->'
+
+
+def _quote(lines: List[str]) -> str:
+    return f'<!-- wp:quote -->\n<blockquote class="wp-block-quote"><p>{render_inline(chr(10).join(lines))}</p></blockquote>\n<!-- /wp:quote -->'
+
+
+def _heading(level: int, text: str) -> str:
+    return f'<!-- wp:heading {{"level":{level}}} -->\n<h{level}>{render_inline(text)}</h{level}>\n<!-- /wp:heading -->'
+
+
+def _image(src: str, alt: str) -> str:
+    return f'<!-- wp:image -->\n<figure class="wp-block-image"><img src="{_attr(src)}" alt="{_attr(alt)}"/></figure>\n<!-- /wp:image -->'
+
+
+def _code(lines: List[str]) -> str:
+    return f'<!-- wp:code -->\n<pre class="wp-block-code"><code>{escape(chr(10).join(lines), quote=False)}</code></pre>\n<!-- /wp:code -->'
+
+
+def _html(lines: List[str]) -> str:
+    return '<!-- wp:html -->\n' + '\n'.join(lines) + '\n<!-- /wp:html -->'
+
+
+SEPARATOR_BLOCK = '<!-- wp:separator -->\n<hr class="wp-block-separator"/>\n<!-- /wp:separator -->'
+
+
+def render_markdown(markdown_content: str) -> str:
+    """
+    Render Markdown as WordPress block markup.
+
+    Args:
+        markdown_content: Markdown text, optionally starting with YAML front matter.
+
+    Returns:
+        Block markup, blocks separated by a blank line.
+    """
+    text = FRONT_MATTER_PATTERN.sub('', markdown_content.replace('\r\n', '\n'), count=1)
+
+    blocks: List[str] = []
+    # The block being collected: (kind, lines) for paragraphs, lists, quotes and HTML
+    pending: Optional[Tuple[str, List[str]]] = None
+    code_lines: Optional[List[str]] = None
+
+    def flush() -> None:
+        nonlocal pending
+        if pending is None:
+            return
+        kind, lines = pending
+        if kind == 'p':
+            blocks.append(_paragraph(lines))
+        elif kind == 'html':
+            blocks.append(_html(lines))
+        elif kind == 'quote':
+            blocks.append(_quote(lines))
+        else:
+            blocks.append(_list(kind, lines))
+        pending = None
+
+    for line in text.split('\n'):
+        if code_lines is not None:
+            if line.lstrip().startswith(('```', '~~~')):
+                blocks.append(_code(code_lines))
+                code_lines = None
+            else:
+                code_lines.append(line)
+            continue
+
+        match = BLOCK_PATTERN.match(line)
+        kind = match.lastgroup if match else None
+
+        if kind == 'blank':
+            flush()
+        elif kind == 'fence':
+            flush()
+            code_lines = []
+        elif kind in ('heading', 'hashes'):
+            flush()
+            level = len(match.group('hashes')) + 1
+            if level > 1:
+                blocks.append(_heading(level, match.group('heading')))
+        elif kind == 'rule':
+            # "---" directly under text is a setext heading underline in Markdown;
+            # the generators never write those, so it is treated as a rule
+            flush()
+            blocks.append(SEPARATOR_BLOCK)
+        elif kind in ('ul', 'ol'):
+            if pending is None or pending[0] != kind:
+                flush()
+                pending = (kind, [])
+            pending[1].append(match.group(kind))
+        elif kind in ('image_src', 'image_alt'):
+            flush()
+            blocks.append(_image(match.group('image_src'), match.group('image_alt')))
+        elif kind == 'quote':
+            if pending is None or pending[0] != 'quote':
+                flush()
+                pending = ('quote', [])
+            pending[1].append(match.group('quote'))
+        elif kind == 'html' or (pending is not None and pending[0] == 'html'):
+            # HTML written by the model is passed through as it is, up to the next blank line
+            if pending is None or pending[0] != 'html':
+                flush()
+                pending = ('html', [])
+            pending[1].append(line.rstrip())
+        else:
+            stripped = line.strip()
+            if pending is not None and pending[0] in ('ul', 'ol') and line[:1].isspace():
+                # Indented continuation of the last list item
+                pending[1][-1] += ' ' + stripped
+            else:
+                if pending is None or pending[0] != 'p':
+                    flush()
+                    pending = ('p', [])
+                pending[1].append(stripped)
+
+    if code_lines is not None:
+        # Unclosed fence: keep what was written
+        blocks.append(_code(code_lines))
+    flush()
+
+    return '\n\n'.join(blocks)
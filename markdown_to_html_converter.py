@@ -2,100 +2,44 @@
 """
 Markdown to HTML Converter
 Converts the generated markdown files to clean HTML blocks for WordPress posting.
+
+Batch mode converts every .md file under one or more input roots into an output root,
+mirroring the directory layout. Files are converted in a process pool, and a manifest
+in the output root records each source's mtime, size and content hash, so unchanged
+files are skipped on the next run. The manifest also records a fingerprint of the
+renderer and page template; changing either reconverts everything. Entries of other
+input roots converted into the same output root are kept. Several input roots must
+have different names, since each gets the output subdirectory of its name.
+
+Usage:
+    python markdown_to_html_converter.py                       # generated_content → generated_content/html
+    python markdown_to_html_converter.py archive/2024 archive/2025 -o html --workers 8
+    python markdown_to_html_converter.py --force                # ignore the manifest
+
+Configuration (environment variables):
+    MARKDOWN_CONTENT_DIR    Default input root (default: generated_content)
+    MARKDOWN_HTML_DIR       Default output root (default: generated_content/html)
 """
 
-import re
 import os
+import sys
 import json
+import hashlib
+import argparse
 from datetime import datetime
-from typing import Dict, List, Optional
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
 
-class MarkdownToHTMLConverter:
-    """Convert Markdown content to WordPress-ready HTML."""
-    
-    def __init__(self):
-        self.content_dir = "/Users/aditya/Desktop/backend/generated_content"
-        self.html_dir = "/Users/aditya/Desktop/backend/generated_content/html"
-        
-        # Create HTML directory if it doesn't exist
-        os.makedirs(self.html_dir, exist_ok=True)
-    
-    def convert_markdown_to_html(self, markdown_content: str) -> str:
-        """Convert Markdown content to clean HTML."""
-        html = markdown_content
-        
-        # Remove metadata (YAML front matter)
-        html = re.sub(r'^---\n.*?\n---\n', '', html, flags=re.DOTALL)
-        
-        # Convert headers - SKIP H1 as WordPress uses post title as H1
-        # html = re.sub(r'^# (.+)$', r'<h1>\1</h1>', html, flags=re.MULTILINE)  # REMOVED H1 conversion
-        html = re.sub(r'^## (.+)$', r'<h2>\1</h2>', html, flags=re.MULTILINE)
-        html = re.sub(r'^### (.+)$', r'<h3>\1</h3>', html, flags=re.MULTILINE)
-        html = re.sub(r'^#### (.+)$', r'<h4>\1</h4>', html, flags=re.MULTILINE)
-        html = re.sub(r'^##### (.+)$', r'<h5>\1</h5>', html, flags=re.MULTILINE)
-        html = re.sub(r'^###### (.+)$', r'<h6>\1</h6>', html, flags=re.MULTILINE)
-        
-        # Remove any standalone H1 lines that might exist
-        html = re.sub(r'^# .+$\n?', '', html, flags=re.MULTILINE)
-        
-        # Convert bold and italic
-        html = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', html)
-        html = re.sub(r'\*(.+?)\*', r'<em>\1</em>', html)
-        
-        # Convert images with better formatting
-        html = re.sub(r'!\[([^\]]*)\]\(([^)]+)\)', r'<img src="\2" alt="\1" class="wp-image-responsive" style="max-width: 100%; height: auto; margin: 20px 0;" />', html)
-        
-        # Convert unordered lists
-        html = re.sub(r'^\s*[-\*\+]\s+(.+)$', r'<li>\1</li>', html, flags=re.MULTILINE)
-        
-        # Wrap consecutive list items in <ul> tags
-        html = re.sub(r'(<li>.*?</li>)(?:\s*\n\s*<li>.*?</li>)*', self._wrap_in_ul, html, flags=re.DOTALL)
-        
-        # Convert ordered lists
-        html = re.sub(r'^\s*\d+\.\s+(.+)$', r'<li>\1</li>', html, flags=re.MULTILINE)
-        
-        # Convert paragraphs
-        paragraphs = html.split('\n\n')
-        html_paragraphs = []
-        
-        for para in paragraphs:
-            para = para.strip()
-            if para:
-                # Skip if it's already an HTML tag
-                if not para.startswith('<'):
-                    html_paragraphs.append(f'<p>{para}</p>')
-                else:
-                    html_paragraphs.append(para)
-        
-        html = '\n\n'.join(html_paragraphs)
-        
-        # Clean up extra whitespace
-        html = re.sub(r'\n\s*\n\s*\n', '\n\n', html)
-        
-        return html.strip()
-    
-    def _wrap_in_ul(self, match):
-        """Wrap consecutive list items in <ul> tags."""
-        list_content = match.group(0)
-        return f'<ul>\n{list_content}\n</ul>'
-    
-    def convert_file(self, markdown_file: str) -> str:
-        """Convert a markdown file to HTML and save it."""
-        try:
-            # Read markdown file
-            with open(markdown_file, 'r', encoding='utf-8') as f:
-                markdown_content = f.read()
-            
-            # Convert to HTML
-            html_content = self.convert_markdown_to_html(markdown_content)
-            
-            # Create HTML filename
-            base_name = os.path.splitext(os.path.basename(markdown_file))[0]
-            html_filename = f"{base_name}.html"
-            html_filepath = os.path.join(self.html_dir, html_filename)
-            
-            # Add some basic HTML structure
-            full_html = f"""<!DOCTYPE html>
+import markdown_renderer
+from markdown_renderer import render_markdown
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+MARKDOWN_CONTENT_DIR = os.getenv("MARKDOWN_CONTENT_DIR", os.path.join(PROJECT_ROOT, "generated_content"))
+MARKDOWN_HTML_DIR = os.getenv("MARKDOWN_HTML_DIR", os.path.join(MARKDOWN_CONTENT_DIR, "html"))
+
+MANIFEST_NAME = ".conversion_manifest.json"
+
+HTML_TEMPLATE = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -131,43 +75,259 @@ class MarkdownToHTMLConverter:
 {html_content}
 </body>
 </html>"""
-            
+
+
+def template_fingerprint() -> str:
+    """Changes whenever the page template or the renderer source changes."""
+    digest = hashlib.sha256(HTML_TEMPLATE.encode("utf-8"))
+    with open(markdown_renderer.__file__, "rb") as f:
+        digest.update(f.read())
+    return digest.hexdigest()
+
+
+def render_page(markdown_content: str) -> str:
+    """Render Markdown into the standalone HTML page written by the converter."""
+    return HTML_TEMPLATE.format(html_content=render_markdown(markdown_content))
+
+
+def _write_atomic(path: str, data: str) -> None:
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _convert_source(task: Tuple[str, str, Optional[str]]) -> Tuple[Optional[str], bool, Optional[str]]:
+    """
+    Convert one file in a pool worker.
+
+    Args:
+        task: (source path, output path, content hash recorded in the manifest or None).
+
+    Returns:
+        (content hash, whether the output was written, error). The output is not
+        rewritten when the content hash still matches the manifest (only the mtime changed).
+    """
+    source, output, known_hash = task
+    try:
+        with open(source, 'rb') as f:
+            data = f.read()
+        content_hash = hashlib.sha256(data).hexdigest()
+        if content_hash == known_hash and os.path.exists(output):
+            return content_hash, False, None
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+        _write_atomic(output, render_page(data.decode('utf-8')))
+        return content_hash, True, None
+    except Exception as e:
+        return None, False, str(e)
+
+
+class BatchResult:
+    """Counts from one batch conversion run."""
+    converted: int
+    unchanged: int
+    failed: Dict[str, str]
+
+    def __init__(self):
+        self.converted = 0
+        self.unchanged = 0
+        self.failed = {}
+
+
+class MarkdownToHTMLConverter:
+    """Convert Markdown content to WordPress-ready HTML."""
+
+    def __init__(self, content_dir: str = MARKDOWN_CONTENT_DIR, html_dir: str = MARKDOWN_HTML_DIR):
+        self.content_dir = content_dir
+        self.html_dir = html_dir
+
+        # Create HTML directory if it doesn't exist
+        os.makedirs(self.html_dir, exist_ok=True)
+
+    def convert_markdown_to_html(self, markdown_content: str) -> str:
+        """Convert Markdown content to WordPress block markup (front matter and H1 are dropped)."""
+        return render_markdown(markdown_content)
+
+    def convert_file(self, markdown_file: str) -> str:
+        """Convert a markdown file to HTML and save it."""
+        try:
+            # Read markdown file
+            with open(markdown_file, 'r', encoding='utf-8') as f:
+                markdown_content = f.read()
+
+            # Create HTML filename
+            base_name = os.path.splitext(os.path.basename(markdown_file))[0]
+            html_filename = f"{base_name}.html"
+            html_filepath = os.path.join(self.html_dir, html_filename)
+
             # Save HTML file
-            with open(html_filepath, 'w', encoding='utf-8') as f:
-                f.write(full_html)
-            
+            _write_atomic(html_filepath, render_page(markdown_content))
+
             print(f"✅ Converted to HTML: {html_filepath}")
             return html_filepath
-            
+
         except Exception as e:
             print(f"❌ Error converting {markdown_file}: {str(e)}")
             return None
-    
+
+    def find_markdown_files(self, roots: List[str]) -> List[Tuple[str, str]]:
+        """
+        Find .md files under the input roots.
+
+        Returns:
+            (source path, output path) pairs. With several roots, each root's files go
+            to a subdirectory of the output root named after the root.
+
+        Raises:
+            ValueError: If several roots share a name and would write to the same subdirectory.
+        """
+        html_dir = os.path.abspath(self.html_dir)
+        roots = list(dict.fromkeys(os.path.abspath(root) for root in roots))
+        if len(roots) > 1:
+            by_name: Dict[str, List[str]] = {}
+            for root in roots:
+                by_name.setdefault(os.path.basename(root), []).append(root)
+            clashes = [paths for paths in by_name.values() if len(paths) > 1]
+            if clashes:
+                raise ValueError(
+                    "Input roots with the same name would overwrite each other's output: "
+                    + "; ".join(", ".join(paths) for paths in clashes)
+                )
+
+        pairs = []
+        for root in roots:
+            output_root = html_dir if len(roots) == 1 else os.path.join(html_dir, os.path.basename(root))
+            for dirpath, dirnames, filenames in os.walk(root):
+                # Never descend into the output root (it defaults to a subdirectory of the input)
+                dirnames[:] = sorted(
+                    d for d in dirnames
+                    if not d.startswith('.') and os.path.join(dirpath, d) != html_dir
+                )
+                for filename in sorted(filenames):
+                    if filename.endswith('.md'):
+                        source = os.path.join(dirpath, filename)
+                        relative = os.path.splitext(os.path.relpath(source, root))[0] + '.html'
+                        pairs.append((source, os.path.join(output_root, relative)))
+        return pairs
+
+    def _load_manifest(self, path: str, fingerprint: str) -> Dict[str, Dict]:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if manifest.get("fingerprint") != fingerprint:
+            # Template or renderer changed: every file has to be reconverted
+            return {}
+        return manifest.get("files", {})
+
+    def convert_batch(self, roots: Optional[List[str]] = None, workers: Optional[int] = None, force: bool = False) -> BatchResult:
+        """
+        Convert every .md file under the input roots, skipping unchanged ones.
+
+        Args:
+            roots: Input directories (default: the converter's content_dir).
+            workers: Worker processes (default: CPU count).
+            force: Reconvert every file regardless of the manifest.
+
+        Returns:
+            Counts of converted, unchanged and failed files.
+        """
+        roots = roots or [self.content_dir]
+        manifest_path = os.path.join(self.html_dir, MANIFEST_NAME)
+        fingerprint = template_fingerprint()
+        recorded = self._load_manifest(manifest_path, fingerprint)
+        known = {} if force else recorded
+        pairs = self.find_markdown_files(roots)
+
+        result = BatchResult()
+        # Keep the entries of other roots converted into the same output, so converting
+        # root A and then root B does not make the next run of A reconvert everything
+        root_prefixes = tuple(os.path.join(os.path.abspath(root), '') for root in roots)
+        files: Dict[str, Dict] = {
+            source: entry for source, entry in recorded.items()
+            if not source.startswith(root_prefixes) and os.path.exists(source)
+        }
+        tasks = []
+        for source, output in pairs:
+            stat = os.stat(source)
+            entry = known.get(source)
+            if (
+                entry
+                and entry.get("mtime_ns") == stat.st_mtime_ns
+                and entry.get("size") == stat.st_size
+                and entry.get("output") == output
+                and os.path.exists(output)
+            ):
+                files[source] = entry
+                result.unchanged += 1
+                continue
+            known_hash = entry.get("sha256") if entry and entry.get("output") == output else None
+            files[source] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "output": output}
+            tasks.append((source, output, known_hash))
+
+        if tasks:
+            workers = workers or os.cpu_count() or 1
+            print(f"Converting {len(tasks)} files with {workers} workers ({result.unchanged} unchanged)...")
+            if workers == 1 or len(tasks) == 1:
+                outcomes = map(_convert_source, tasks)
+                self._collect(outcomes, tasks, files, result)
+            else:
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    outcomes = executor.map(_convert_source, tasks, chunksize=max(1, len(tasks) // (workers * 4)))
+                    self._collect(outcomes, tasks, files, result)
+
+        _write_atomic(manifest_path, json.dumps({
+            "fingerprint": fingerprint,
+            "updated_at": datetime.now().isoformat(),
+            "files": files,
+        }, indent=2))
+        return result
+
+    @staticmethod
+    def _collect(outcomes, tasks, files: Dict[str, Dict], result: BatchResult) -> None:
+        for (source, _, _), (content_hash, written, error) in zip(tasks, outcomes):
+            if error:
+                # Left out of the manifest so the next run retries it
+                del files[source]
+                result.failed[source] = error
+                print(f"❌ Error converting {source}: {error}")
+                continue
+            files[source]["sha256"] = content_hash
+            if written:
+                result.converted += 1
+            else:
+                result.unchanged += 1
+
     def convert_all_markdown_files(self):
         """Convert all markdown files in the content directory."""
         try:
-            markdown_files = [f for f in os.listdir(self.content_dir) if f.endswith('.md')]
-            
-            if not markdown_files:
-                print("No markdown files found to convert.")
-                return
-            
-            print(f"Found {len(markdown_files)} markdown files to convert:")
-            
-            for md_file in markdown_files:
-                md_path = os.path.join(self.content_dir, md_file)
-                print(f"Converting: {md_file}")
-                self.convert_file(md_path)
-            
-            print(f"\n✅ All files converted to HTML in: {self.html_dir}")
-            
+            result = self.convert_batch()
+            print(f"\n✅ {result.converted} converted, {result.unchanged} unchanged, {len(result.failed)} failed. HTML in: {self.html_dir}")
+
         except Exception as e:
             print(f"❌ Error converting files: {str(e)}")
 
-def main():
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Convert Markdown files to WordPress-ready HTML")
+    parser.add_argument("roots", nargs="*", help=f"Input directories (default: {MARKDOWN_CONTENT_DIR})")
+    parser.add_argument("-o", "--output", default=MARKDOWN_HTML_DIR, help=f"Output directory (default: {MARKDOWN_HTML_DIR})")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="Reconvert every file, ignoring the manifest")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None):
     """Main entry point."""
-    converter = MarkdownToHTMLConverter()
-    converter.convert_all_markdown_files()
+    args = parse_args(argv)
+    converter = MarkdownToHTMLConverter(html_dir=args.output)
+    try:
+        result = converter.convert_batch(args.roots or None, workers=args.workers, force=args.force)
+    except ValueError as e:
+        print(f"❌ {str(e)}")
+        sys.exit(2)
+    print(f"\n✅ {result.converted} converted, {result.unchanged} unchanged, {len(result.failed)} failed. HTML in: {converter.html_dir}")
+    if result.failed:
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,17 @@
+-- Lease columns used by app/job_claims.py so several outline/blog workers can
+-- claim content jobs with SELECT ... FOR UPDATE SKIP LOCKED.
+--
+-- Apply with: psql "$DATABASE_URL" -f migrations/001_content_job_leases.sql
+
+ALTER TABLE content_jobs ADD COLUMN IF NOT EXISTS claimed_by VARCHAR;
+ALTER TABLE content_jobs ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMPTZ;
+ALTER TABLE content_jobs ADD COLUMN IF NOT EXISTS attempt_count INTEGER NOT NULL DEFAULT 0;
+
+-- Claim queries filter on stage flags and lease expiry, oldest first
+CREATE INDEX IF NOT EXISTS ix_content_jobs_pending_claim
+    ON content_jobs (created_at, id)
+    WHERE status = false;
+
+CREATE INDEX IF NOT EXISTS ix_content_jobs_approved_claim
+    ON content_jobs (created_at, id)
+    WHERE status = true AND isapproved = true;
@@ -0,0 +1,9 @@
+-- Composite index for the /my-jobs list: one user's jobs, newest first, paged
+-- with a (created_at, id) keyset cursor.
+--
+-- Apply with: psql "$DATABASE_URL" -f migrations/002_content_jobs_user_created_index.sql
+-- CONCURRENTLY keeps the table writable while the index builds; it cannot run
+-- inside a transaction block.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_content_jobs_user_created
+    ON content_jobs (user_id, created_at DESC, id DESC);
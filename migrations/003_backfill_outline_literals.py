@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Backfill for migrations/003_content_jobs_outline_jsonb.sql.
+
+Converts outlines that were stored as Python dict reprs (and so could not be cast to
+JSONB) from outline_legacy_text into the "Outline" JSONB column, then clears the
+legacy text. Rows that cannot be parsed at all are left in outline_legacy_text.
+
+Run from the project root:
+    python migrations/003_backfill_outline_literals.py
+"""
+
+import os
+import sys
+import ast
+import json
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
+from app.database import engine
+
+
+def main():
+    converted = 0
+    failed = []
+
+    with engine.begin() as conn:
+        rows = conn.execute(
+            text("SELECT id, outline_legacy_text FROM content_jobs WHERE outline_legacy_text IS NOT NULL")
+        ).all()
+
+        for job_id, legacy_text in rows:
+            try:
+                outline = ast.literal_eval(legacy_text)
+                if not isinstance(outline, dict):
+                    raise ValueError("outline is not a dict")
+            except (ValueError, SyntaxError) as e:
+                failed.append((job_id, str(e)))
+                continue
+
+            conn.execute(
+                text('UPDATE content_jobs SET "Outline" = CAST(:outline AS JSONB), outline_legacy_text = NULL WHERE id = :id'),
+                {"outline": json.dumps(outline), "id": job_id}
+            )
+            converted += 1
+
+    print(f"✅ Converted {converted} legacy outlines")
+    for job_id, error in failed:
+        print(f"❌ Job {job_id}: could not parse outline ({error}), left in outline_legacy_text")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+-- Store content_jobs."Outline" as JSONB instead of JSON text, so the API and the
+-- workers read it as a parsed document instead of running json.loads per request.
+--
+-- Apply with: psql "$DATABASE_URL" -f migrations/003_content_jobs_outline_jsonb.sql
+--
+-- Rows whose text is not valid JSON (older rows saved as Python dict reprs) are
+-- copied to outline_legacy_text and converted to NULL; convert them afterwards with
+--   python migrations/003_backfill_outline_literals.py
+
+BEGIN;
+
+CREATE FUNCTION pg_temp.try_jsonb(value TEXT) RETURNS JSONB AS $$
+BEGIN
+    RETURN value::JSONB;
+EXCEPTION WHEN others THEN
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql IMMUTABLE;
+
+ALTER TABLE content_jobs ADD COLUMN IF NOT EXISTS outline_legacy_text TEXT;
+
+DO $$
+BEGIN
+    -- Only on the first run, while the column is still text
+    IF (SELECT data_type FROM information_schema.columns
+        WHERE table_name = 'content_jobs' AND column_name = 'Outline') = 'text' THEN
+        UPDATE content_jobs
+            SET outline_legacy_text = "Outline"
+            WHERE "Outline" IS NOT NULL AND pg_temp.try_jsonb("Outline") IS NULL;
+
+        ALTER TABLE content_jobs
+            ALTER COLUMN "Outline" TYPE JSONB USING pg_temp.try_jsonb("Outline");
+
+        -- A JSON null is not an outline
+        UPDATE content_jobs SET "Outline" = NULL WHERE "Outline" = 'null'::JSONB;
+    END IF;
+END;
+$$;
+
+-- Containment queries on outline contents, e.g. "Outline" @> '{"main_keyword": "..."}'
+CREATE INDEX IF NOT EXISTS ix_content_jobs_outline
+    ON content_jobs USING GIN ("Outline" jsonb_path_ops);
+
+COMMIT;
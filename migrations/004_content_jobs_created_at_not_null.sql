@@ -0,0 +1,17 @@
+-- Make content_jobs.created_at NOT NULL. The /my-jobs keyset cursor is
+-- (created_at, id); a NULL created_at cannot be compared, so such a job could not
+-- be paged past. The column already defaults to now(); rows that predate the
+-- default get their creation time approximated by the oldest known timestamp.
+--
+-- Apply with: psql "$DATABASE_URL" -f migrations/004_content_jobs_created_at_not_null.sql
+
+BEGIN;
+
+UPDATE content_jobs
+SET created_at = COALESCE((SELECT MIN(created_at) FROM content_jobs), now())
+WHERE created_at IS NULL;
+
+ALTER TABLE content_jobs ALTER COLUMN created_at SET DEFAULT now();
+ALTER TABLE content_jobs ALTER COLUMN created_at SET NOT NULL;
+
+COMMIT;
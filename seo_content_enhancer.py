@@ -11,6 +11,8 @@ from urllib.parse import quote
 import logging
 from datetime import datetime
 
+from app.keyword_matcher import get_keyword_matcher
+
 logger = logging.getLogger(__name__)
 
 class SEOContentEnhancer:
@@ -70,6 +72,12 @@ class SEOContentEnhancer:
             "subsequently": "then", "currently": "now", "previously": "before",
             "additionally": "also", "furthermore": "also", "therefore": "so"
         }
+        # One compiled alternation of all complex words, applied in a single pass per
+        # paragraph (longest words first so no word is cut short by a shorter one)
+        self.simpler_words_pattern = re.compile(
+            r'\b(?:' + '|'.join(re.escape(word) for word in sorted(self.simpler_words, key=len, reverse=True)) + r')\b',
+            re.IGNORECASE
+        )
     
     def get_enhanced_prompts(self, job: Any) -> Dict[str, str]:
         """Get SEO-enhanced prompts for different content sections."""
@@ -243,8 +251,7 @@ class SEOContentEnhancer:
         """Improve individual paragraph readability."""
         try:
             # Replace complex words with simpler alternatives
-            for complex_word, simple_word in self.simpler_words.items():
-                paragraph = re.sub(r'\b' + complex_word + r'\b', simple_word, paragraph, flags=re.IGNORECASE)
+            paragraph = self.simpler_words_pattern.sub(self._simpler_word, paragraph)
             
             # Break long sentences (>25 words) into shorter ones
             sentences = paragraph.split('. ')
@@ -273,6 +280,16 @@ class SEOContentEnhancer:
             logger.error(f"Error improving paragraph readability: {str(e)}")
             return paragraph
     
+    def _simpler_word(self, match: re.Match) -> str:
+        """Simpler alternative for a matched word, in the same case as the original."""
+        word = match.group(0)
+        simple_word = self.simpler_words[word.lower()]
+        if word.isupper() and len(word) > 1:
+            return simple_word.upper()
+        if word[0].isupper():
+            return simple_word[0].upper() + simple_word[1:]
+        return simple_word
+    
     def add_external_links(self, content: str, keyword: str, content_category: str) -> str:
         """Add external links to authoritative sources."""
         try:
@@ -375,6 +392,10 @@ class SEOContentEnhancer:
             # Count words
             word_count = len(content.split())
             
+            # Focus keyword and transition words are counted in one pass over the content
+            keyword_counts = get_keyword_matcher((keyword, *self.transition_words)).count(content)
+            keyword_occurrences = keyword_counts.get(keyword, 0)
+            
             # Prepare content analysis
             content_analysis = {
                 'meta_description_length': len(meta_description),
@@ -384,7 +405,9 @@ class SEOContentEnhancer:
                 'external_links_count': external_links_count,
                 'paragraph_count': len([p for p in content.split('\n\n') if p.strip()]),
                 'has_images': '![' in content,
-                'transition_words_used': len([word for word in self.transition_words if word in content.lower()]),
+                'keyword_occurrences': keyword_occurrences,
+                'keyword_density': round(keyword_occurrences / word_count * 100, 2) if word_count else 0,
+                'transition_words_used': len([word for word in self.transition_words if keyword_counts.get(word)]),
                 'seo_optimized': True
             }
             
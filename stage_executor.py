@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+DAG stage executor for the blog generation workflow.
+
+Stages are added with the names of the stages they depend on. Every stage starts as
+soon as all of its dependencies have finished, so independent LLM calls (introduction,
+sections, conclusion) run at the same time and follow-up work (images for a section)
+starts the moment its input is ready instead of after the slowest sibling.
+
+Stages are assigned to named thread pools so slow I/O of one kind (image downloads)
+cannot starve another (LLM calls). Per-stage start/finish times are recorded relative
+to the start of the run.
+"""
+
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+class StageExecutionError(Exception):
+    """Exception raised when a stage fails or the stage graph cannot be completed."""
+    pass
+
+
+class Stage:
+    """A unit of work in the stage graph."""
+    name: str
+    func: Callable[..., Any]
+    deps: List[str]
+    pool: str
+
+    def __init__(self, name: str, func: Callable[..., Any], deps: Sequence[str], pool: str):
+        self.name = name
+        self.func = func
+        self.deps = list(deps)
+        self.pool = pool
+
+
+class StageTiming:
+    """Start and finish time of a stage, in seconds since the run started."""
+    started: float
+    finished: float
+
+    def __init__(self, started: float, finished: float):
+        self.started = started
+        self.finished = finished
+
+    @property
+    def duration(self) -> float:
+        return self.finished - self.started
+
+
+class StageExecutor:
+    """Runs a DAG of stages, starting each stage as soon as its dependencies finish."""
+
+    def __init__(self, pools: Optional[Dict[str, int]] = None):
+        """
+        Args:
+            pools: Worker count per named pool (default: a single "default" pool with 4 workers).
+        """
+        self.pools = pools or {"default": 4}
+        self.stages: Dict[str, Stage] = {}
+        self.timings: Dict[str, StageTiming] = {}
+        self.total_time = 0.0
+
+    def add_stage(self, name: str, func: Callable[..., Any], deps: Sequence[str] = (), pool: Optional[str] = None) -> None:
+        """
+        Add a stage to the graph.
+
+        Args:
+            name: Unique stage name.
+            func: Called with the results of `deps`, in order, as positional arguments.
+            deps: Names of stages that must finish first.
+            pool: Name of the pool the stage runs in (default: the first pool).
+        """
+        if name in self.stages:
+            raise StageExecutionError(f"Duplicate stage: {name}")
+
+        pool = pool or next(iter(self.pools))
+        if pool not in self.pools:
+            raise StageExecutionError(f"Unknown pool '{pool}' for stage {name}")
+
+        self.stages[name] = Stage(name, func, deps, pool)
+
+    def _run_stage(self, stage: Stage, args: List[Any], run_started: float) -> Any:
+        started = time.monotonic() - run_started
+        try:
+            return stage.func(*args)
+        finally:
+            self.timings[stage.name] = StageTiming(started, time.monotonic() - run_started)
+
+    def run(self, on_stage_done: Optional[Callable[[str, Any], None]] = None) -> Dict[str, Any]:
+        """
+        Run every stage.
+
+        Args:
+            on_stage_done: Called with the name and result of each stage as it finishes,
+                from the calling thread (e.g. to report progress).
+
+        Returns:
+            Mapping of stage name to the stage's return value.
+
+        Raises:
+            StageExecutionError: If a stage raises or dependencies cannot be satisfied.
+        """
+        for stage in self.stages.values():
+            missing = [dep for dep in stage.deps if dep not in self.stages]
+            if missing:
+                raise StageExecutionError(f"Stage '{stage.name}' depends on unknown stages: {missing}")
+
+        run_started = time.monotonic()
+        results: Dict[str, Any] = {}
+        pending = dict(self.stages)
+        running = {}
+
+        executors = {name: ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"stage-{name}") for name, workers in self.pools.items()}
+        try:
+            while pending or running:
+                for name, stage in list(pending.items()):
+                    if all(dep in results for dep in stage.deps):
+                        del pending[name]
+                        args = [results[dep] for dep in stage.deps]
+                        future = executors[stage.pool].submit(self._run_stage, stage, args, run_started)
+                        running[future] = name
+
+                if not running:
+                    raise StageExecutionError(f"Stages with unsatisfiable (cyclic) dependencies: {sorted(pending)}")
+
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        results[name] = future.result()
+                    except Exception as e:
+                        raise StageExecutionError(f"Stage '{name}' failed: {str(e)}") from e
+                    if on_stage_done:
+                        on_stage_done(name, results[name])
+        finally:
+            for executor in executors.values():
+                executor.shutdown(wait=True, cancel_futures=True)
+            self.total_time = time.monotonic() - run_started
+
+        return results
+
+    def critical_path(self) -> List[str]:
+        """Return the chain of stages that determined the total run time, first to last."""
+        if not self.timings:
+            return []
+
+        path = []
+        current: Optional[str] = max(self.timings, key=lambda name: self.timings[name].finished)
+        while current:
+            path.append(current)
+            deps = [dep for dep in self.stages[current].deps if dep in self.timings]
+            current = max(deps, key=lambda dep: self.timings[dep].finished) if deps else None
+        return list(reversed(path))
+
+    def timing_summary(self) -> str:
+        """One line per stage with its start offset and duration, in start order."""
+        lines = []
+        for name, timing in sorted(self.timings.items(), key=lambda item: item[1].started):
+            lines.append(f"{name}: +{timing.started:.1f}s for {timing.duration:.1f}s")
+        return "\n".join(lines)
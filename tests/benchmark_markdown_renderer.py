@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark the single-pass Markdown renderer against the regex chain it replaced.
+
+Converts every Markdown file in generated_content/ (metadata files excluded) a number
+of times with both implementations and prints the time per document.
+
+Usage:
+    python tests/benchmark_markdown_renderer.py [--rounds 50] [--dir generated_content]
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from markdown_renderer import render_markdown
+
+
+def legacy_convert(markdown_content: str) -> str:
+    """The previous MarkdownToHTMLConverter.convert_markdown_to_html, kept for comparison."""
+    html = markdown_content
+    html = re.sub(r'^---\n.*?\n---\n', '', html, flags=re.DOTALL)
+    html = re.sub(r'^## (.+)$', r'<h2>\1</h2>', html, flags=re.MULTILINE)
+    html = re.sub(r'^### (.+)$', r'<h3>\1</h3>', html, flags=re.MULTILINE)
+    html = re.sub(r'^#### (.+)$', r'<h4>\1</h4>', html, flags=re.MULTILINE)
+    html = re.sub(r'^##### (.+)$', r'<h5>\1</h5>', html, flags=re.MULTILINE)
+    html = re.sub(r'^###### (.+)$', r'<h6>\1</h6>', html, flags=re.MULTILINE)
+    html = re.sub(r'^# .+$\n?', '', html, flags=re.MULTILINE)
+    html = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', html)
+    html = re.sub(r'\*(.+?)\*', r'<em>\1</em>', html)
+    html = re.sub(r'!\[([^\]]*)\]\(([^)]+)\)', r'<img src="\2" alt="\1" class="wp-image-responsive" style="max-width: 100%; height: auto; margin: 20px 0;" />', html)
+    html = re.sub(r'^\s*[-\*\+]\s+(.+)$', r'<li>\1</li>', html, flags=re.MULTILINE)
+    html = re.sub(r'(<li>.*?</li>)(?:\s*\n\s*<li>.*?</li>)*', lambda m: f'<ul>\n{m.group(0)}\n</ul>', html, flags=re.DOTALL)
+    html = re.sub(r'^\s*\d+\.\s+(.+)$', r'<li>\1</li>', html, flags=re.MULTILINE)
+    paragraphs = []
+    for para in html.split('\n\n'):
+        para = para.strip()
+        if para:
+            paragraphs.append(para if para.startswith('<') else f'<p>{para}</p>')
+    html = '\n\n'.join(paragraphs)
+    html = re.sub(r'\n\s*\n\s*\n', '\n\n', html)
+    return html.strip()
+
+
+def time_converter(convert, documents, rounds: int) -> float:
+    """Seconds per document, best of three runs of `rounds` passes over all documents."""
+    best = float("inf")
+    for _ in range(3):
+        started = time.perf_counter()
+        for _ in range(rounds):
+            for document in documents:
+                convert(document)
+        best = min(best, time.perf_counter() - started)
+    return best / (rounds * len(documents))
+
+
+def main():
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dir", default=os.path.join(project_root, "generated_content"), help="Directory with .md files")
+    parser.add_argument("--rounds", type=int, default=50, help="Passes over all documents per run")
+    args = parser.parse_args()
+
+    documents = []
+    for name in sorted(os.listdir(args.dir)):
+        if name.endswith(".md") and not name.endswith("_metadata.md"):
+            with open(os.path.join(args.dir, name), encoding="utf-8") as f:
+                documents.append(f.read())
+    if not documents:
+        print(f"No Markdown files found in {args.dir}")
+        return
+
+    total_kb = sum(len(document) for document in documents) / 1024
+    print(f"{len(documents)} documents, {total_kb:.0f} KB, {args.rounds} rounds")
+
+    legacy = time_converter(legacy_convert, documents, args.rounds)
+    single_pass = time_converter(render_markdown, documents, args.rounds)
+
+    print(f"regex chain:  {legacy * 1000:.3f} ms/document")
+    print(f"single pass:  {single_pass * 1000:.3f} ms/document")
+    print(f"speedup:      {legacy / single_pass:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Test script for batched proofreading/humanizing in blog-AI post-processing.
+"""
+
+import os
+import re
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app", "blog-AI"))
+
+from src.post_processing import batch_editor
+from src.post_processing.batch_editor import build_batch_prompt, parse_batch_response, plan_batches, edit_contents
+
+
+def test_batches_keep_order_and_respect_size():
+    items = [("a", "x" * 40), ("b", "x" * 40), ("c", "x" * 100), ("d", "x" * 10)]
+    assert plan_batches(items, 100) == [[items[0], items[1]], [items[2]], [items[3]]]
+    print("✓ Pieces are batched in order up to the size limit")
+
+
+def test_response_is_split_back_by_id():
+    items = [("s0_0", "First paragraph here."), ("s0_1", "Second paragraph here."), ("s1_0", "A third, longer paragraph.")]
+    prompt = build_batch_prompt(items, ["proofread", "humanize"])
+    assert all(f'<section id="{item_id}">' in prompt for item_id, _ in items)
+
+    response = (
+        'Sure:\n<section id="s0_1">\nSecond paragraph, edited.\n</section>\n'
+        '<section id="s0_0">\nFirst paragraph, edited.\n</section>\n'
+        '<section id="s1_0">\nA\n</section>\n'
+        '<section id="other">\nUnknown\n</section>'
+    )
+    edited = parse_batch_response(response, items)
+    assert edited == {"s0_0": "First paragraph, edited.", "s0_1": "Second paragraph, edited."}
+    print("✓ Edited pieces are matched by ID; cut-off and unknown pieces are dropped")
+
+
+def test_missing_pieces_are_retried_then_kept():
+    requests = []
+
+    def fake_generate_text(prompt, provider, options):
+        requests.append(prompt)
+        sections = re.findall(r'<section id="([^"]+)">\n(.*?)\n</section>', prompt, re.DOTALL)
+        if len(sections) > 1:
+            # The batch answer drops the last piece
+            sections = sections[:-1]
+        return "\n".join(f'<section id="{item_id}">\n{content.upper()}\n</section>' for item_id, content in sections)
+
+    original = batch_editor.generate_text
+    batch_editor.generate_text = fake_generate_text
+    try:
+        edited = edit_contents({"a": "alpha text", "b": "beta text", "c": ""}, provider=object())
+    finally:
+        batch_editor.generate_text = original
+
+    assert edited == {"a": "ALPHA TEXT", "b": "BETA TEXT", "c": ""}
+    assert len(requests) == 2
+    print("✓ A piece missing from a batch answer is retried on its own")
+
+
+if __name__ == "__main__":
+    test_batches_keep_order_and_respect_size()
+    test_response_is_split_back_by_id()
+    test_missing_pieces_are_retried_then_kept()
+    print("\nAll batch editor tests passed!")
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test script for the stock image search cache and downloaded image store.
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.image_cache import ImageAssetStore, ImageSearchCache, normalize_query
+
+
+def test_search_hit_and_miss():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ImageSearchCache(tmp)
+        result = [{"url": "https://images.example.com/1.jpg", "alt": "A cat"}]
+
+        assert cache.lookup("pexels", "Cute cats", {"per_page": 5}) == (False, None)
+        cache.store("pexels", "Cute cats", result, {"per_page": 5})
+
+        # Trivial query variations share the entry; provider and parameters do not
+        assert normalize_query("  Cute, CATS! ") == "cute cats"
+        assert cache.lookup("pexels", "cute  cats!", {"per_page": 5}) == (True, result)
+        assert cache.lookup("pixabay", "Cute cats", {"per_page": 5}) == (False, None)
+        assert cache.lookup("pexels", "Cute cats", {"per_page": 10}) == (False, None)
+
+        # A search without hits is remembered as such
+        cache.store("unsplash", "nothing here", None)
+        assert cache.lookup("unsplash", "nothing here") == (True, None)
+
+        assert cache.hits == 2 and cache.misses == 3
+    print("✓ Search results are cached per provider, normalized query and parameters")
+
+
+def test_search_ttl_expiry():
+    with tempfile.TemporaryDirectory() as tmp:
+        expired = ImageSearchCache(tmp, ttl=-1, miss_ttl=-1)
+        expired.store("pexels", "dogs", [{"url": "https://images.example.com/2.jpg"}])
+        expired.store("pexels", "no dogs", None)
+        assert expired.lookup("pexels", "dogs") == (False, None)
+        assert expired.lookup("pexels", "no dogs") == (False, None)
+
+        # Misses use their own (shorter) TTL
+        cache = ImageSearchCache(tmp, ttl=3600, miss_ttl=-1)
+        cache.store("pexels", "dogs", [{"url": "https://images.example.com/2.jpg"}])
+        cache.store("pexels", "no dogs", None)
+        assert cache.lookup("pexels", "dogs")[0] is True
+        assert cache.lookup("pexels", "no dogs") == (False, None)
+    print("✓ Search results and misses expire after their TTLs")
+
+
+def test_asset_store_hit_and_miss():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ImageAssetStore(tmp, max_bytes=1000)
+        url = "https://images.example.com/3.jpg"
+
+        assert store.get(url) is None
+        store.put(url, b"jpeg bytes")
+        assert store.get(url) == b"jpeg bytes"
+        assert os.path.exists(store._path(store.url_hash(url)))
+        assert store.hits == 1 and store.misses == 1
+    print("✓ Downloaded images are stored and served by URL")
+
+
+def test_asset_store_byte_bound_eviction():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ImageAssetStore(tmp, max_bytes=25)
+        urls = [f"https://images.example.com/{name}.jpg" for name in ("a", "b", "c")]
+
+        store.put(urls[0], b"a" * 10)
+        time.sleep(0.01)
+        store.put(urls[1], b"b" * 10)
+        time.sleep(0.01)
+        # Reading the first image makes the second the least recently used
+        assert store.get(urls[0]) == b"a" * 10
+        time.sleep(0.01)
+        store.put(urls[2], b"c" * 10)
+
+        assert store.get(urls[1]) is None
+        assert not os.path.exists(store._path(store.url_hash(urls[1])))
+        assert store.get(urls[0]) == b"a" * 10
+        assert store.get(urls[2]) == b"c" * 10
+
+        total = store.index.conn.execute("SELECT SUM(size) FROM image_assets").fetchone()[0]
+        assert total <= 25
+    print("✓ Least recently used images are evicted over the size cap")
+
+
+if __name__ == "__main__":
+    test_search_hit_and_miss()
+    test_search_ttl_expiry()
+    test_asset_store_hit_and_miss()
+    test_asset_store_byte_bound_eviction()
+    print("\nAll image cache tests passed!")
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test script for lease-based job claiming.
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, Column, Integer, Boolean, String, TIMESTAMP, func
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+from app.job_claims import claim_jobs, claim_job, release_job, renew_lease, lock_claimed_job, LeaseLostError, JOB_MAX_ATTEMPTS
+
+Base = declarative_base()
+
+
+class Job(Base):
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True)
+    status = Column(Boolean, nullable=False, default=False)
+    created_at = Column(TIMESTAMP, server_default=func.now())
+    claimed_by = Column(String, nullable=True)
+    lease_expires_at = Column(TIMESTAMP(timezone=True), nullable=True)
+    attempt_count = Column(Integer, nullable=False, default=0)
+
+
+def make_session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    db.add_all([Job(id=1), Job(id=2), Job(id=3, status=True)])
+    db.commit()
+    return db
+
+
+def test_claims_are_exclusive_until_the_lease_expires():
+    db = make_session()
+
+    jobs = claim_jobs(db, Job, [Job.status == False], 10, worker_id="a")
+    assert [job.id for job in jobs] == [1, 2]
+    assert all(job.claimed_by == "a" and job.attempt_count == 1 for job in jobs)
+    assert claim_jobs(db, Job, [Job.status == False], 10, worker_id="b") == []
+
+    # A crashed worker's lease runs out and the job can be claimed again
+    db.query(Job).filter(Job.id == 1).update({"lease_expires_at": datetime.now(timezone.utc) - timedelta(seconds=1)})
+    db.commit()
+    job = claim_job(db, Job, 1, [Job.status == False], worker_id="b")
+    assert job is not None and job.claimed_by == "b" and job.attempt_count == 2
+
+    # The next stage can take over a lease it was handed
+    assert claim_job(db, Job, 2, [], worker_id="c", held_by="a").claimed_by == "c"
+    print("✓ Claims are exclusive until the lease expires or is handed over")
+
+
+def test_release_resets_attempts_only_on_success():
+    db = make_session()
+    claim_jobs(db, Job, [], 10, worker_id="a")
+
+    release_job(db, Job, 1, success=True, worker_id="a")
+    release_job(db, Job, 2, success=False, worker_id="a")
+    release_job(db, Job, 3, success=True, worker_id="other")
+    db.expire_all()
+    first, second, third = db.query(Job).order_by(Job.id).all()
+    assert (first.claimed_by, first.attempt_count) == (None, 0)
+    assert (second.claimed_by, second.attempt_count) == (None, 1)
+    assert third.claimed_by == "a"
+
+    db.query(Job).update({"attempt_count": JOB_MAX_ATTEMPTS, "claimed_by": None, "lease_expires_at": None})
+    db.commit()
+    assert claim_jobs(db, Job, [], 10, worker_id="a") == []
+    print("✓ Release resets attempts on success, exhausted jobs are not claimed")
+
+
+def test_renew_and_final_write_require_the_lease():
+    db = make_session()
+    job = claim_job(db, Job, 1, [], worker_id="a", lease_seconds=60)
+    expires_at = job.lease_expires_at
+
+    assert renew_lease(db, Job, 1, worker_id="a", lease_seconds=3600)
+    db.expire_all()
+    assert db.get(Job, 1).lease_expires_at > expires_at
+    assert lock_claimed_job(db, Job, 1, worker_id="a").id == 1
+    db.commit()
+
+    # Worker b reclaims the job after a's lease ran out; a can no longer renew or write
+    db.query(Job).filter(Job.id == 1).update({"lease_expires_at": datetime.now(timezone.utc) - timedelta(seconds=1)})
+    db.commit()
+    assert claim_job(db, Job, 1, [], worker_id="b") is not None
+    assert not renew_lease(db, Job, 1, worker_id="a")
+    try:
+        lock_claimed_job(db, Job, 1, worker_id="a")
+    except LeaseLostError:
+        pass
+    else:
+        raise AssertionError("A worker that lost its lease could still write")
+    print("✓ Renewal and the final write fail once another worker holds the lease")
+
+
+if __name__ == "__main__":
+    test_claims_are_exclusive_until_the_lease_expires()
+    test_release_resets_attempts_only_on_success()
+    test_renew_and_final_write_require_the_lease()
+    print("\nAll job claim tests passed!")
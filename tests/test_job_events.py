@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Test script for job progress events and the per-process stream broker.
+"""
+
+import os
+import sys
+import asyncio
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app import job_events
+from app.job_events import JobEventBroker, notify_job_event, publish_job_event, RESYNC
+
+
+async def drain(queue: asyncio.Queue) -> list:
+    # dispatch() hands events to the loop with call_soon_threadsafe
+    await asyncio.sleep(0)
+    items = []
+    while not queue.empty():
+        items.append(queue.get_nowait())
+    return items
+
+
+def test_events_are_delivered_on_commit_only():
+    async def run():
+        broker = JobEventBroker()
+        job_events.job_event_broker = broker
+        queue = broker.subscribe(user_id=3)
+        Session = sessionmaker(bind=create_engine("sqlite://"))
+
+        db = Session()
+        db.execute(text("SELECT 1"))
+        notify_job_event(db, 12, 3, "outlined", status=True)
+        assert await drain(queue) == []
+        db.commit()
+        events = await drain(queue)
+        assert [(event["job_id"], event["stage"], event["status"]) for event in events] == [(12, "outlined", True)]
+
+        notify_job_event(db, 12, 3, "published")
+        db.rollback()
+        db.commit()
+        assert await drain(queue) == []
+
+        notify_job_event(db, 13, 4, "outlined")
+        db.commit()
+        assert await drain(queue) == []
+
+        publish_job_event(Session, 12, 3, "sections", completed=1, total=3)
+        assert [event["completed"] for event in await drain(queue)] == [1]
+        db.close()
+
+    original = job_events.job_event_broker
+    try:
+        asyncio.run(run())
+    finally:
+        job_events.job_event_broker = original
+    print("✓ Events reach the owner's clients on commit and are dropped on rollback")
+
+
+def test_full_queue_is_replaced_by_resync():
+    async def run():
+        broker = JobEventBroker(queue_size=2)
+        queue = broker.subscribe(user_id=1)
+        for completed in range(3):
+            broker.dispatch(job_events.make_event(5, 1, "sections", completed=completed, total=3))
+        assert await drain(queue) == [RESYNC]
+
+        broker.dispatch(job_events.make_event(5, 1, "images", completed=1, total=1))
+        assert [event["stage"] for event in await drain(queue)] == ["images"]
+
+        broker.unsubscribe(1, queue)
+        broker.dispatch(job_events.make_event(5, 1, "published"))
+        assert await drain(queue) == []
+
+    asyncio.run(run())
+    print("✓ A client that falls behind gets its backlog replaced by a resync")
+
+
+if __name__ == "__main__":
+    test_events_are_delivered_on_commit_only()
+    test_full_queue_is_replaced_by_resync()
+    print("\nAll job event tests passed!")
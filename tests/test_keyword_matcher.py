@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Test script for the Aho-Corasick keyword matcher.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.keyword_matcher import KeywordMatcher, get_keyword_matcher
+
+
+def test_counts_whole_words_only():
+    matcher = KeywordMatcher(["art", "diet"])
+    counts = matcher.count("Start the art of dieting: ART, diet, and a diet plan.")
+    assert counts == {"art": 2, "diet": 2}
+    print("✓ Keywords only match whole words, case-insensitively")
+
+
+def test_phrases_and_overlapping_keywords():
+    text = "A keto diet plan. Keto-diet recipes for the keto  diet."
+    positions = KeywordMatcher(["keto diet", "diet", "keto diet plan", "low carb"]).find(text)
+    assert [text[start:end] for start, end in positions["keto diet"]] == ["keto diet", "Keto-diet", "keto  diet"]
+    assert len(positions["diet"]) == 3
+    assert positions["keto diet plan"] == [(2, 16)]
+    assert positions["low carb"] == []
+    print("✓ Phrases match across spacing/punctuation and overlap shorter keywords")
+
+
+def test_failure_links_recover_partial_phrases():
+    text = "best best running shoes"
+    counts = KeywordMatcher(["best running shoes", "running"]).count(text)
+    assert counts == {"best running shoes": 1, "running": 1}
+    print("✓ A broken phrase prefix does not hide a match that starts inside it")
+
+
+def test_matcher_is_reused_for_the_same_keyword_set():
+    assert get_keyword_matcher(("a", "b")) is get_keyword_matcher(("a", "b"))
+    assert KeywordMatcher(["", "!!"]).count("anything") == {"": 0, "!!": 0}
+    print("✓ Matchers are cached per keyword set; empty keywords never match")
+
+
+if __name__ == "__main__":
+    test_counts_whole_words_only()
+    test_phrases_and_overlapping_keywords()
+    test_failure_links_recover_partial_phrases()
+    test_matcher_is_reused_for_the_same_keyword_set()
+    print("\nAll keyword matcher tests passed!")
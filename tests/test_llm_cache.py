@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Test script for the LLM response cache.
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.llm_cache import LLMCache, SQLiteCacheBackend, MemoryCacheBackend
+
+
+def test_cache_key_is_content_addressed():
+    key = LLMCache.make_key("openai", "gpt-4", "Write an intro", 0.7, 2000)
+    assert key == LLMCache.make_key("openai", "gpt-4", "Write an intro", 0.7, 2000)
+    assert key != LLMCache.make_key("openai", "gpt-4", "Write an intro", 0.2, 2000)
+    assert key != LLMCache.make_key("openai", "gpt-4", "Write an intro", 0.7, 1000)
+    assert key != LLMCache.make_key("openai", "gpt-3.5-turbo", "Write an intro", 0.7, 2000)
+    assert key != LLMCache.make_key("openai", "gpt-4", "Write an intro", 0.7, 2000, system="Be brief")
+    print("✓ Cache keys change with every keyed parameter")
+
+
+def test_sqlite_backend_hits_misses_and_ttl():
+    with tempfile.TemporaryDirectory() as tmp:
+        backend = SQLiteCacheBackend(os.path.join(tmp, "llm.sqlite3"), ttl=1)
+        cache = LLMCache(backend)
+
+        assert cache.get("a") is None
+        cache.set("a", "response")
+        assert cache.get("a") == "response"
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+        time.sleep(1.1)
+        assert cache.get("a") is None
+        print("✓ SQLite backend counts hits/misses and expires entries")
+
+
+def test_sqlite_backend_lru_eviction():
+    with tempfile.TemporaryDirectory() as tmp:
+        backend = SQLiteCacheBackend(os.path.join(tmp, "llm.sqlite3"), ttl=0, max_entries=2)
+        backend.set("a", "1")
+        time.sleep(0.01)
+        backend.set("b", "2")
+        time.sleep(0.01)
+        assert backend.get("a") == "1"  # a is now more recently used than b
+        time.sleep(0.01)
+        backend.set("c", "3")
+
+        assert backend.get("b") is None
+        assert backend.get("a") == "1"
+        assert backend.get("c") == "3"
+        print("✓ SQLite backend evicts the least recently used entry")
+
+
+def test_memory_backend_lru_eviction():
+    backend = MemoryCacheBackend(ttl=0, max_entries=2)
+    backend.set("a", "1")
+    backend.set("b", "2")
+    backend.get("a")
+    backend.set("c", "3")
+    assert backend.get("b") is None
+    assert len(backend) == 2
+    print("✓ Memory backend evicts the least recently used entry")
+
+
+if __name__ == "__main__":
+    test_cache_key_is_content_addressed()
+    test_sqlite_backend_hits_misses_and_ttl()
+    test_sqlite_backend_lru_eviction()
+    test_memory_backend_lru_eviction()
+    print("\nAll LLM cache tests passed!")
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Test script for the batch mode of the Markdown to HTML converter.
+"""
+
+import os
+import sys
+import json
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import markdown_to_html_converter
+from markdown_to_html_converter import MarkdownToHTMLConverter, MANIFEST_NAME
+
+
+def write(path: str, text) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(text if isinstance(text, bytes) else text.encode('utf-8'))
+
+
+def read_manifest(output: str) -> dict:
+    with open(os.path.join(output, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_batch_mirrors_layout_and_skips_unchanged_files():
+    with tempfile.TemporaryDirectory() as tmp:
+        root, output = os.path.join(tmp, "posts"), os.path.join(tmp, "html")
+        write(os.path.join(root, "a.md"), "## A\n\nText")
+        write(os.path.join(root, "2025", "b.md"), "## B")
+        converter = MarkdownToHTMLConverter(content_dir=root, html_dir=output)
+
+        result = converter.convert_batch(workers=2)
+        assert (result.converted, result.unchanged, result.failed) == (2, 0, {})
+        with open(os.path.join(output, "2025", "b.html"), 'r', encoding='utf-8') as f:
+            assert "<h2>B</h2>" in f.read()
+
+        result = converter.convert_batch(workers=2)
+        assert (result.converted, result.unchanged) == (0, 2)
+
+        # Touched but identical content is matched by hash and not rewritten
+        os.utime(os.path.join(root, "a.md"), ns=(0, 0))
+        result = converter.convert_batch(workers=1)
+        assert (result.converted, result.unchanged) == (0, 2)
+
+        write(os.path.join(root, "a.md"), "## A changed")
+        result = converter.convert_batch(workers=1)
+        assert (result.converted, result.unchanged) == (1, 1)
+        print("✓ Batch mirrors the layout and skips unchanged files")
+
+
+def test_fingerprint_change_and_force_reconvert_everything():
+    with tempfile.TemporaryDirectory() as tmp:
+        root, output = os.path.join(tmp, "posts"), os.path.join(tmp, "html")
+        write(os.path.join(root, "a.md"), "## A")
+        write(os.path.join(root, "b.md"), "## B")
+        converter = MarkdownToHTMLConverter(content_dir=root, html_dir=output)
+        converter.convert_batch(workers=1)
+
+        result = converter.convert_batch(workers=1, force=True)
+        assert (result.converted, result.unchanged) == (2, 0)
+
+        original = markdown_to_html_converter.template_fingerprint
+        markdown_to_html_converter.template_fingerprint = lambda: "new renderer"
+        try:
+            result = converter.convert_batch(workers=1)
+        finally:
+            markdown_to_html_converter.template_fingerprint = original
+        assert (result.converted, result.unchanged) == (2, 0)
+        assert read_manifest(output)["fingerprint"] == "new renderer"
+        print("✓ A renderer/template change or --force reconverts every file")
+
+
+def test_failed_files_are_retried():
+    with tempfile.TemporaryDirectory() as tmp:
+        root, output = os.path.join(tmp, "posts"), os.path.join(tmp, "html")
+        broken = os.path.join(root, "broken.md")
+        write(os.path.join(root, "ok.md"), "## OK")
+        write(broken, b"## \xff\xfe not utf-8")
+        converter = MarkdownToHTMLConverter(content_dir=root, html_dir=output)
+
+        result = converter.convert_batch(workers=1)
+        assert result.converted == 1 and list(result.failed) == [broken]
+        assert broken not in read_manifest(output)["files"]
+
+        write(broken, "## Fixed")
+        result = converter.convert_batch(workers=1)
+        assert (result.converted, result.unchanged, result.failed) == (1, 1, {})
+        print("✓ Failed files stay out of the manifest and are retried")
+
+
+def test_manifest_keeps_entries_of_other_roots():
+    with tempfile.TemporaryDirectory() as tmp:
+        first, second = os.path.join(tmp, "first"), os.path.join(tmp, "second")
+        output = os.path.join(tmp, "html")
+        write(os.path.join(first, "a.md"), "## A")
+        write(os.path.join(first, "gone.md"), "## Gone")
+        write(os.path.join(second, "b.md"), "## B")
+        converter = MarkdownToHTMLConverter(html_dir=output)
+
+        converter.convert_batch([first], workers=1)
+        os.remove(os.path.join(first, "gone.md"))
+        converter.convert_batch([second], workers=1)
+        assert sorted(os.path.basename(source) for source in read_manifest(output)["files"]) == ["a.md", "b.md"]
+
+        result = converter.convert_batch([first], workers=1)
+        assert (result.converted, result.unchanged) == (0, 1)
+        print("✓ Converting another root keeps the manifest entries of the first")
+
+
+def test_roots_with_the_same_name_are_rejected():
+    with tempfile.TemporaryDirectory() as tmp:
+        first, second = os.path.join(tmp, "x", "posts"), os.path.join(tmp, "y", "posts")
+        write(os.path.join(first, "a.md"), "## A")
+        write(os.path.join(second, "a.md"), "## Other A")
+        converter = MarkdownToHTMLConverter(html_dir=os.path.join(tmp, "html"))
+
+        try:
+            converter.convert_batch([first, second], workers=1)
+        except ValueError as e:
+            assert first in str(e) and second in str(e)
+        else:
+            raise AssertionError("Roots with the same name were accepted")
+
+        # The same root given twice is converted once
+        result = converter.convert_batch([first, first], workers=1)
+        assert result.converted == 1
+        print("✓ Roots sharing a name are rejected instead of overwriting each other")
+
+
+if __name__ == "__main__":
+    test_batch_mirrors_layout_and_skips_unchanged_files()
+    test_fingerprint_change_and_force_reconvert_everything()
+    test_failed_files_are_retried()
+    test_manifest_keeps_entries_of_other_roots()
+    test_roots_with_the_same_name_are_rejected()
+    print("\nAll markdown batch tests passed!")
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Test script for the single-pass Markdown → WordPress block renderer.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from markdown_renderer import render_markdown
+
+
+def test_front_matter_and_h1_are_dropped():
+    html = render_markdown("---\ntitle: T\n---\n# Title\n\n## Section\n\nText")
+
+    assert "title: T" not in html
+    assert "<h1>" not in html
+    assert '<!-- wp:heading {"level":2} -->\n<h2>Section</h2>\n<!-- /wp:heading -->' in html
+    assert "<!-- wp:paragraph -->\n<p>Text</p>\n<!-- /wp:paragraph -->" in html
+    print("✓ Front matter and H1 dropped, headings and paragraphs become blocks")
+
+
+def test_heading_closing_hashes():
+    html = render_markdown("## Learn C#\n\n### F# and C# ###")
+
+    assert "<h2>Learn C#</h2>" in html
+    assert "<h3>F# and C#</h3>" in html
+    print("✓ Only closing hashes after whitespace are stripped from headings")
+
+
+def test_lists_end_paragraphs_and_keep_their_kind():
+    html = render_markdown("Themes include:\n- **Brahman**: reality\n- *Atman*\n1. Rigveda\n2. Yajurveda")
+
+    assert "<p>Themes include:</p>" in html
+    assert "<!-- wp:list -->\n<ul>\n<li><strong>Brahman</strong>: reality</li>\n<li><em>Atman</em></li>\n</ul>" in html
+    assert '<!-- wp:list {"ordered":true} -->\n<ol>\n<li>Rigveda</li>\n<li>Yajurveda</li>\n</ol>' in html
+    print("✓ Lists directly under a paragraph become separate ul/ol blocks")
+
+
+def test_images_links_and_code():
+    html = render_markdown('![a "cat"](https://x/cat.webp)\n\nSee [docs](https://x/d) and `a<b>`, 2 * 3 * 4\n\n```\n<tag>\n```')
+
+    assert '<figure class="wp-block-image"><img src="https://x/cat.webp" alt="a &quot;cat&quot;"/></figure>' in html
+    assert '<a href="https://x/d">docs</a>' in html
+    assert "<code>a&lt;b&gt;</code>" in html
+    assert "2 * 3 * 4" in html
+    assert '<pre class="wp-block-code"><code>&lt;tag&gt;</code></pre>' in html
+    print("✓ Images, links and code render with escaped attributes and code")
+
+
+if __name__ == "__main__":
+    test_front_matter_and_h1_are_dropped()
+    test_heading_closing_hashes()
+    test_lists_end_paragraphs_and_keep_their_kind()
+    test_images_links_and_code()
+    print("\nAll markdown renderer tests passed!")
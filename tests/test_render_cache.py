@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test script for the featured image render cache.
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app", "featured-image-generator"))
+
+from render_cache import RenderCache, etag_matches, make_render_key
+
+
+def test_render_key_and_etag():
+    key = make_render_key("abc", "Title", None, None, None, "modern", "none", "webp")
+    assert key == make_render_key("abc", "Title", None, None, None, "modern", "none", "webp")
+    assert key != make_render_key("abc", "Title", None, None, None, "vibrant", "none", "webp")
+    assert key != make_render_key("abd", "Title", None, None, None, "modern", "none", "webp")
+    assert etag_matches(f'W/"{key}"', key) and etag_matches(f'"other", "{key}"', key) and etag_matches("*", key)
+    assert not etag_matches(None, key) and not etag_matches('"other"', key)
+    print("✓ Render keys change with every input and double as ETags")
+
+
+def test_memory_and_disk_tiers():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = RenderCache(tmp, memory_max_bytes=25, disk_max_bytes=1000)
+
+        assert cache.get("missing") is None
+        cache.put("a", b"a" * 10)
+        assert cache.get_memory("a") == b"a" * 10
+
+        # A render evicted from memory is still served from disk and promoted again
+        cache.put_memory("b", b"b" * 10)
+        cache.put_memory("c", b"c" * 10)
+        assert cache.get_memory("a") is None
+        assert cache.get("a") == b"a" * 10
+        assert cache.get_memory("a") == b"a" * 10
+
+        # A fresh cache over the same directory finds the render on disk
+        assert RenderCache(tmp).get("a") == b"a" * 10
+
+        stats = cache.stats()
+        assert (stats["memory_hits"], stats["disk_hits"], stats["misses"]) == (2, 1, 1)
+        assert stats["memory_bytes"] <= 25
+    print("✓ Memory tier is bounded by bytes and falls back to the disk tier")
+
+
+def test_disk_tier_evicts_least_recently_used():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = RenderCache(tmp, memory_max_bytes=0, disk_max_bytes=25)
+        cache.put_disk("old", b"o" * 10)
+        cache.put_disk("used", b"u" * 10)
+        past = time.time() - 60
+        os.utime(os.path.join(tmp, "old"), (past, past))
+        os.utime(os.path.join(tmp, "used"), (past - 60, past - 60))
+        # Reading a render marks it as recently used
+        assert cache.get("used") == b"u" * 10
+
+        cache.put_disk("new", b"n" * 10)
+        assert sorted(os.listdir(tmp)) == ["new", "used"]
+        assert cache.stats()["disk_bytes"] == 20
+    print("✓ Disk tier evicts the least recently used renders past its byte bound")
+
+
+def test_source_digests_expire():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = RenderCache(tmp, source_ttl=0)
+        cache.remember_source("https://x/a.jpg", "digest")
+        time.sleep(0.01)
+        assert cache.lookup_source("https://x/a.jpg") is None
+
+        cache = RenderCache(tmp, source_ttl=60)
+        cache.remember_source("https://x/a.jpg", "digest")
+        assert cache.lookup_source("https://x/a.jpg") == "digest"
+    print("✓ Source URL digests are trusted only for their TTL")
+
+
+if __name__ == "__main__":
+    test_render_key_and_etag()
+    test_memory_and_disk_tiers()
+    test_disk_tier_evicts_least_recently_used()
+    test_source_digests_expire()
+    print("\nAll render cache tests passed!")
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Test script for the blog-AI research result cache.
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app", "blog-AI"))
+
+from src.research.research_cache import ResearchCache
+from src.types.research import SearchOptions, GoogleSerpResult, SearchResult, PeopleAlsoAsk
+
+
+def serp_result(title: str) -> GoogleSerpResult:
+    return GoogleSerpResult(
+        organic=[SearchResult(title=title, url="https://example.com", snippet="...")],
+        people_also_ask=[PeopleAlsoAsk(question="Why?", answer="Because")]
+    )
+
+
+def test_key_normalizes_query_and_includes_options():
+    key = ResearchCache.make_key("google", " Vedas  History\n", SearchOptions())
+    assert key == ResearchCache.make_key("google", "vedas history", SearchOptions())
+    assert key != ResearchCache.make_key("tavily", "vedas history", SearchOptions())
+    assert key != ResearchCache.make_key("google", "vedas history", SearchOptions(location="in"))
+    assert key != ResearchCache.make_key("google", "vedas history", SearchOptions(time_range="m"))
+    assert ResearchCache.make_key("google", "C++ tutorial", SearchOptions()) != ResearchCache.make_key("google", "C tutorial", SearchOptions())
+    assert ResearchCache.make_key("google", "C# tutorial", SearchOptions()) != ResearchCache.make_key("google", "C tutorial", SearchOptions())
+    print("✓ Cache keys normalize the query and change with source and options")
+
+
+def test_results_round_trip_and_errors_are_not_cached():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResearchCache(os.path.join(tmp, "research.sqlite3"))
+        calls = []
+
+        def search():
+            calls.append(1)
+            return serp_result("Vedas")
+
+        first = cache.get_or_search("google", "vedas", SearchOptions(), search)
+        second = cache.get_or_search("google", "Vedas", SearchOptions(), search)
+        assert len(calls) == 1
+        assert second.organic[0].title == first.organic[0].title == "Vedas"
+        assert second.people_also_ask[0].answer == "Because"
+
+        def failing():
+            raise RuntimeError("quota")
+
+        try:
+            cache.get_or_search("tavily", "vedas", SearchOptions(), failing)
+            assert False, "expected the search error"
+        except RuntimeError:
+            pass
+        assert cache.lookup("tavily", "vedas", SearchOptions()) == (None, None)
+
+        stats = cache.stats()
+        assert stats["sources"]["google"]["hits"] == 1
+        assert stats["sources"]["google"]["misses"] == 1
+        assert stats["entries"] == 1
+        print("✓ Cached results round-trip through SQLite; failed searches are not cached")
+
+
+def test_stale_entries_are_served_and_refreshed_in_background():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResearchCache(os.path.join(tmp, "research.sqlite3"), ttls={"google": 0}, stale_ttl=60)
+        cache.store("google", "vedas", SearchOptions(), serp_result("old"))
+
+        def slow_search():
+            time.sleep(0.2)
+            return serp_result("new")
+
+        start = time.time()
+        result = cache.get_or_search("google", "vedas", SearchOptions(), slow_search)
+        assert result.organic[0].title == "old"
+        assert time.time() - start < 0.1, "stale hit waited for the refresh"
+
+        time.sleep(0.4)
+        state, result = cache.lookup("google", "vedas", SearchOptions())
+        assert result.organic[0].title == "new"
+        assert cache.stats()["sources"]["google"]["refreshes"] == 1
+        print("✓ Stale entries are returned at once and refreshed in the background")
+
+
+if __name__ == "__main__":
+    test_key_normalizes_query_and_includes_options()
+    test_results_round_trip_and_errors_are_not_cached()
+    test_stale_entries_are_served_and_refreshed_in_background()
+    print("\nAll research cache tests passed!")
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test script for the DAG stage executor used by the blog workflow.
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stage_executor import StageExecutor, StageExecutionError
+
+
+def test_independent_stages_overlap():
+    executor = StageExecutor(pools={"llm": 4})
+    for name in ("introduction", "section_1", "section_2", "conclusion"):
+        executor.add_stage(name, lambda: time.sleep(0.2) or name)
+
+    start = time.time()
+    executor.run()
+    elapsed = time.time() - start
+
+    assert elapsed < 0.6, f"stages ran sequentially ({elapsed:.2f}s)"
+    print(f"✓ Independent stages ran concurrently in {elapsed:.2f}s")
+
+
+def test_dependencies_receive_results_in_order():
+    executor = StageExecutor(pools={"llm": 2, "images": 2})
+    executor.add_stage("a", lambda: "A", pool="llm")
+    executor.add_stage("b", lambda: time.sleep(0.1) or "B", pool="llm")
+    executor.add_stage("joined", lambda a, b: a + b, deps=["a", "b"], pool="images")
+
+    results = executor.run()
+
+    assert results["joined"] == "AB"
+    assert executor.timings["joined"].started >= executor.timings["b"].finished
+    assert executor.critical_path() == ["b", "joined"]
+    print("✓ Dependent stage waited for and received its inputs")
+
+
+def test_on_stage_done_reports_each_stage():
+    executor = StageExecutor(pools={"llm": 2})
+    executor.add_stage("a", lambda: "A")
+    executor.add_stage("b", lambda a: a + "B", deps=["a"])
+
+    done = []
+    executor.run(on_stage_done=lambda name, result: done.append((name, result)))
+
+    assert done == [("a", "A"), ("b", "AB")]
+    print("✓ Progress callback saw every stage in completion order")
+
+
+def test_failing_stage_raises():
+    executor = StageExecutor()
+    executor.add_stage("boom", lambda: 1 / 0)
+    executor.add_stage("after", lambda value: value, deps=["boom"])
+
+    try:
+        executor.run()
+    except StageExecutionError as e:
+        assert "boom" in str(e)
+        assert "after" not in executor.timings
+        print("✓ Failing stage stops the run and skips its dependents")
+    else:
+        raise AssertionError("expected StageExecutionError")
+
+
+if __name__ == "__main__":
+    test_independent_stages_overlap()
+    test_dependencies_receive_results_in_order()
+    test_on_stage_done_reports_each_stage()
+    test_failing_stage_raises()
+    print("\nAll stage executor tests passed!")
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test script for the authenticated user cache.
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.user_cache import CurrentUser, UserCache
+
+
+def test_subject_lookup_hit_miss_and_expiry():
+    cache = UserCache(ttl=60)
+    assert cache.get("alice") is None
+
+    cache.put(CurrentUser(1, "alice", "Alice", "user"))
+    user = cache.get("alice")
+    assert user is not None and user.id == 1 and user.role == "user"
+
+    expired = UserCache(ttl=-1)
+    expired.put(CurrentUser(1, "alice"))
+    assert expired.get("alice") is None
+
+    assert cache.stats() == {"hits": 1, "misses": 1, "entries": 1}
+    print("✓ Users are cached by token subject until their TTL expires")
+
+
+def test_max_entries_evicts_least_recently_used():
+    cache = UserCache(ttl=60, max_entries=2)
+    cache.put(CurrentUser(1, "alice"))
+    cache.put(CurrentUser(2, "bob"))
+    assert cache.get("alice") is not None
+    cache.put(CurrentUser(3, "carol"))
+
+    assert cache.get("bob") is None
+    assert cache.get("alice") is not None and cache.get("carol") is not None
+    print("✓ The least recently used user is evicted over max_entries")
+
+
+def test_resolve_claims():
+    cache = UserCache()
+    payload = {"sub": "alice", "uid": 1, "name": "Alice", "role": "admin", "iat": time.time()}
+    user = cache.resolve_claims(payload)
+    assert user is not None and (user.id, user.username, user.name, user.role) == (1, "alice", "Alice", "admin")
+
+    # Tokens issued before the claims were added fall back to the cache/database
+    assert cache.resolve_claims({"sub": "alice"}) is None
+    print("✓ Tokens carrying user claims authenticate without a lookup")
+
+
+def test_invalidate_user():
+    cache = UserCache()
+    issued_at = time.time() - 10
+    payload = {"sub": "alice", "uid": 1, "role": "user", "iat": issued_at}
+    cache.put(CurrentUser(1, "alice"))
+
+    cache.invalidate_user("alice")
+    assert cache.get("alice") is None
+    # Tokens issued before the change go back to the database
+    assert cache.resolve_claims(payload) is None
+    assert cache.resolve_claims({**payload, "iat": None}) is None
+    # Tokens issued after it are trusted again
+    assert cache.resolve_claims({**payload, "iat": time.time() + 1}) is not None
+    # Other users are unaffected
+    assert cache.resolve_claims({"sub": "bob", "uid": 2, "iat": issued_at}) is not None
+    print("✓ invalidate_user drops the cached user and distrusts older tokens")
+
+
+if __name__ == "__main__":
+    test_subject_lookup_hit_miss_and_expiry()
+    test_max_entries_evicts_least_recently_used()
+    test_resolve_claims()
+    test_invalidate_user()
+    print("\nAll user cache tests passed!")
@@ -52,7 +52,7 @@ def main():
         # Show outline structure
         if job.Outline:
             try:
-                outline = json.loads(job.Outline)
+                outline = job.Outline if isinstance(job.Outline, dict) else json.loads(job.Outline)
                 print(f"📝 Content Structure:")
                 if 'chapters' in outline:
                     for i, chapter in enumerate(outline['chapters'], 1):